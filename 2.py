@@ -1,7 +1,9 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 import plotly.graph_objects as go
+import ohlcv_store
+import indicator_state
+import data_provider
 
 # ==========================================
 # 1. KONFIGURASI HALAMAN
@@ -79,10 +81,8 @@ else:
     # Loop untuk setiap saham yang dimasukkan
     for ticker in tickers:
         try:
-            # Ambil data dari Yahoo Finance
-            # Gunakan Ticker().history() agar lebih fleksibel per saham
-            stock = yf.Ticker(ticker)
-            df = stock.history(period=selected_period)
+            # Ambil data dari store lokal (Yahoo hanya dipanggil kalau data belum ada)
+            df = ohlcv_store.download(ticker, period=selected_period)
             
             # Cek apakah data ada
             if df.empty:
@@ -90,11 +90,13 @@ else:
                 continue
             
             # --- HITUNG MOVING AVERAGE ---
-            df['MA20'] = df['Close'].rolling(window=20).mean()
-            df['MA52'] = df['Close'].rolling(window=52).mean()
+            # State MA disimpan di samping store harga; hanya bar baru yang dihitung
+            ma = indicator_state.compute(ticker, df['Close'], specs=(("sma", 20), ("sma", 52)))
+            df['MA20'] = ma['MA20']
+            df['MA52'] = ma['MA52']
             
             # Nama Saham (Biar lebih jelas)
-            stock_name = stock.info.get('shortName', ticker)
+            stock_name = data_provider.get_provider().info(ticker).get('shortName', ticker)
             curr_price = df['Close'].iloc[-1]
             prev_price = df['Close'].iloc[-2]
             change = ((curr_price - prev_price) / prev_price) * 100
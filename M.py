@@ -1,7 +1,9 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
-import time
+import fundamentals_cache
+import ohlcv_store
+import extremes
+from universe import IHSG_TICKERS
 
 # Mengatur judul halaman web Streamlit
 st.set_page_config(page_title="IHSG Top 100 Dashboard", layout="wide")
@@ -9,7 +11,7 @@ st.title("📊 IHSG Top 100 - Analisis Harga & Rasio Finansial")
 st.write("Aplikasi melacak Harga, 52-Week High/Low, PE & PB Ratio, Pertumbuhan Laba, dan Dividen.")
 
 # Daftar 100 Ticker Saham
-tickers = ["BREN.JK", "BBCA.JK", "DSSA.JK", "BBRI.JK", "TPIA.JK", "DCII.JK", "BYAN.JK", "AMMN.JK", "BMRI.JK", "TLKM.JK", "ASII.JK", "MORA.JK", "SRAJ.JK", "CUAN.JK", "BRPT.JK", "BBNI.JK", "PANI.JK", "BNLI.JK", "BRMS.JK", "CDIA.JK", "DNET.JK", "IMPC.JK", "FILM.JK", "MPRO.JK", "BRIS.JK", "ICBP.JK", "HMSP.JK", "BUMI.JK", "EMAS.JK", "UNTR.JK", "ANTM.JK", "NCKL.JK", "SMMA.JK", "ADMR.JK", "CASA.JK", "UNVR.JK", "RISE.JK", "CPIN.JK", "MLPT.JK", "AMRT.JK", "MDKA.JK", "ISAT.JK", "MBMA.JK", "GOTO.JK", "INCO.JK", "AADI.JK", "INDF.JK", "PTRO.JK", "BELI.JK", "ADRO.JK", "EXCL.JK", "TCPI.JK", "KLBF.JK", "EMTK.JK", "MYOR.JK", "PGAS.JK", "INKP.JK", "PGUN.JK", "PGEO.JK", "GEMS.JK", "MTEL.JK", "BNGA.JK", "CMRY.JK", "ARCI.JK", "TBIG.JK", "MEGA.JK", "SILO.JK", "MEDC.JK", "GIAA.JK", "SOHO.JK", "VKTR.JK", "CBDK.JK", "MIKA.JK", "NISP.JK", "JPFA.JK", "GGRM.JK", "TOWR.JK", "BBHI.JK", "ENRG.JK", "TAPG.JK", "SUPA.JK", "BUVA.JK", "PTBA.JK", "BINA.JK", "COIN.JK", "AVIA.JK", "JSMR.JK", "AKRA.JK", "NSSS.JK", "PNBN.JK", "ITMG.JK", "BDMN.JK", "ARKO.JK", "MDIY.JK", "TINS.JK", "BSIM.JK", "INTP.JK", "JARR.JK", "BKSL.JK", "BTPN.JK", "ARTO.JK", "FAPA.JK", "MKPI.JK", "RMKE.JK", "SRTG.JK", "TKIM.JK", "MAPA.JK", "MSIN.JK", "MAPI.JK", "RLCO.JK", "HEAL.JK", "BSDE.JK", "KPIG.JK", "CITA.JK", "PWON.JK", "BNBR.JK", "APIC.JK", "BBTN.JK", "SMGR.JK", "RAJA.JK", "POLU.JK", "LIFE.JK", "BNII.JK", "INDY.JK", "CTRA.JK", "SMAR.JK", "SCMA.JK", "SSMS.JK", "CARE.JK", "ULTJ.JK", "SIDO.JK", "DSNG.JK", "BBSI.JK", "BUKA.JK", "AALI.JK", "RATU.JK", "BBKP.JK", "HRUM.JK", "CMNT.JK", "SGRO.JK", "PSAB.JK", "JRPT.JK", "YUPI.JK", "STAA.JK", "STTP.JK", "GOOD.JK", "MCOL.JK", "WIFI.JK", "AUTO.JK", "TSPC.JK", "NICL.JK", "ALII.JK", "SHIP.JK", "MLBI.JK", "PACK.JK", "DEWA.JK", "CYBR.JK", "PRAY.JK", "POWR.JK", "ESSA.JK", "BMAS.JK", "MIDI.JK", "EDGE.JK", "BIPI.JK", "BSSR.JK", "SMSM.JK", "ADMF.JK", "ELPI.JK", "BFIN.JK", "HRTA.JK", "CLEO.JK", "BTPS.JK", "CMNP.JK", "CNMA.JK", "BANK.JK", "ADES.JK", "INPP.JK", "BJBR.JK", "SIMP.JK", "BJTM.JK", "PNLF.JK", "INET.JK", "SINI.JK", "TLDN.JK", "GMFI.JK", "NATO.JK", "BBMD.JK", "LSIP.JK", "TMAS.JK", "ABMM.JK", "DUTI.JK", "BHAT.JK", "DAAZ.JK", "SGER.JK", "DMND.JK", "CLAY.JK", "IBST.JK", "MTDL.JK", "BULL.JK", "ACES.JK", "LPKR.JK", "DMAS.JK", "SMRA.JK", "SSIA.JK", "ERAA.JK", "EPMT.JK", "SMDR.JK", "KRAS.JK", "JSPT.JK", "BOGA.JK", "MAYA.JK", "AGII.JK", "OMED.JK", "PALM.JK", "ANJT.JK", "TOBA.JK", "DATA.JK", "BESS.JK", "INDS.JK", "CASS.JK", "ELSA.JK", "AGRO.JK", "SAME.JK", "UANG.JK", "MNCN.JK", "LINK.JK", "BPII.JK", "YULE.JK", "TRIN.JK", "BALI.JK", "UDNG.JK", "PBSA.JK", "CTBN.JK", "DRMA.JK", "NIRO.JK", "DKFT.JK", "GTSI.JK", "MTLA.JK", "BBYB.JK", "TFCO.JK", "ROTI.JK", "FISH.JK", "TRIM.JK", "PYFA.JK", "TGKA.JK", "GOLF.JK", "KIJA.JK", "JTPE.JK", "MASB.JK", "HUMI.JK", "FORE.JK", "MPMX.JK", "RDTX.JK", "MSTI.JK", "BSWD.JK", "IMAS.JK", "BIRD.JK", "LPCK.JK", "ASSA.JK", "TUGU.JK", "BWPT.JK", "WIIM.JK", "RONY.JK", "LPPF.JK", "CENT.JK", "SDRA.JK", "SURE.JK", "VICI.JK", "MGLV.JK", "NOBU.JK", "KEEN.JK", "PSGO.JK", "AMAR.JK", "CPRO.JK", "CBRE.JK", "SOCI.JK", "ARNA.JK", "TBLA.JK", "STAR.JK", "GJTL.JK", "VICO.JK", "PBID.JK", "INPC.JK", "GGRP.JK", "IRSX.JK", "AGRS.JK", "HEXA.JK", "TOTL.JK", "UNIC.JK", "SMMT.JK", "BUKK.JK", "ROCK.JK", "SKRN.JK", "MDLA.JK", "MMLP.JK", "MINA.JK", "BACA.JK", "MAPB.JK", "KEJU.JK", "BGTG.JK", "SOTS.JK", "MBSS.JK", "SAMF.JK", "BHIT.JK", "ARGO.JK", "CBUT.JK", "PNIN.JK", "MARK.JK", "SMDM.JK", "ISSP.JK", "FPNI.JK", "APLN.JK", "MYOH.JK", "ASRI.JK", "SMIL.JK", "DAYA.JK", "KAEF.JK", "IFSH.JK", "BNBA.JK", "RALS.JK", "JAWA.JK", "MCOR.JK", "PKPK.JK", "HATM.JK", "TOTO.JK", "BCIC.JK", "IATA.JK", "MAHA.JK", "FOLK.JK", "SMBR.JK", "SFAN.JK", "BISI.JK", "BABP.JK", "FUTR.JK", "PSKT.JK", "OASA.JK", "ASLI.JK", "SSTM.JK", "SIPD.JK", "MGRO.JK", "PORT.JK", "DNAR.JK", "MKAP.JK", "BVIC.JK", "BOLT.JK", "PNGO.JK", "IPCC.JK", "BLTZ.JK", "ASGR.JK", "POLI.JK", "DWGL.JK", "BMTR.JK", "GMTD.JK", "WINS.JK", "IFII.JK", "MSJA.JK", "BCAP.JK", "OMRE.JK", "BEEF.JK", "KMTR.JK", "NICE.JK", "BKSW.JK", "PRDA.JK", "DOID.JK", "TRUE.JK", "BLUE.JK", "MDIA.JK", "WOOD.JK", "ACST.JK", "IMJS.JK", "AMAG.JK", "PTPP.JK", "MTMH.JK", "CSRA.JK", "MLIA.JK", "ITMA.JK", "DGWG.JK", "KETR.JK", "NRCA.JK", "DMMX.JK", "SCCO.JK", "INDR.JK", "PNBS.JK", "BRAM.JK", "LUCY.JK", "MBAP.JK", "TPMA.JK", "ELTY.JK", "IPTV.JK", "STRK.JK", "TEBE.JK", "ADHI.JK", "LPGI.JK", "SUNI.JK", "HILL.JK", "PSSI.JK", "MINE.JK", "FAST.JK", "DVLA.JK", "ERAL.JK", "HERO.JK", "KINO.JK", "CSAP.JK", "UCID.JK", "IPCM.JK", "MLPL.JK", "VISI.JK", "PTSN.JK", "BBRM.JK", "SPTO.JK", "FMII.JK", "PPRE.JK", "MAIN.JK", "AYAM.JK", "EURO.JK", "SKLT.JK", "DEPO.JK", "BSBK.JK", "MKTR.JK", "BMHS.JK", "NEST.JK", "PMJS.JK", "BEKS.JK", "KKGI.JK", "DLTA.JK", "AMFG.JK", "RAAM.JK", "TRGU.JK", "ALDO.JK", "GWSA.JK", "PSAT.JK", "GSMF.JK", "CARS.JK", "PADI.JK", "BBLD.JK", "DOOH.JK", "ABDA.JK", "BELL.JK", "NETV.JK", "MERK.JK", "BLOG.JK", "DILD.JK", "TAMU.JK", "CEKA.JK", "ATIC.JK", "TRST.JK", "SONA.JK", "BBSS.JK", "KBLI.JK", "BLES.JK", "CFIN.JK", "JKON.JK", "TIFA.JK", "CAMP.JK", "RANC.JK", "MITI.JK", "TCID.JK", "WSBP.JK", "GZCO.JK", "AISA.JK", "CITY.JK", "JIHD.JK", "LTLS.JK", "IBOS.JK", "ADCP.JK", "ARTA.JK", "BUAH.JK", "INDO.JK", "WOMF.JK", "BEST.JK", "PANS.JK", "TBMS.JK", "ENAK.JK", "RSCH.JK", "BLTA.JK", "JGLE.JK", "MTWI.JK", "ARII.JK", "BTEK.JK", "AREA.JK", "BOLA.JK", "SHID.JK", "ZINC.JK", "ASLC.JK", "PEVE.JK", "LIVE.JK", "MMIX.JK", "GHON.JK", "CHIP.JK", "WIRG.JK", "GDST.JK", "PBRX.JK", "GRIA.JK", "ATAP.JK", "CMPP.JK", "NELY.JK", "RMKO.JK", "NICK.JK", "SMGA.JK", "SPMA.JK", "RELI.JK", "HGII.JK", "BUDI.JK", "SKBM.JK", "COCO.JK", "LEAD.JK", "VOKS.JK", "PDPP.JK", "MHKI.JK", "NFCX.JK", "PTPW.JK", "PJAA.JK", "ZATA.JK", "NIKL.JK", "FUJI.JK", "AMOR.JK", "PANR.JK", "ADMG.JK", "MGNA.JK", "TALF.JK", "AMAN.JK", "BABY.JK", "MTFN.JK", "WTON.JK", "IPOL.JK", "SULI.JK", "PMUI.JK", "KSIX.JK", "PADA.JK", "LFLO.JK", "BPFI.JK", "JECC.JK", "FORU.JK", "HDFA.JK", "KOKA.JK", "BDKR.JK", "DGIK.JK", "WMUU.JK", "PGJO.JK", "RODA.JK", "KDSI.JK", "AXIO.JK", "TIRA.JK", "MDLN.JK", "MOLI.JK", "BEER.JK", "HOKI.JK", "BRNA.JK", "GTBO.JK", "BIKE.JK", "UNIQ.JK", "MPPA.JK", "APEX.JK", "AHAP.JK", "GTRA.JK", "SWID.JK", "IKBI.JK", "HOMI.JK", "HOPE.JK", "EKAD.JK", "VIVA.JK", "UNSP.JK", "PEGE.JK", "PZZA.JK", "SOFA.JK", "IRRA.JK", "ELIT.JK", "WEGE.JK", "SOSS.JK", "AWAN.JK", "SMKL.JK", "GLVA.JK", "TRIS.JK", "KOTA.JK", "GUNA.JK", "HAIS.JK", "UNTD.JK", "CHEK.JK", "LABS.JK", "BOAT.JK", "PNSE.JK", "MREI.JK", "FITT.JK", "KONI.JK", "VTNY.JK", "URBN.JK", "TRON.JK", "IDPR.JK", "WINE.JK", "DART.JK", "PJHB.JK", "GPRA.JK", "MDKI.JK", "KING.JK", "CNKO.JK", "UFOE.JK", "BSML.JK", "VERN.JK", "HALO.JK", "COAL.JK", "APLI.JK", "CRAB.JK", "ESTA.JK", "SURI.JK", "MDRN.JK", "MAXI.JK", "KMDS.JK", "CLPI.JK", "BAYU.JK", "VRNA.JK", "TIRT.JK", "IGAR.JK", "LAPD.JK", "IKPM.JK", "SCNP.JK", "MCAS.JK", "REAL.JK", "RIGS.JK", "CCSI.JK", "GDYR.JK", "GULA.JK", "NASA.JK", "PDES.JK", "CSIS.JK", "GOLD.JK", "PTPS.JK", "CBPE.JK", "SOLA.JK", "TYRE.JK", "ZONE.JK", "BIPP.JK", "BKDP.JK", "ESTI.JK", "IOTF.JK", "LPLI.JK", "VAST.JK", "HYGN.JK", "ASRM.JK", "KREN.JK", "SMLE.JK", "DYAN.JK", "DGNS.JK", "EAST.JK", "HAJJ.JK", "TFAS.JK", "SRSN.JK", "JATI.JK", "KBLM.JK", "DADA.JK", "BMSR.JK", "KOBX.JK", "NAIK.JK", "KBAG.JK", "TARA.JK", "SATU.JK", "ASPR.JK", "ASHA.JK", "YOII.JK", "UVCR.JK", "CRSN.JK", "YPAS.JK", "TRUS.JK", "ATLA.JK", "INTA.JK", "ERTX.JK", "GPSO.JK", "PART.JK", "MUTU.JK", "SAFE.JK", "KLAS.JK", "AKPI.JK", "ITIC.JK", "CGAS.JK", "EMDE.JK", "MICE.JK", "VINS.JK", "ASMI.JK", "HRME.JK", "BPTR.JK", "AMIN.JK", "ASPI.JK", "IKAI.JK", "BINO.JK", "SAGE.JK", "TOSK.JK", "BTON.JK", "OKAS.JK", "MPXL.JK", "WGSH.JK", "ACRO.JK", "AGAR.JK", "INOV.JK", "POLA.JK", "LMPI.JK", "FIRE.JK", "ANDI.JK", "PUDP.JK", "DOSS.JK", "FWCT.JK", "AKSI.JK", "CASH.JK", "KBLV.JK", "PRIM.JK", "NTBK.JK", "DEWI.JK", "OBAT.JK", "ASJT.JK", "ALKA.JK", "ECII.JK", "RELF.JK", "LCKM.JK", "PEHA.JK", "AKKU.JK", "ENZO.JK", "AYLS.JK", "INPS.JK", "BAJA.JK", "WINR.JK", "ASDM.JK", "SDPC.JK", "TRJA.JK", "SAPX.JK", "WAPO.JK", "PTMP.JK", "BAUT.JK", "MEJA.JK", "JMAS.JK", "LPPS.JK", "OBMD.JK", "NPGF.JK", "NZIA.JK", "MANG.JK", "LION.JK", "TAXI.JK", "PTSP.JK", "APII.JK", "CAKK.JK", "NANO.JK", "SLIS.JK", "DFAM.JK", "WOWS.JK", "SDMU.JK", "CINT.JK", "ZYRX.JK", "DKHH.JK", "MRAT.JK", "ABBA.JK", "BOBA.JK", "DIVA.JK", "PURA.JK", "MARI.JK", "PAMG.JK", "BAPI.JK", "CANI.JK", "KOPI.JK", "DSFI.JK", "SMKM.JK", "WEHA.JK", "PURI.JK", "LPIN.JK", "IBFN.JK", "RUIS.JK", "NAYZ.JK", "LAJU.JK", "TRUK.JK", "LAND.JK", "KARW.JK", "HELI.JK", "CHEM.JK", "SEMA.JK", "PSDN.JK", "IPAC.JK", "SNLK.JK", "INTD.JK", "MSKY.JK", "MBTO.JK", "KRYA.JK", "ASBI.JK", "INCI.JK", "TMPO.JK", "GEMA.JK", "ISAP.JK", "YELO.JK", "MERI.JK", "PTIS.JK", "ISEA.JK", "FOOD.JK", "LABA.JK", "MPIX.JK", "RGAS.JK", "DEFI.JK", "KUAS.JK", "SBMA.JK", "EPAC.JK", "RCCC.JK", "KIOS.JK", "INAI.JK", "RBMS.JK", "MIRA.JK", "NASI.JK", "MEDS.JK", "CSMI.JK", "CTTH.JK", "OLIV.JK", "JAST.JK", "IDEA.JK", "OPMS.JK", "PTDU.JK", "PGLI.JK", "FLMC.JK", "BCIP.JK", "INCF.JK", "HDIT.JK", "JAYA.JK", "AIMS.JK", "RUNS.JK", "POLY.JK", "OILS.JK", "BATA.JK", "KOIN.JK", "ICON.JK", "LRNA.JK", "MPOW.JK", "PICO.JK", "IKAN.JK", "TAYS.JK", "ESIP.JK", "KJEN.JK", "LUCK.JK", "TNCA.JK", "KICI.JK", "SOUL.JK", "ARKA.JK", "PLAN.JK", "BMBL.JK", "BAPA.JK", "RICY.JK", "WIDI.JK", "DIGI.JK", "INDX.JK", "HADE.JK", "TAMA.JK", "PCAR.JK", "LOPI.JK", "GRPH.JK", "HBAT.JK", "PIPA.JK", "KLIN.JK", "PPRI.JK", "AEGS.JK", "SPRE.JK", "KAQI.JK", "NINE.JK", "KOCI.JK", "LMAX.JK", "BRRC.JK", "RAFI.JK", "TOOL.JK", "BATR.JK", "AMMS.JK", "KKES.JK", "SICO.JK", "BAIK.JK", "GRPM.JK", "KDTN.JK", "MSIE.JK"]
+tickers = IHSG_TICKERS
 
 def konversi_ke_kuartal(timestamp_mentah):
     if not timestamp_mentah:
@@ -26,87 +28,123 @@ def konversi_ke_kuartal(timestamp_mentah):
     except:
         return "N/A"
 
+# Harga, 52-Week High/Low dihitung dari bar lokal (extremes.py), jadi info fundamental
+# (EPS, PBV, dividen, laba) cukup diperbarui mingguan
+FUNDAMENTAL_TTL = dict(fundamentals_cache.TTL, ratios=7 * 24 * 3600)
+
+def susun_baris_saham(ticker, info, bar=None):
+    market_cap = info.get('marketCap', 0)
+    current_price = info.get('currentPrice') or info.get('regularMarketPrice') or info.get('previousClose', 0)
+    high_52week = info.get('fiftyTwoWeekHigh', 0)
+    low_52week = info.get('fiftyTwoWeekLow', 0) # Mengambil data 52-Week Low
+    nama_perusahaan = info.get('longName', ticker)
+    
+    # Mengambil PE dan PB Ratio
+    pe_ratio = info.get('trailingPE')
+    pb_ratio = info.get('priceToBook')
+    
+    # Harga & 52W dari store lokal; rasio yang bergantung harga disesuaikan ke harga terbaru
+    if bar is not None and pd.notnull(bar["Close"]) and bar["Close"] > 0:
+        skala = bar["Close"] / current_price if current_price else None
+        current_price, high_52week, low_52week = bar["Close"], bar["High"], bar["Low"]
+        eps = info.get('trailingEps')
+        if eps and eps > 0: pe_ratio = current_price / eps
+        if skala:
+            if pb_ratio is not None: pb_ratio = pb_ratio * skala
+            if market_cap: market_cap = market_cap * skala
+    
+    # Net Profit Growth YoY
+    net_profit_yoy = info.get('earningsQuarterlyGrowth')
+    if net_profit_yoy is not None:
+        net_profit_yoy = round(net_profit_yoy * 100, 2)
+    
+    # Periode Laporan Keuangan
+    periode_raw = info.get('mostRecentQuarter')
+    periode_laporan = konversi_ke_kuartal(periode_raw)
+    
+    # Dividend Yield
+    div_yield = info.get('dividendYield')
+    if div_yield is not None:
+        div_yield = round(div_yield * 100, 2)
+    else:
+        div_yield = 0.0
+    
+    # Hitung Jarak/Selisih ke 52-Week High
+    if current_price and high_52week:
+        selisih_high = high_52week - current_price
+        selisih_high_persen = (selisih_high / high_52week) * 100
+    else:
+        selisih_high = 0
+        selisih_high_persen = 0
+        
+    # Hitung Selisih dengan 52-Week Low (Seberapa jauh harga naik dari titik terendah)
+    if current_price and low_52week:
+        selisih_low = current_price - low_52week
+        kenaikan_low_persen = (selisih_low / low_52week) * 100 if low_52week > 0 else 0
+    else:
+        selisih_low = 0
+        kenaikan_low_persen = 0
+        
+    return {
+        "Ticker": ticker.replace(".JK", ""),
+        "Nama Perusahaan": nama_perusahaan,
+        "Market Cap (IDR)": market_cap,
+        "Harga Terkini": current_price,
+        "PE Ratio": pe_ratio,
+        "PB Ratio": pb_ratio,
+        "52-Week Low": low_52week,
+        "Selisih dr Low (IDR)": selisih_low,
+        "Kenaikan dr Low (%)": round(kenaikan_low_persen, 2),
+        "52-Week High": high_52week,
+        "Selisih dr High (IDR)": selisih_high,
+        "Diskon dr High (%)": round(selisih_high_persen, 2),
+        "Net Profit Growth YoY (%)": net_profit_yoy,
+        "Dividend Yield (%)": div_yield,
+        "Periode Laporan": periode_laporan
+    }
+
 @st.cache_data(ttl=3600)
 def ambil_data_saham_super_lengkap():
-    saham_data = []
-    
     progress_bar = st.progress(0)
     status_text = st.empty()
+    tabel_sementara = st.empty()
     
-    for idx, ticker in enumerate(tickers):
-        try:
-            status_text.text(f"Mengambil data: {ticker} ({idx+1}/{len(tickers)})")
-            stock = yf.Ticker(ticker)
-            info = stock.info
-            
-            market_cap = info.get('marketCap', 0)
-            current_price = info.get('currentPrice') or info.get('regularMarketPrice') or info.get('previousClose', 0)
-            high_52week = info.get('fiftyTwoWeekHigh', 0)
-            low_52week = info.get('fiftyTwoWeekLow', 0) # Mengambil data 52-Week Low
-            nama_perusahaan = info.get('longName', ticker)
-            
-            # Mengambil PE dan PB Ratio
-            pe_ratio = info.get('trailingPE')
-            pb_ratio = info.get('priceToBook')
-            
-            # Net Profit Growth YoY
-            net_profit_yoy = info.get('earningsQuarterlyGrowth')
-            if net_profit_yoy is not None:
-                net_profit_yoy = round(net_profit_yoy * 100, 2)
-            
-            # Periode Laporan Keuangan
-            periode_raw = info.get('mostRecentQuarter')
-            periode_laporan = konversi_ke_kuartal(periode_raw)
-            
-            # Dividend Yield
-            div_yield = info.get('dividendYield')
-            if div_yield is not None:
-                div_yield = round(div_yield * 100, 2)
-            else:
-                div_yield = 0.0
-            
-            # Hitung Jarak/Selisih ke 52-Week High
-            if current_price and high_52week:
-                selisih_high = high_52week - current_price
-                selisih_high_persen = (selisih_high / high_52week) * 100
-            else:
-                selisih_high = 0
-                selisih_high_persen = 0
-                
-            # Hitung Selisih dengan 52-Week Low (Seberapa jauh harga naik dari titik terendah)
-            if current_price and low_52week:
-                selisih_low = current_price - low_52week
-                kenaikan_low_persen = (selisih_low / low_52week) * 100 if low_52week > 0 else 0
-            else:
-                selisih_low = 0
-                kenaikan_low_persen = 0
-                
-            saham_data.append({
-                "Ticker": ticker.replace(".JK", ""),
-                "Nama Perusahaan": nama_perusahaan,
-                "Market Cap (IDR)": market_cap,
-                "Harga Terkini": current_price,
-                "PE Ratio": pe_ratio,
-                "PB Ratio": pb_ratio,
-                "52-Week Low": low_52week,
-                "Selisih dr Low (IDR)": selisih_low,
-                "Kenaikan dr Low (%)": round(kenaikan_low_persen, 2),
-                "52-Week High": high_52week,
-                "Selisih dr High (IDR)": selisih_high,
-                "Diskon dr High (%)": round(selisih_high_persen, 2),
-                "Net Profit Growth YoY (%)": net_profit_yoy,
-                "Dividend Yield (%)": div_yield,
-                "Periode Laporan": periode_laporan
-            })
-            
-            progress_bar.progress((idx + 1) / len(tickers))
-            time.sleep(0.05)
-            
-        except Exception:
-            continue
+    # 52W High/Low seluruh ticker dari bar lokal, state harian inkremental (tanpa .info)
+    try: harga = extremes.update(ohlcv_store.download(tickers, period=extremes.PERIOD), tickers)
+    except: harga = pd.DataFrame()
+    bar = lambda t: harga.loc[t] if t in harga.index else None
+    
+    # Data yang masih segar di cache SQLite langsung dipakai (satu query)
+    cached = fundamentals_cache.load_many(tickers, ttl=FUNDAMENTAL_TTL)
+    perlu = [t for t in tickers if t not in cached]
+    saham_data = [susun_baris_saham(t, cached[t], bar(t)) for t in tickers if t in cached]
+    selesai = [0]
+    
+    # Sisanya diambil paralel (dibatasi rate limiter), hasil masuk tabel begitu tiba
+    def on_result(ticker, info, error):
+        selesai[0] += 1
+        status_text.text(f"Mengambil data: {ticker} ({selesai[0]}/{len(perlu)})")
+        progress_bar.progress(selesai[0] / len(perlu))
+        if error is not None or not info: return
+        try: saham_data.append(susun_baris_saham(ticker, info, bar(ticker)))
+        except Exception: return
+        if len(saham_data) % 25 == 0:
+            tabel_sementara.dataframe(pd.DataFrame(saham_data), use_container_width=True)
+    
+    infos = dict(cached)
+    if perlu:
+        infos.update(fundamentals_cache.get_info_many(perlu, on_result=on_result))
+    
+    saham_data, gagal = [], []
+    for ticker in tickers:
+        try: saham_data.append(susun_baris_saham(ticker, infos[ticker], bar(ticker)))
+        except Exception: gagal.append(ticker)
             
     status_text.empty()
     progress_bar.empty()
+    tabel_sementara.empty()
+    if gagal:
+        st.caption(f"Gagal diambil ({len(gagal)}): {', '.join(t.replace('.JK', '') for t in gagal)}")
     
     df = pd.DataFrame(saham_data)
     if not df.empty:
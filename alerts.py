@@ -0,0 +1,217 @@
+"""
+Mesin alert berbasis aturan, dievaluasi inkremental per snapshot.
+
+Aturan deklaratif (disimpan di stock_database.json):
+    {"id": "a1", "kind": "ma20_up", "target": "BBCA.JK", "value": None}
+    {"id": "a2", "kind": "vol_spike", "target": "@watchlist", "value": 2.0}
+`target` berupa satu ticker atau nama daftar ("@watchlist", "@ihsg", ...).
+
+Setiap aturan dijabarkan menjadi pasangan (aturan, ticker) dalam array sekali
+per set aturan/daftar. Setiap tick:
+1. snapshot (tabel screener) dibandingkan dengan snapshot sebelumnya milik set
+   aturan itu -> hanya ticker yang nilainya berubah yang dievaluasi;
+2. kondisi dihitung per jenis aturan dengan operasi array;
+3. alert menyala saat kondisi BERUBAH dari salah ke benar (edge), jadi tidak
+   berulang setiap refresh. Observasi pertama hanya menjadi acuan.
+
+Status kondisi & riwayat alert disimpan di
+    data/alerts/state.json      (kondisi terakhir per pasangan)
+    data/alerts/history.jsonl   (alert yang menyala, append-only)
+"""
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# ==============================
+# 1. KONFIGURASI
+# ==============================
+
+ALERTS_DIR = os.environ.get("ALERTS_DIR", os.path.join("data", "alerts"))
+STATE_FILE = os.path.join(ALERTS_DIR, "state.json")
+HISTORY_FILE = os.path.join(ALERTS_DIR, "history.jsonl")
+
+# jenis -> (label, kolom snapshot, operator, nilai default); {v} diisi nilai aturan
+KINDS = {
+    "ma20_up": ("Tembus MA20 ke atas", "Dari MA20 (%)", "gt", 0.0),
+    "ma20_down": ("Tembus MA20 ke bawah", "Dari MA20 (%)", "lt", 0.0),
+    "high_52w": ("Cetak High 52 Minggu", "Tembus High 52W (%)", "gt", 0.0),
+    "vol_spike": ("Volume >= {v}x Rata2 5 Hari", "Vol Ratio", "ge", 2.0),
+    "price_above": ("Harga >= {v}", "Harga", "ge", 0.0),
+    "price_below": ("Harga <= {v}", "Harga", "le", 0.0),
+    "chg_above": ("Chg >= {v}%", "Chg (%)", "ge", 5.0),
+    "chg_below": ("Chg <= {v}%", "Chg (%)", "le", -5.0),
+    "rsi_above": ("RSI14 >= {v}", "RSI14", "ge", 70.0),
+    "rsi_below": ("RSI14 <= {v}", "RSI14", "le", 30.0),
+}
+OPS = {"gt": np.greater, "lt": np.less, "ge": np.greater_equal, "le": np.less_equal}
+FIELDS = list(dict.fromkeys(k[1] for k in KINDS.values()))
+KIND_CODES = {k: i for i, k in enumerate(KINDS)}
+
+MAX_SETS = 8  # set aturan (sesi) yang pasangannya di-memo sekaligus
+
+_lock = threading.Lock()
+_engine = None
+
+def rule(kind, target, value=None):
+    """Satu aturan baru (dict biasa supaya bisa langsung di-json)."""
+    value = KINDS[kind][3] if value is None else float(value)
+    rid = hashlib.sha1(f"{kind}|{target}|{value}|{datetime.now().isoformat()}".encode()).hexdigest()[:10]
+    return {"id": rid, "kind": kind, "target": target, "value": value}
+
+def label(kind, value="N"):
+    if not isinstance(value, str): value = f"{value:,.0f}" if KINDS[kind][1] == "Harga" else f"{value:g}"
+    return KINDS[kind][0].format(v=value)
+
+def describe(r):
+    return label(r["kind"], r["value"])
+
+# ==============================
+# 2. PENYIMPANAN
+# ==============================
+
+def _load_state():
+    try:
+        if os.path.exists(STATE_FILE):
+            with open(STATE_FILE, "r") as f: return json.load(f)
+    except:
+        pass
+    return {}
+
+def _save_state(state):
+    os.makedirs(ALERTS_DIR, exist_ok=True)
+    tmp = f"{STATE_FILE}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f: json.dump(state, f)
+    os.replace(tmp, STATE_FILE)
+
+def _append_history(fired):
+    os.makedirs(ALERTS_DIR, exist_ok=True)
+    with open(HISTORY_FILE, "a") as f:
+        for a in fired: f.write(json.dumps(a) + "\n")
+
+def history(limit=200):
+    """Alert terbaru lebih dulu (DataFrame)."""
+    rows = []
+    try:
+        if os.path.exists(HISTORY_FILE):
+            with open(HISTORY_FILE, "r") as f: lines = f.readlines()[-limit:]
+            rows = [json.loads(x) for x in reversed(lines) if x.strip()]
+    except:
+        rows = []
+    return pd.DataFrame(rows, columns=["Waktu", "Ticker", "Alert", "Nilai", "rule"])
+
+# ==============================
+# 3. ENGINE
+# ==============================
+
+class AlertEngine:
+    def __init__(self):
+        self.prev = _load_state()       # "rule_id|ticker" -> 0/1, dibagi semua set aturan
+        self._sets = {}                 # sidik jari set aturan & daftar -> pasangan + snapshot terakhir set itu
+        self._current = None
+        self._lock = threading.Lock()
+
+    def _expand(self, rules, lists):
+        """Jabarkan aturan ke pasangan (aturan, ticker); di-memo per set aturan & daftar."""
+        fp = hashlib.sha1(json.dumps([rules, lists], sort_keys=True, default=str).encode()).hexdigest()
+        if fp == self._current: return self._sets[fp]
+        pairs = self._sets.pop(fp, None) or self._build(rules, lists)
+        # Kondisi terakhir per pasangan (-1 = belum pernah teramati); dibaca ulang dari status
+        # bersama saat berganti set karena set lain (sesi lain) bisa saja sudah memperbaruinya
+        pairs["cond"] = np.fromiter((self.prev.get(k, -1) for k in pairs["key"]), dtype=int, count=len(pairs["key"]))
+        self._sets[fp], self._current = pairs, fp
+        while len(self._sets) > MAX_SETS: self._sets.pop(next(iter(self._sets)))
+        return pairs
+
+    @staticmethod
+    def _build(rules, lists):
+        idx, tickers = [], []
+        for i, r in enumerate(rules):
+            if r.get("kind") not in KINDS: continue
+            target = r["target"]
+            members = lists.get(target[1:], []) if target.startswith("@") else [target]
+            idx += [i] * len(members)
+            tickers += list(members)
+        idx = np.asarray(idx, dtype=int)
+        codes, uniq = pd.factorize(np.asarray(tickers, dtype=object))
+        pairs = {
+            "rule": idx,
+            "ticker": np.asarray(tickers, dtype=object),
+            "code": codes, "uniq": uniq,
+            "kind": np.asarray([KIND_CODES[rules[i]["kind"]] for i in idx], dtype=int),
+            "value": np.asarray([rules[i]["value"] for i in idx], dtype="float64"),
+            "key": np.asarray([f"{rules[i]['id']}|{t}" for i, t in zip(idx, tickers)], dtype=object),
+            "last": pd.DataFrame(columns=FIELDS),
+        }
+        return pairs
+
+    @staticmethod
+    def _changed(snap, last):
+        """Mask ticker snapshot yang nilainya berbeda dari tick sebelumnya set ini (atau baru)."""
+        old = last.reindex(snap.index).to_numpy(dtype="float64")
+        new = snap.to_numpy(dtype="float64")
+        same = (old == new) | (np.isnan(old) & np.isnan(new))
+        seen = snap.index.isin(last.index)
+        return ~(same.all(axis=1) & seen)
+
+    def evaluate(self, snapshot, rules, lists=None, now=None):
+        """
+        snapshot : tabel screener (index Ticker)
+        rules    : daftar aturan (dict)
+        lists    : {nama_daftar: [ticker, ...]}
+        Return daftar alert yang baru menyala.
+        """
+        with self._lock: return self._evaluate(snapshot, rules, lists, now)
+
+    def _evaluate(self, snapshot, rules, lists, now):
+        snap = snapshot.reindex(columns=FIELDS).astype("float64")
+        pairs = self._expand(rules, lists or {})
+        if not len(pairs["key"]): return []
+        changed = self._changed(snap, pairs["last"])
+        row = snap.index.get_indexer(pairs["uniq"])[pairs["code"]] if len(pairs["uniq"]) else pairs["code"]
+        prev = pairs["cond"]
+        # Pasangan baru selalu dievaluasi; sisanya hanya kalau ticker-nya berubah
+        todo = (row >= 0) & ((prev < 0) | changed[np.maximum(row, 0)])
+        cond = np.full(len(row), -1)
+        values = np.full(len(row), np.nan)
+        for code, (_, field, op, _) in enumerate(KINDS.values()):
+            m = todo & (pairs["kind"] == code)
+            if not m.any(): continue
+            v = snap[field].to_numpy()[row[m]]
+            ok = ~np.isnan(v)
+            c = np.where(ok, OPS[op](np.nan_to_num(v), pairs["value"][m]), -1)
+            cond[m], values[m] = c, v
+        upd = cond >= 0
+        fire = upd & (prev == 0) & (cond == 1)
+
+        stamp = (now or datetime.now()).strftime("%Y-%m-%d %H:%M")
+        fired = [{"Waktu": stamp, "Ticker": pairs["ticker"][i], "Alert": describe(rules[pairs["rule"][i]]),
+                  "Nilai": None if np.isnan(values[i]) else round(float(values[i]), 2), "rule": rules[pairs["rule"][i]]["id"]}
+                 for i in np.nonzero(fire)[0]]
+        dirty = upd & (cond != prev)
+        if dirty.any():
+            prev[dirty] = cond[dirty]
+            for i in np.nonzero(dirty)[0]: self.prev[pairs["key"][i]] = int(cond[i])
+            _save_state(self.prev)
+        if fired: _append_history(fired)
+        pairs["last"] = snap
+        return fired
+
+    def forget(self, rule_id):
+        """Buang status pasangan milik aturan yang dihapus."""
+        with self._lock:
+            prefix = f"{rule_id}|"
+            self.prev = {k: v for k, v in self.prev.items() if not k.startswith(prefix)}
+            self._current = None
+            _save_state(self.prev)
+
+def engine():
+    """Engine bersama (bertahan antar rerun Streamlit dalam satu proses)."""
+    global _engine
+    with _lock:
+        if _engine is None: _engine = AlertEngine()
+        return _engine
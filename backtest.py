@@ -0,0 +1,221 @@
+"""
+Mesin backtest vektor untuk tab Simulator.
+
+Semua ticker disimulasikan bersamaan: loop hanya berjalan per hari bursa, dan
+di setiap hari seluruh universe diproses sebagai array (950 ticker x 5 tahun
+tetap hitungan detik).
+
+Aturan:
+- Sinyal dihitung dari Close hari ini, dieksekusi di Open hari berikutnya
+  (tanpa look-ahead). Buy & hold masuk di Open bar pertama.
+- Posisi = `lots` lot x 100 lembar (lot IDX).
+- Fee broker beli/jual (default 0,15% / 0,25% termasuk PPh final 0,1%).
+- Opsional: stop loss (%) dan maksimal lama pegang (hari bursa).
+- Urutan per bar: semua eksekusi di Open dulu (stop yang sudah tembus di Open,
+  batas hold, sinyal keluar, lalu masuk), baru stop intrabar di harga stop
+  kalau Low menembusnya. Bar masuk ikut dicek: Low terjadi setelah fill di Open.
+"""
+import numpy as np
+import pandas as pd
+
+import weekly_recap
+
+LOT_SIZE = 100
+FEE_BUY = 0.0015
+FEE_SELL = 0.0025
+
+STRATEGIES = {
+    "buy_hold": "Buy & Hold",
+    "ma_cross": "MA Cross",
+    "breakout": "Breakout",
+}
+
+# ==============================
+# 1. DATA
+# ==============================
+
+def prices(panel, tickers):
+    """Dict matriks Open/High/Low/Close (tanggal x ticker) + index tanggal."""
+    values = panel.to_numpy(dtype="float64")
+    out = {f: weekly_recap.to_matrix(panel, tickers, f, values) for f in ["Open", "High", "Low", "Close"]}
+    # Bar tanpa Open (data tidak lengkap) pakai Close supaya tetap bisa dieksekusi
+    out["Open"] = np.where(np.isnan(out["Open"]), out["Close"], out["Open"])
+    out["dates"] = pd.DatetimeIndex(panel.index)
+    out["tickers"] = list(tickers)
+    return out
+
+# ==============================
+# 2. SINYAL
+# ==============================
+
+def _rolling(mat, window, fn):
+    # Jendela atas bar VALID saja (pola technicals._window_sums): satu bar kosong tidak membuat indikator NaN
+    valid = ~np.isnan(mat)
+    order = np.argsort(valid, axis=0, kind="stable")
+    packed = getattr(pd.DataFrame(np.take_along_axis(mat, order, axis=0)).rolling(window, min_periods=window), fn)().to_numpy()
+    out = np.empty(mat.shape)
+    np.put_along_axis(out, order, packed, axis=0)
+    return np.where(valid, out, np.nan)
+
+def _prev(mat):
+    """Nilai bar valid sebelumnya (kanal breakout kemarin, melompati bar kosong)."""
+    return pd.DataFrame(mat).ffill().shift(1).to_numpy()
+
+def _hold_state(enter, exit_):
+    """Posisi yang diinginkan dari event masuk/keluar: 1 setelah masuk sampai ada sinyal keluar."""
+    state = np.where(enter, 1.0, np.where(exit_, 0.0, np.nan))
+    return pd.DataFrame(state).ffill().fillna(0.0).to_numpy() > 0
+
+def _carry(want, valid):
+    """Bar tanpa Close = tidak ada informasi (bukan sinyal jual): posisi bar valid sebelumnya diteruskan."""
+    return _hold_state(want & valid, ~want & valid)
+
+def signals(px, strategy="ma_cross", fast=20, slow=50, breakout=20, exit_window=10):
+    """Matriks boolean 'ingin pegang' per (tanggal, ticker), dihitung di Close."""
+    close = px["Close"]
+    valid = ~np.isnan(close)
+    if strategy == "buy_hold":
+        return _carry(valid, valid)
+    if strategy == "ma_cross":
+        return _carry(_rolling(close, fast, "mean") > _rolling(close, slow, "mean"), valid)
+    if strategy == "breakout":
+        upper = _prev(_rolling(px["High"], breakout, "max"))
+        lower = _prev(_rolling(px["Low"], exit_window, "min"))
+        return _carry(_hold_state(close > upper, close < lower), valid)
+    raise ValueError(f"Strategi tidak dikenal: {strategy}")
+
+# ==============================
+# 3. SIMULASI
+# ==============================
+
+def run(px, want, lots=1, fee_buy=FEE_BUY, fee_sell=FEE_SELL, stop_loss=None, max_hold=None, enter_first=False):
+    """
+    Simulasikan posisi untuk semua ticker.
+    Return dict: equity (DataFrame P&L kumulatif Rp), summary (DataFrame per ticker), trades (DataFrame).
+    """
+    opn, low, close = px["Open"], px["Low"], px["Close"]
+    n_days, n_tick = close.shape
+    shares = lots * LOT_SIZE
+    # Sinyal hari d-1 dieksekusi di Open hari d
+    go = np.vstack([want[:1] if enter_first else np.zeros((1, n_tick), dtype=bool), want[:-1]])
+
+    in_pos = np.zeros(n_tick, dtype=bool)
+    entry_px = np.full(n_tick, np.nan)
+    entry_day = np.zeros(n_tick, dtype=int)
+    realized = np.zeros(n_tick)
+    invested = np.full(n_tick, np.nan)
+    equity = np.full((n_days, n_tick), np.nan)
+    exposure = np.zeros(n_tick)
+    # Setelah kena stop/batas hold, tunggu sinyal reset dulu sebelum masuk lagi
+    blocked = np.zeros(n_tick, dtype=bool)
+    trades = []
+
+    def close_positions(mask, px_exit, day, reason):
+        if not mask.any(): return
+        gross = (px_exit[mask] - entry_px[mask]) * shares
+        fee = px_exit[mask] * shares * fee_sell
+        realized[mask] += gross - fee
+        trades.append((np.nonzero(mask)[0], entry_day[mask], np.full(mask.sum(), day), entry_px[mask],
+                       px_exit[mask], gross - fee - entry_px[mask] * shares * fee_buy, reason))
+        in_pos[mask] = False
+        entry_px[mask] = np.nan
+
+    for d in range(n_days):
+        tradable = ~np.isnan(opn[d])
+        if stop_loss:
+            # Gap di bawah stop: terisi di Open
+            gap = in_pos & tradable & (opn[d] <= entry_px * (1 - stop_loss))
+            close_positions(gap, opn[d], d, "stop")
+            blocked |= gap
+        if max_hold:
+            expired = in_pos & tradable & (d - entry_day >= max_hold)
+            close_positions(expired, opn[d], d, "hold")
+            blocked |= expired
+        close_positions(in_pos & tradable & ~go[d], opn[d], d, "signal")
+        blocked &= go[d]
+
+        enter = ~in_pos & ~blocked & tradable & go[d]
+        if enter.any():
+            entry_px[enter] = opn[d][enter]
+            entry_day[enter] = d
+            in_pos[enter] = True
+            realized[enter] -= opn[d][enter] * shares * fee_buy
+            invested[enter & np.isnan(invested)] = opn[d][enter & np.isnan(invested)] * shares
+        if stop_loss:
+            # Open di atas stop, Low menembus: keluar di harga stop
+            stop_px = entry_px * (1 - stop_loss)
+            hit = in_pos & tradable & (low[d] <= stop_px)
+            close_positions(hit, stop_px, d, "stop")
+            blocked |= hit
+
+        exposure += in_pos
+        mark = np.where(in_pos, (close[d] - entry_px) * shares, 0.0)
+        equity[d] = np.where(np.isnan(mark), np.nan, realized + mark)
+
+    # Posisi yang masih terbuka dicatat di log dengan harga Close terakhir (tidak dijual)
+    last_close = pd.DataFrame(close).ffill().to_numpy()[-1]
+    if in_pos.any():
+        trades.append((np.nonzero(in_pos)[0], entry_day[in_pos], np.full(in_pos.sum(), -1), entry_px[in_pos], last_close[in_pos],
+                       (last_close[in_pos] - entry_px[in_pos]) * shares - entry_px[in_pos] * shares * fee_buy, "open"))
+
+    return _report(px, equity, invested, exposure, trades)
+
+def _max_drawdown(equity, invested):
+    # Drawdown dihitung terhadap modal awal + P&L (modal = nilai posisi pertama)
+    curve = pd.DataFrame(equity).ffill().fillna(0.0).to_numpy() + np.nan_to_num(invested)
+    peak = np.maximum.accumulate(curve, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dd = np.where(peak > 0, curve / peak - 1, 0.0)
+    return dd.min(axis=0) * 100
+
+def _trade_log(chunks):
+    # Potongan (ticker, entry_day, exit_day, entry, exit, pnl, reason) per hari -> satu DataFrame
+    names = ["ticker", "entry_day", "exit_day", "entry", "exit", "pnl"]
+    if not chunks: return pd.DataFrame(columns=names + ["reason"])
+    log = pd.DataFrame({n: np.concatenate([c[i] for c in chunks]) for i, n in enumerate(names)})
+    log["reason"] = np.repeat([c[6] for c in chunks], [len(c[0]) for c in chunks])
+    return log
+
+def _report(px, equity, invested, exposure, chunks):
+    tickers, dates = px["tickers"], px["dates"]
+    trades = _trade_log(chunks)
+    closed = trades[trades["reason"] != "open"]
+    n_days = len(dates)
+
+    final = pd.DataFrame(equity).ffill().to_numpy()[-1] if n_days else np.zeros(len(tickers))
+    n_trades = np.bincount(closed["ticker"].astype(int), minlength=len(tickers))
+    wins = np.bincount(closed["ticker"].astype(int), weights=(closed["pnl"] > 0).astype(float), minlength=len(tickers))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        summary = pd.DataFrame({
+            "Ticker": tickers,
+            "Modal Awal (Rp)": invested,
+            "Trades": n_trades,
+            "Win Rate (%)": np.where(n_trades > 0, wins / np.maximum(n_trades, 1) * 100, np.nan),
+            "Net P&L (Rp)": final,
+            "Return (%)": final / invested * 100,
+            "Max Drawdown (%)": _max_drawdown(equity, invested),
+            "Exposure (%)": exposure / max(n_days, 1) * 100,
+        })
+    summary = summary[~np.isnan(invested)].reset_index(drop=True)
+
+    if not trades.empty:
+        trades = trades.assign(
+            Ticker=[tickers[i] for i in trades["ticker"].astype(int)],
+            Masuk=dates[trades["entry_day"].astype(int)],
+            Keluar=[dates[i] if i >= 0 else pd.NaT for i in trades["exit_day"].astype(int)],
+        )[["Ticker", "Masuk", "Keluar", "entry", "exit", "pnl", "reason"]].rename(
+            columns={"entry": "Harga Masuk", "exit": "Harga Keluar", "pnl": "P&L (Rp)", "reason": "Alasan"})
+    return {
+        "equity": pd.DataFrame(equity, index=dates, columns=tickers),
+        "summary": summary,
+        "trades": trades,
+    }
+
+def backtest(panel, tickers, strategy="ma_cross", lots=1, fee_buy=FEE_BUY, fee_sell=FEE_SELL,
+             stop_loss=None, max_hold=None, **params):
+    """Satu pintu: panel -> sinyal -> simulasi."""
+    tickers = list(tickers)
+    px = prices(panel, tickers)
+    want = signals(px, strategy, **params)
+    return run(px, want, lots=lots, fee_buy=fee_buy, fee_sell=fee_sell,
+               stop_loss=stop_loss, max_hold=max_hold, enter_first=(strategy == "buy_hold"))
@@ -0,0 +1,41 @@
+"""
+Benchmark pipeline data secara offline (tanpa Yahoo).
+
+Contoh:
+    python benchmark.py --tickers 950 --period 5y
+    python benchmark.py --provider fixture:fixtures/ --tickers 100
+"""
+import os
+import time
+import argparse
+import tempfile
+
+def timed(label, fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    print(f"{label:<40} {time.perf_counter() - t0:8.3f} s")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark store OHLCV dengan provider offline")
+    parser.add_argument("--tickers", type=int, default=950, help="Jumlah ticker sintetis")
+    parser.add_argument("--period", default="5y", help="Periode histori (kode Yahoo)")
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--provider", default="synthetic", help="synthetic | fixture:<folder>")
+    args = parser.parse_args()
+
+    # Store sementara supaya benchmark tidak mengotori data/ohlcv
+    os.environ["OHLCV_STORE_DIR"] = tempfile.mkdtemp(prefix="ohlcv_bench_")
+    import data_provider
+    import ohlcv_store
+
+    data_provider.set_provider(data_provider.make_provider(args.provider))
+    tickers = [f"T{i:04d}.JK" for i in range(args.tickers)]
+
+    print(f"Provider: {args.provider} | Ticker: {len(tickers)} | Periode: {args.period} | Store: {ohlcv_store.STORE_DIR}")
+    panel = timed("cold download (provider -> store)", ohlcv_store.download, tickers, period=args.period, interval=args.interval)
+    timed("warm download (store saja)", ohlcv_store.download, tickers, period=args.period, interval=args.interval)
+    print(f"Panel: {panel.shape[0]} baris x {panel.shape[1]} kolom")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Pemanas cache latar belakang yang mengikuti jam bursa IDX.
+
+Dashboard mendaftarkan job (fungsi yang memanggil fungsi @st.cache_data dengan
+token `market_clock.cache_version()`). Satu thread per proses menjalankan semua
+job setiap kali token berganti: tiap `cadence` detik saat sesi berjalan, lalu
+sekali setelah penutupan — sesudahnya token beku dan thread tidur sampai sesi
+berikutnya. User hampir selalu mendapat cache yang sudah hangat.
+"""
+import time
+import threading
+
+import market_clock
+
+WARM_CADENCE = 300
+
+# Cache diputar oleh token versi, jadi TTL cukup panjang untuk melewati akhir pekan
+CACHE_TTL = 4 * 24 * 3600
+
+_jobs = {}
+_status = {"version": None, "last_run": None, "seconds": None, "errors": {}}
+_lock = threading.Lock()
+_thread = None
+
+def register(name, fn):
+    """Daftarkan / ganti job `fn(version)`. Aman dipanggil ulang di setiap rerun Streamlit."""
+    with _lock:
+        _jobs[name] = fn
+
+def status():
+    with _lock:
+        return dict(_status, jobs=sorted(_jobs))
+
+def run_once(version=None):
+    """Jalankan semua job untuk token `version` (default: token saat ini)."""
+    version = version or market_clock.cache_version(WARM_CADENCE)
+    with _lock:
+        jobs = list(_jobs.items())
+    t0 = time.perf_counter()
+    errors = {}
+    for name, fn in jobs:
+        try:
+            fn(version)
+        except Exception as e:
+            errors[name] = str(e)
+    with _lock:
+        _status.update(version=version, last_run=time.time(), seconds=round(time.perf_counter() - t0, 2), errors=errors)
+    return errors
+
+def _sleep_seconds(now=None):
+    now = market_clock._to_jkt(now)
+    settle_end = market_clock.last_session_end(now).timestamp() + market_clock.SETTLE_MINUTES * 60
+    if market_clock.is_market_open(now) or now.timestamp() < settle_end:
+        # Bangun tepat setelah token berikutnya berlaku
+        return WARM_CADENCE - now.timestamp() % WARM_CADENCE + 1
+    # Token beku: tidur sampai sesi berikutnya dibuka (dicek ulang paling lambat tiap jam)
+    wake = market_clock.next_session_start(now).timestamp()
+    return max(5, min(wake - now.timestamp() + 1, 3600))
+
+def _loop():
+    while True:
+        version = market_clock.cache_version(WARM_CADENCE)
+        if version != _status["version"]: run_once(version)
+        time.sleep(_sleep_seconds())
+
+def start():
+    """Mulai thread pemanas (sekali per proses)."""
+    global _thread
+    with _lock:
+        if _thread is not None and _thread.is_alive(): return
+        _thread = threading.Thread(target=_loop, name="cache-warmer", daemon=True)
+        _thread.start()
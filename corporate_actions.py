@@ -0,0 +1,74 @@
+"""
+Mesin penyesuaian aksi korporasi (dividen, split, rights) untuk bar OHLCV.
+
+Store menyimpan bar mentah (auto_adjust=False) dan tabel aksi per ticker.
+Faktor penyesuaian dihitung SEKALI saat aksi pertama kali masuk (butuh Close
+sehari sebelum ex-date), lalu diterapkan saat baca secara vektor:
+
+    harga_adj[t] = harga[t] * prod(Factor aksi dengan tanggal > t)
+    volume_adj[t] = volume[t] * prod(VolFactor aksi dengan tanggal > t)
+
+Harga Yahoo sudah disesuaikan split, jadi untuk sumber seperti itu split hanya
+dicatat (faktor 1) supaya tidak tersesuaikan dua kali.
+"""
+import numpy as np
+import pandas as pd
+
+ACTION_FIELDS = ["Dividends", "Stock Splits"]
+PRICE_COLS = ["Open", "High", "Low", "Close"]
+TABLE_COLUMNS = ACTION_FIELDS + ["Factor", "VolFactor"]
+
+def empty_table():
+    df = pd.DataFrame(columns=TABLE_COLUMNS, dtype="float64")
+    df.index = pd.DatetimeIndex([], name="Date")
+    return df
+
+def split_bars(df):
+    """Pisahkan kolom aksi dari bar: return (bar harga saja, baris aksi yang tidak nol)."""
+    cols = [c for c in ACTION_FIELDS if c in df.columns]
+    if not cols: return df, empty_table()[ACTION_FIELDS]
+    acts = df[cols].fillna(0.0).reindex(columns=ACTION_FIELDS, fill_value=0.0)
+    acts = acts[(acts != 0).any(axis=1)]
+    return df.drop(columns=cols), acts
+
+def compute_factors(acts, bars, split_adjusted=True):
+    """Tambahkan kolom Factor/VolFactor ke baris aksi berdasarkan Close bar sebelumnya."""
+    table = acts.reindex(columns=TABLE_COLUMNS).astype("float64")
+    if table.empty: return table
+    close = bars["Close"].to_numpy(dtype="float64")
+    pos = np.searchsorted(bars.index.values, table.index.values, side="left")
+    prev_close = np.where(pos > 0, close[np.maximum(pos - 1, 0)], np.nan)
+    div = table["Dividends"].to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        div_factor = np.where((div > 0) & (prev_close > 0), 1.0 - div / prev_close, 1.0)
+    div_factor = np.clip(np.nan_to_num(div_factor, nan=1.0), 1e-6, 1.0)
+    ratio = table["Stock Splits"].to_numpy()
+    ratio = np.where(ratio > 0, ratio, 1.0)
+    split_price = np.ones_like(ratio) if split_adjusted else 1.0 / ratio
+    table["Factor"] = div_factor * split_price
+    table["VolFactor"] = np.ones_like(ratio) if split_adjusted else ratio
+    return table
+
+def merge_tables(old, new):
+    if old is None or old.empty: return new.sort_index()
+    if new is None or new.empty: return old.sort_index()
+    merged = pd.concat([old, new])
+    return merged[~merged.index.duplicated(keep="last")].sort_index()
+
+def _suffix_product(values):
+    # out[i] = prod(values[i:]); out[n] = 1 -> faktor untuk bar sebelum aksi ke-i
+    return np.append(np.cumprod(values[::-1])[::-1], 1.0)
+
+def apply(df, table):
+    """Versi disesuaikan dari `df` (salinan). Tanpa aksi -> df dikembalikan apa adanya."""
+    if df.empty or table is None or table.empty: return df
+    bar_days = pd.DatetimeIndex(df.index)
+    if bar_days.tz is not None: bar_days = bar_days.tz_localize(None)
+    idx = np.searchsorted(table.index.values, bar_days.values, side="right")
+    price_mult = _suffix_product(table["Factor"].to_numpy())[idx]
+    vol_mult = _suffix_product(table["VolFactor"].to_numpy())[idx]
+    out = df.copy()
+    cols = [c for c in PRICE_COLS if c in out.columns]
+    out[cols] = out[cols].to_numpy() * price_mult[:, None]
+    if "Volume" in out.columns: out["Volume"] = out["Volume"].to_numpy() * vol_mult
+    return out
@@ -0,0 +1,138 @@
+"""
+Mesin korelasi & clustering untuk tab Bandingkan.
+
+- Return harian (log) `window` bar terakhir dipivot menjadi matriks tanggal x ticker.
+- Korelasi seluruh pasangan = SATU perkalian matriks Gram (X^T X) yang dihitung
+  per blok kolom (tile), bukan `corr()` pandas per pasangan. Data kosong
+  (suspend) diisi 0 setelah di-demean, dan penyebutnya memakai jumlah kuadrat
+  pada tanggal yang tumpang tindih saja, jadi hasilnya mendekati korelasi
+  pairwise-complete.
+- Urutan heatmap dari hierarchical clustering (average linkage) pada jarak
+  sqrt((1 - rho) / 2). Memakai scipy kalau terpasang, kalau tidak fallback NumPy
+  O(n^2) (nearest-neighbor chain).
+
+Matriks di-cache per daftar & window oleh pemanggil (sudah diurutkan per
+cluster); `subset()` mengiris matriks yang sudah ada tanpa hitung ulang.
+"""
+import numpy as np
+import pandas as pd
+
+import weekly_recap
+
+try:
+    from scipy.cluster import hierarchy
+    from scipy.spatial.distance import squareform
+except ImportError:
+    hierarchy = None
+
+BLOCK = 256
+MIN_OVERLAP = 0.6  # porsi minimal tanggal yang tumpang tindih supaya korelasi pasangan dihitung
+
+# ==============================
+# 1. KORELASI
+# ==============================
+
+def returns(panel, tickers, window=60):
+    """Matriks log return `window` bar terakhir (tanggal x ticker)."""
+    close = weekly_recap.to_matrix(panel, tickers, "Close")
+    prev = pd.DataFrame(close).ffill().shift(1).to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ret = np.log(close / prev)
+    ret[~np.isfinite(ret)] = np.nan
+    return ret[-window:]
+
+def _gram(a, b, block=BLOCK, symmetric=False):
+    """a^T b per tile kolom (memori tetap kecil walau N besar)."""
+    out = np.empty((a.shape[1], b.shape[1]))
+    for i in range(0, a.shape[1], block):
+        for j in range(i if symmetric else 0, b.shape[1], block):
+            tile = a[:, i:i + block].T @ b[:, j:j + block]
+            out[i:i + block, j:j + block] = tile
+            if symmetric and j != i: out[j:j + block, i:i + block] = tile.T
+    return out
+
+def matrix(panel, tickers, window=60, block=BLOCK):
+    """DataFrame korelasi N x N untuk `window` hari bursa terakhir."""
+    tickers = list(tickers)
+    ret = returns(panel, tickers, window)
+    valid = ~np.isnan(ret)
+    n_valid = valid.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(n_valid > 0, np.nansum(ret, axis=0) / n_valid, 0.0)
+    x = np.where(valid, ret - mean, 0.0)
+    m = valid.astype("float64")
+    num = _gram(x, x, block, symmetric=True)
+    # Jumlah kuadrat x_i hanya pada tanggal yang juga valid untuk j
+    ss = _gram(x * x, m, block)
+    overlap = _gram(m, m, block, symmetric=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = num / np.sqrt(ss * ss.T)
+    enough = overlap >= max(3, MIN_OVERLAP * len(ret))
+    corr = np.where(enough, np.clip(corr, -1.0, 1.0), np.nan)
+    np.fill_diagonal(corr, np.where(np.diag(enough), 1.0, np.nan))
+    return pd.DataFrame(corr, index=tickers, columns=tickers)
+
+def subset(corr, tickers):
+    """
+    Irisan keranjang dari matriks universe (ticker yang tidak ada dilewati).
+    Urutan baris matriks dipertahankan: kalau matriks sudah diurutkan dengan
+    `cluster_order()`, irisannya otomatis ikut terurut per cluster.
+    """
+    keep = corr.index[corr.index.isin(list(tickers))]
+    return corr.loc[keep, keep]
+
+# ==============================
+# 2. CLUSTERING
+# ==============================
+
+def _average_linkage_order(dist):
+    """
+    Fallback NumPy: average linkage (UPGMA) lewat nearest-neighbor chain, O(n^2).
+    Average linkage bersifat reducible, jadi hasil pohonnya sama dengan
+    penggabungan pasangan terdekat global; urutan daun kiri -> kanan.
+    """
+    n = len(dist)
+    d = dist.astype("float64").copy()
+    np.fill_diagonal(d, np.inf)
+    size = np.ones(n)
+    members = {i: [i] for i in range(n)}
+    chain = []
+    while len(members) > 1:
+        if not chain: chain.append(next(iter(members)))
+        a = chain[-1]
+        b = int(np.argmin(d[a]))
+        # Seri dengan elemen chain sebelumnya: utamakan dia supaya chain tidak berputar
+        if len(chain) > 1 and d[a, chain[-2]] <= d[a, b]: b = chain[-2]
+        if len(chain) < 2 or b != chain[-2]:
+            chain.append(b)
+            continue
+        chain = chain[:-2]
+        merged = (size[a] * d[a] + size[b] * d[b]) / (size[a] + size[b])
+        d[a, :] = merged
+        d[:, a] = merged
+        d[b, :] = np.inf
+        d[:, b] = np.inf
+        d[a, a] = np.inf
+        size[a] += size[b]
+        members[a] = members[a] + members.pop(b)
+    return next(iter(members.values())) if members else []
+
+def cluster_order(corr):
+    """Urutan ticker untuk heatmap (ticker yang mirip berdekatan)."""
+    if len(corr) < 3: return list(corr.index)
+    rho = np.nan_to_num(corr.to_numpy(), nan=0.0)
+    dist = np.sqrt(np.clip((1 - rho) / 2, 0.0, 1.0))
+    np.fill_diagonal(dist, 0.0)
+    dist = (dist + dist.T) / 2
+    if hierarchy is not None:
+        link = hierarchy.linkage(squareform(dist, checks=False), method="average")
+        order = hierarchy.leaves_list(hierarchy.optimal_leaf_ordering(link, squareform(dist, checks=False)))
+    else:
+        order = _average_linkage_order(dist)
+    return [corr.index[i] for i in order]
+
+def top_pairs(corr, ticker, n=5):
+    """Ticker dengan korelasi tertinggi ke `ticker` (selain dirinya)."""
+    if ticker not in corr.index: return pd.Series(dtype="float64")
+    row = corr.loc[ticker].drop(ticker, errors="ignore").dropna()
+    return row.nlargest(n)
@@ -0,0 +1,263 @@
+"""
+Sumber data yang bisa diganti-ganti (pluggable) untuk semua dashboard.
+
+- YFinanceProvider : data live dari Yahoo Finance (default)
+- SyntheticProvider: data sintetis deterministik, tanpa network
+- FixtureProvider  : data rekaman (Parquet/JSON) dari run sebelumnya, fallback ke sintetis
+
+Semua provider punya method yang sama:
+    download(tickers, start, end, interval) -> bentuk yf.download(group_by='ticker', auto_adjust=False, actions=True)
+    info(ticker)                            -> dict seperti yf.Ticker(t).info
+    financials(ticker)                      -> (quarterly_financials.T, financials.T)
+
+Pilih provider lewat env `STOCK_DATA_PROVIDER`: "yfinance", "synthetic", atau "fixture:<folder>".
+"""
+import os
+import json
+import zlib
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+FIELDS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+ACTION_FIELDS = ["Dividends", "Stock Splits"]
+JKT_TZ = "Asia/Jakarta"
+
+# ==============================
+# 1. YFINANCE (LIVE)
+# ==============================
+
+class YFinanceProvider:
+    name = "yfinance"
+    # Harga Yahoo (Close) sudah disesuaikan split; dividen belum
+    split_adjusted = True
+
+    def download(self, tickers, start=None, end=None, interval="1d"):
+        return yf.download(
+            tickers, start=start, end=end, interval=interval, actions=True,
+            group_by="ticker", auto_adjust=False, progress=False, threads=True
+        )
+
+    def info(self, ticker):
+        return yf.Ticker(ticker).info
+
+    def financials(self, ticker):
+        stock = yf.Ticker(ticker)
+        return stock.quarterly_financials.T, stock.financials.T
+
+# ==============================
+# 2. SINTETIS (OFFLINE)
+# ==============================
+
+class SyntheticProvider:
+    """
+    Harga random-walk yang deterministik per ticker: tanggal yang sama selalu
+    menghasilkan bar yang sama, berapapun rentang yang diminta.
+    """
+    name = "synthetic"
+    split_adjusted = False
+    EPOCH = pd.Timestamp("2010-01-01")
+
+    def __init__(self, seed=0):
+        self.seed = seed
+
+    def _rng(self, *keys):
+        key = "|".join(str(k) for k in (self.seed,) + keys)
+        return np.random.default_rng(zlib.crc32(key.encode()))
+
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _business_days(first_day, last_day):
+        days = pd.date_range(first_day, last_day, freq="D")
+        return days[days.dayofweek < 5]
+
+    def _daily(self, ticker, last_day):
+        days = self._business_days(self.EPOCH, last_day)
+        rng = self._rng(ticker, "1d")
+        n = len(days)
+        start_price = float(rng.uniform(50, 10000))
+        drift, vol = rng.normal(0.0002, 0.0003), rng.uniform(0.01, 0.04)
+        close = start_price * np.exp(np.cumsum(rng.normal(drift, vol, n)))
+        prev = np.concatenate([[start_price], close[:-1]])
+        # Satu stream per field: nilai ke-i tiap field tidak bergantung pada panjang rentang
+        field = lambda f: self._rng(ticker, "1d", f)
+        opn = prev * (1 + field("Open").normal(0, vol / 4, n))
+        high = np.maximum(opn, close) * (1 + np.abs(field("High").normal(0, vol / 2, n)))
+        low = np.minimum(opn, close) * (1 - np.abs(field("Low").normal(0, vol / 2, n)))
+        volume = np.round(field("Volume").lognormal(15, 1, n), -2)
+        df = pd.DataFrame({
+            "Open": opn, "High": high, "Low": low, "Close": close, "Adj Close": close, "Volume": volume
+        }, index=days).round(0)
+        # Dividen tahunan (hari bursa pertama bulan Juni), tanpa split
+        first_june = (days.month == 6) & ~pd.Series(days.month == 6).shift(1, fill_value=False).to_numpy()
+        df["Dividends"] = np.where(first_june, (close * field("Dividends").uniform(0.01, 0.05, n)).round(0), 0.0)
+        df["Stock Splits"] = 0.0
+        df.index.name = "Date"
+        return df
+
+    def _intraday(self, ticker, daily):
+        # Bar 5 menit 09:00-15:45 WIB, dijembatani dari open ke close harian
+        slots = pd.timedelta_range(start="9h", end="15h45min", freq="5min")
+        frames = []
+        for day, bar in daily.iterrows():
+            rng = self._rng(ticker, "5m", day.date())
+            steps = rng.normal(0, 1, len(slots)).cumsum()
+            steps = steps - np.linspace(0, steps[-1], len(slots))
+            path = np.linspace(bar["Open"], bar["Close"], len(slots)) + steps * bar["Close"] * 0.002
+            path = np.clip(path, bar["Low"], bar["High"])
+            opn = np.concatenate([[bar["Open"]], path[:-1]])
+            idx = (day + slots).tz_localize(JKT_TZ)
+            frames.append(pd.DataFrame({
+                "Open": opn, "High": np.maximum(opn, path), "Low": np.minimum(opn, path),
+                "Close": path, "Adj Close": path,
+                "Volume": np.round(bar["Volume"] / len(slots) * rng.uniform(0.5, 1.5, len(slots)), -2)
+            }, index=idx).round(0))
+        if not frames: return pd.DataFrame(columns=FIELDS)
+        df = pd.concat(frames)
+        df.index.name = "Datetime"
+        return df
+
+    def history(self, ticker, start=None, end=None, interval="1d"):
+        end_ts = pd.Timestamp(end) if end is not None else pd.Timestamp(datetime.now())
+        start_ts = pd.Timestamp(start) if start is not None else self.EPOCH
+        if start_ts.tz is not None: start_ts = start_ts.tz_convert(JKT_TZ).tz_localize(None)
+        if end_ts.tz is not None: end_ts = end_ts.tz_convert(JKT_TZ).tz_localize(None)
+        daily = self._daily(ticker, end_ts.normalize())
+        if interval == "1d":
+            return daily[(daily.index >= start_ts) & (daily.index < end_ts)]
+        daily = daily[(daily.index >= start_ts.normalize()) & (daily.index <= end_ts)]
+        bars = self._intraday(ticker, daily)
+        naive = bars.index.tz_localize(None)
+        return bars[(naive >= start_ts) & (naive < end_ts)]
+
+    def download(self, tickers, start=None, end=None, interval="1d"):
+        if isinstance(tickers, str): tickers = [tickers]
+        frames = {t: self.history(t, start, end, interval) for t in tickers}
+        if len(tickers) == 1: return frames[tickers[0]]
+        return pd.concat(frames, axis=1)
+
+    def info(self, ticker):
+        rng = self._rng(ticker, "info")
+        last = self._daily(ticker, pd.Timestamp(datetime.now()).normalize())
+        year = last.tail(252)
+        price = float(last["Close"].iloc[-1])
+        shares = float(rng.uniform(1e9, 1e11))
+        industries = ["Banks", "Coal", "Telecom Services", "Packaged Foods", "Real Estate", "Retail", "Nickel", "Utilities"]
+        quarter_end = (pd.Timestamp(datetime.now()) - pd.offsets.QuarterEnd(1)).normalize()
+        return {
+            "longName": f"{ticker.replace('.JK', '')} Tbk (Synthetic)",
+            "shortName": ticker.replace(".JK", ""),
+            "industry": industries[int(rng.integers(len(industries)))],
+            "sector": "Synthetic",
+            "currentPrice": price, "regularMarketPrice": price, "previousClose": float(last["Close"].iloc[-2]),
+            "marketCap": price * shares,
+            "fiftyTwoWeekHigh": float(year["High"].max()), "fiftyTwoWeekLow": float(year["Low"].min()),
+            "trailingPE": float(rng.uniform(3, 40)), "priceToBook": float(rng.uniform(0.3, 8)),
+            "trailingEps": price / float(rng.uniform(3, 40)),
+            "earningsQuarterlyGrowth": float(rng.normal(0.05, 0.3)),
+            "dividendYield": float(rng.uniform(0, 0.08)),
+            "mostRecentQuarter": int(quarter_end.timestamp()),
+        }
+
+    def financials(self, ticker):
+        rng = self._rng(ticker, "fin")
+        q_idx = pd.date_range(end=datetime.now(), periods=5, freq="QE").normalize()
+        a_idx = pd.date_range(end=datetime.now(), periods=4, freq="YE").normalize()
+        def make(idx, scale):
+            rev = rng.uniform(1e12, 5e13) * scale * (1 + rng.normal(0.02, 0.05, len(idx))).cumprod()
+            return pd.DataFrame({"Total Revenue": rev, "Net Income": rev * rng.uniform(0.05, 0.2)}, index=idx)
+        return make(q_idx, 0.25), make(a_idx, 1.0)
+
+# ==============================
+# 3. FIXTURE (REKAMAN)
+# ==============================
+
+class FixtureProvider:
+    """
+    Membaca rekaman dari folder:
+        <folder>/<interval>/<ticker>.parquet
+        <folder>/info/<ticker>.json
+    Ticker yang tidak ada rekamannya diisi oleh SyntheticProvider.
+    """
+    name = "fixture"
+    split_adjusted = True
+
+    def __init__(self, folder, fallback=None):
+        self.folder = folder
+        self.fallback = fallback or SyntheticProvider()
+
+    def history(self, ticker, start=None, end=None, interval="1d"):
+        path = os.path.join(self.folder, interval, f"{ticker}.parquet")
+        if not os.path.exists(path):
+            return self.fallback.history(ticker, start, end, interval)
+        df = pd.read_parquet(path)
+        if start is not None: df = df[df.index >= _align(start, df.index)]
+        if end is not None: df = df[df.index < _align(end, df.index)]
+        return df
+
+    def download(self, tickers, start=None, end=None, interval="1d"):
+        if isinstance(tickers, str): tickers = [tickers]
+        frames = {t: self.history(t, start, end, interval) for t in tickers}
+        if len(tickers) == 1: return frames[tickers[0]]
+        return pd.concat(frames, axis=1)
+
+    def info(self, ticker):
+        path = os.path.join(self.folder, "info", f"{ticker}.json")
+        if not os.path.exists(path): return self.fallback.info(ticker)
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def financials(self, ticker):
+        return self.fallback.financials(ticker)
+
+def _align(ts, index):
+    ts = pd.Timestamp(ts)
+    tz = getattr(index, "tz", None)
+    if tz is not None and ts.tz is None: return ts.tz_localize(tz)
+    if tz is None and ts.tz is not None: return ts.tz_convert(None)
+    return ts
+
+def record_fixtures(tickers, folder, start=None, end=None, interval="1d", source=None, with_info=True):
+    """Rekam data dari provider (default: Yahoo) ke folder fixture untuk dipakai offline."""
+    source = source or YFinanceProvider()
+    os.makedirs(os.path.join(folder, interval), exist_ok=True)
+    data = source.download(tickers, start=start, end=end, interval=interval)
+    for t in tickers:
+        try:
+            if isinstance(data.columns, pd.MultiIndex): df = data[t]
+            else: df = data
+            df = df[[c for c in FIELDS + ACTION_FIELDS if c in df.columns]].dropna(how="all")
+            if not df.empty: df.to_parquet(os.path.join(folder, interval, f"{t}.parquet"))
+        except: continue
+        if with_info:
+            try:
+                os.makedirs(os.path.join(folder, "info"), exist_ok=True)
+                with open(os.path.join(folder, "info", f"{t}.json"), "w") as f:
+                    json.dump(source.info(t), f, default=str)
+            except: continue
+
+# ==============================
+# 4. REGISTRY
+# ==============================
+
+_provider = None
+
+def make_provider(spec):
+    spec = (spec or "yfinance").strip()
+    if spec == "yfinance": return YFinanceProvider()
+    if spec == "synthetic": return SyntheticProvider()
+    if spec.startswith("fixture:"): return FixtureProvider(spec.split(":", 1)[1])
+    raise ValueError(f"Provider tidak dikenal: {spec}")
+
+def get_provider():
+    global _provider
+    if _provider is None:
+        _provider = make_provider(os.environ.get("STOCK_DATA_PROVIDER"))
+    return _provider
+
+def set_provider(provider):
+    global _provider
+    _provider = provider
@@ -0,0 +1,120 @@
+"""
+Perencana download untuk universe besar (±950 ticker).
+
+Universe dipecah menjadi beberapa chunk yang di-download paralel. Ticker yang
+kembali kosong / NaN semua di-retry (hanya ticker itu saja, dengan chunk lebih
+kecil), lalu semua hasil digabung. Setiap panggilan menghasilkan laporan:
+waktu per chunk dan daftar ticker yang tetap gagal.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import data_provider
+
+FIELDS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+# Kolom aksi korporasi ikut disimpan sementara; store memindahkannya ke tabel aksi
+ACTION_FIELDS = ["Dividends", "Stock Splits"]
+
+# Ukuran chunk hasil tuning: cukup besar supaya jumlah request sedikit,
+# cukup kecil supaya satu request lambat tidak menahan seluruh universe
+CHUNK_SIZE = 100
+MAX_WORKERS = 4
+RETRIES = 2
+RETRY_DELAY = 2.0
+
+# ==============================
+# 1. FORMAT
+# ==============================
+
+def _normalize_index(df):
+    idx = pd.DatetimeIndex(df.index)
+    df = df.copy()
+    df.index = idx
+    df.index.name = "Datetime" if idx.tz is not None else "Date"
+    return df
+
+def split_download(data, tickers):
+    """Pecah hasil yf.download(group_by='ticker') menjadi dict {ticker: DataFrame}."""
+    frames = {}
+    if data is None or data.empty: return frames
+    for t in tickers:
+        try:
+            if isinstance(data.columns, pd.MultiIndex):
+                if t not in data.columns.get_level_values(0): continue
+                df = data[t]
+            else:
+                if len(tickers) != 1: continue
+                df = data
+            df = df[[c for c in FIELDS + ACTION_FIELDS if c in df.columns]]
+            df = df[df[[c for c in FIELDS if c in df.columns]].notna().any(axis=1)]
+            if not df.empty: frames[t] = _normalize_index(df)
+        except:
+            continue
+    return frames
+
+def _is_missing(df):
+    if df is None or df.empty: return True
+    col = "Close" if "Close" in df.columns else "Adj Close"
+    return col not in df.columns or df[col].isna().all()
+
+# ==============================
+# 2. PLANNER
+# ==============================
+
+def plan_chunks(tickers, chunk_size=CHUNK_SIZE):
+    tickers = list(tickers)
+    return [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+
+def _run_chunk(chunk, start, end, interval, attempt):
+    t0 = time.perf_counter()
+    error = None
+    try:
+        data = data_provider.get_provider().download(chunk, start=start, end=end, interval=interval)
+        frames = split_download(data, chunk)
+    except Exception as e:
+        frames, error = {}, str(e)
+    missing = [t for t in chunk if _is_missing(frames.get(t))]
+    info = {
+        "attempt": attempt, "tickers": len(chunk), "seconds": round(time.perf_counter() - t0, 3),
+        "missing": len(missing), "error": error
+    }
+    return frames, missing, info
+
+def download_chunked(tickers, start=None, end=None, interval="1d",
+                     chunk_size=CHUNK_SIZE, max_workers=MAX_WORKERS, retries=RETRIES):
+    """
+    Download `tickers` per chunk secara paralel.
+    Return (frames, report) — frames: {ticker: DataFrame}, report: dict berisi
+    `chunks` (waktu & jumlah gagal per chunk), `retried`, `failed`, `seconds`.
+    """
+    t0 = time.perf_counter()
+    tickers = list(dict.fromkeys(tickers))
+    frames, report = {}, {"chunks": [], "retried": [], "failed": []}
+    todo = tickers
+    for attempt in range(retries + 1):
+        if not todo: break
+        if attempt > 0:
+            report["retried"].extend(todo)
+            time.sleep(RETRY_DELAY * attempt)
+        # Retry memakai chunk lebih kecil supaya ticker bermasalah tidak saling menyeret
+        size = max(1, chunk_size // (4 ** attempt))
+        chunks = plan_chunks(todo, size)
+        missing = []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+            results = pool.map(lambda c: _run_chunk(c, start, end, interval, attempt), chunks)
+            for chunk_frames, chunk_missing, info in results:
+                frames.update({t: df for t, df in chunk_frames.items() if not _is_missing(df)})
+                missing.extend(chunk_missing)
+                report["chunks"].append(info)
+        todo = missing
+    report["failed"] = todo
+    report["seconds"] = round(time.perf_counter() - t0, 3)
+    return frames, report
+
+def merge_reports(total, report):
+    """Gabungkan laporan beberapa panggilan download_chunked (untuk statistik sync)."""
+    total.setdefault("chunks", []).extend(report.get("chunks", []))
+    total.setdefault("failed", []).extend(report.get("failed", []))
+    return total
@@ -0,0 +1,200 @@
+"""
+High/low bergulir (52 minggu atau jendela lain) dari bar lokal, pengganti
+`fiftyTwoWeekHigh` / `fiftyTwoWeekLow` dari `.info`.
+
+Dua jalur:
+1. `rolling_max()` / `rolling_min()` : seluruh matriks tanggal x ticker dalam
+   satu pass (algoritma van Herk/Gil-Werman: prefix & suffix max per blok n
+   bar, biaya tetap per elemen berapa pun panjang jendelanya). Dipakai untuk
+   garis di chart.
+2. `update()` : nilai terakhir untuk seluruh universe dengan deque monoton per
+   ticker. State disimpan di samping store harga
+       data/ohlcv/extremes/window=252.json
+   sehingga refresh harian hanya mendorong bar baru (O(1) per bar). Bar
+   terakhir dianggap sementara (candle berjalan) dan hanya di-`peek()`.
+   Kalau bar lama berubah (revisi data) state ticker itu dibangun ulang dari
+   `window` bar terakhir.
+
+Jendela dihitung dalam bar VALID per ticker (suspend tidak ikut dihitung).
+Ticker yang historinya belum sepanjang jendela memakai bar yang tersedia,
+sama seperti angka 52-week milik Yahoo untuk saham baru listing.
+Harga yang dipakai harga mentah (tidak di-adjust), seperti `.info`.
+"""
+import os
+import json
+import math
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+import ohlcv_store
+import weekly_recap
+
+# ==============================
+# 1. KONFIGURASI
+# ==============================
+
+EXTREMES_DIR = os.path.join(ohlcv_store.STORE_DIR, "extremes")
+WINDOW = 252  # ±52 minggu bursa
+PERIOD = "2y"  # histori yang dibaca pemanggil, cukup untuk WINDOW bar penuh
+
+_lock = threading.RLock()
+_memo = {}
+
+# ==============================
+# 2. SLIDING WINDOW (VEKTOR)
+# ==============================
+
+def _sliding(mat, n, ufunc):
+    """Jendela n baris untuk semua kolom; baris awal memakai data yang tersedia."""
+    t, k = mat.shape
+    out = np.full(mat.shape, np.nan)
+    if not t: return out
+    head = min(n - 1, t)
+    out[:head] = ufunc.accumulate(mat[:head], axis=0)
+    if t < n: return out
+    pad = (-t) % n
+    blocks = np.vstack([mat, np.full((pad, k), np.nan)]).reshape(-1, n, k)
+    pre = ufunc.accumulate(blocks, axis=1).reshape(-1, k)[:t]
+    suf = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(-1, k)[:t]
+    out[n - 1:] = ufunc(suf[:t - n + 1], pre[n - 1:])
+    return out
+
+def _compacted(mat, n, ufunc):
+    # Bar valid dipadatkan ke bawah per kolom (pola yang sama dengan technicals._window_sums)
+    valid = ~np.isnan(mat)
+    order = np.argsort(valid, axis=0, kind="stable")
+    packed = _sliding(np.take_along_axis(mat, order, axis=0), n, ufunc)
+    out = np.empty(mat.shape)
+    np.put_along_axis(out, order, packed, axis=0)
+    return np.where(valid, out, np.nan)
+
+def rolling_max(mat, n=WINDOW):
+    return _compacted(np.asarray(mat, dtype="float64"), n, np.fmax)
+
+def rolling_min(mat, n=WINDOW):
+    return _compacted(np.asarray(mat, dtype="float64"), n, np.fmin)
+
+# ==============================
+# 3. STATE INKREMENTAL (DEQUE MONOTON)
+# ==============================
+
+class Window:
+    """Max high & min low dari n bar terakhir; `push` O(1) amortized."""
+
+    def __init__(self, n, count=0, hi=(), lo=()):
+        self.n = n
+        self.count = count
+        self.hi = deque(tuple(e) for e in hi)
+        self.lo = deque(tuple(e) for e in lo)
+
+    def push(self, high, low):
+        i = self.count
+        while self.hi and self.hi[-1][1] <= high: self.hi.pop()
+        self.hi.append((i, high))
+        while self.lo and self.lo[-1][1] >= low: self.lo.pop()
+        self.lo.append((i, low))
+        self.count += 1
+        cut = self.count - self.n
+        while self.hi[0][0] < cut: self.hi.popleft()
+        while self.lo[0][0] < cut: self.lo.popleft()
+
+    def peek(self, high, low):
+        """(max, min) kalau bar (high, low) ikut dihitung, tanpa mengubah state."""
+        cut = self.count + 1 - self.n
+        hi = next((v for j, v in self.hi if j >= cut), -np.inf)
+        lo = next((v for j, v in self.lo if j >= cut), np.inf)
+        return max(hi, high), min(lo, low)
+
+    def to_dict(self):
+        return {"count": self.count, "hi": list(self.hi), "lo": list(self.lo)}
+
+def _path(window, interval):
+    return os.path.join(EXTREMES_DIR, f"interval={interval}", f"window={window}.json")
+
+def _load(window, interval):
+    key = (interval, window)
+    if key in _memo: return _memo[key]
+    path, states = _path(window, interval), {}
+    try:
+        if os.path.exists(path):
+            with open(path, "r") as f: states = json.load(f)
+    except:
+        states = {}
+    _memo[key] = states
+    return states
+
+def _save(window, interval, states):
+    _memo[(interval, window)] = states
+    path = _path(window, interval)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f: json.dump(states, f)
+    os.replace(tmp, path)
+
+def _valid(saved, ts, high, low):
+    if not saved: return False
+    pos = np.searchsorted(ts, saved["last_ts"])
+    if pos >= len(ts) or ts[pos] != saved["last_ts"]: return False
+    return math.isclose(high[pos], saved["last_high"], rel_tol=1e-9) and math.isclose(low[pos], saved["last_low"], rel_tol=1e-9)
+
+def update(panel, tickers, window=WINDOW, interval="1d"):
+    """
+    High/low `window` bar terakhir untuk semua ticker: DataFrame index Ticker
+    dengan kolom Close, High, Low, Bars (jumlah bar di jendela).
+    Hanya bar setelah state terakhir yang diproses.
+    """
+    tickers = list(tickers)
+    out = pd.DataFrame(np.nan, index=pd.Index(tickers, name="Ticker"), columns=["Close", "High", "Low", "Bars"])
+    if panel is None or panel.empty or not tickers: return out
+    values = panel.to_numpy(dtype="float64")
+    high, low, close = (weekly_recap.to_matrix(panel, tickers, f, values) for f in ["High", "Low", "Close"])
+    idx = pd.DatetimeIndex(panel.index)
+    ts = (idx.tz_localize("UTC") if idx.tz is None else idx).as_unit("ns").asi8
+    ok = ~(np.isnan(high) | np.isnan(low))
+    res = np.full((len(tickers), 4), np.nan)
+
+    with _lock:
+        states, changed = dict(_load(window, interval)), False
+        for k, t in enumerate(tickers):
+            rows = np.nonzero(ok[:, k])[0]
+            if not len(rows): continue
+            t_ts, h, l = ts[rows], high[rows, k], low[rows, k]
+            saved = states.get(t)
+            if _valid(saved, t_ts, h, l):
+                start = np.searchsorted(t_ts, saved["last_ts"], side="right")
+                state = Window(window, **{x: saved[x] for x in ("count", "hi", "lo")})
+            else:
+                # Bangun ulang: cukup `window` bar terakhir sebelum bar sementara
+                saved, start = None, max(len(rows) - window, 0)
+                state = Window(window)
+            if start >= len(rows):
+                # Bar terakhir data sudah ter-commit di state: baca langsung, jangan dihitung dua kali
+                res[k] = [close[rows[-1], k], state.hi[0][1], state.lo[0][1], min(state.count, window)]
+                continue
+            for x, y in zip(h[start:-1], l[start:-1]): state.push(x, y)
+            commit = len(rows) - 2
+            if saved is None or start <= commit:
+                if commit >= 0:
+                    states[t] = dict(state.to_dict(), last_ts=int(t_ts[commit]),
+                                     last_high=float(h[commit]), last_low=float(l[commit]))
+                else: states.pop(t, None)
+                changed = True
+            hi, lo = state.peek(h[-1], l[-1])
+            res[k] = [close[rows[-1], k], hi, lo, min(state.count + 1, window)]
+        if changed: _save(window, interval, states)
+
+    out[["Close", "High", "Low", "Bars"]] = res
+    return out
+
+def distances(table):
+    """Tambahkan selisih ke high/low seperti kolom lama di M.py."""
+    table = table.copy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        table["Selisih dr High (IDR)"] = table["High"] - table["Close"]
+        table["Diskon dr High (%)"] = np.where(table["High"] > 0, table["Selisih dr High (IDR)"] / table["High"] * 100, 0.0)
+        table["Selisih dr Low (IDR)"] = table["Close"] - table["Low"]
+        table["Kenaikan dr Low (%)"] = np.where(table["Low"] > 0, table["Selisih dr Low (IDR)"] / table["Low"] * 100, 0.0)
+    return table
@@ -0,0 +1,111 @@
+"""
+Koordinator fetch tingkat proses (single-flight) untuk semua sesi Streamlit.
+
+Saat banyak user membuka dashboard bersamaan setelah cache kedaluwarsa,
+request yang sama tidak boleh menembak Yahoo berkali-kali:
+- Request identik / subset dari request yang sedang berjalan -> ikut menunggu hasilnya
+- Request dengan rentang tanggal sama yang datang hampir bersamaan -> digabung
+  menjadi satu download batch, tiap pemanggil mengambil bagiannya sendiri
+Counter `stats()` mencatat berapa panggilan yang berhasil dihemat.
+"""
+import time
+import threading
+from concurrent.futures import Future
+
+import download_planner
+
+# Jeda pengumpulan: request lain untuk rentang yang sama dalam jeda ini ikut satu batch
+BATCH_WINDOW = 0.05
+
+class _Batch:
+    def __init__(self):
+        self.tickers = set()
+        self.future = Future()
+
+class FetchCoordinator:
+    def __init__(self, fetch_fn=None, window=BATCH_WINDOW):
+        self.fetch_fn = fetch_fn or self._default_fetch
+        self.window = window
+        self.lock = threading.Lock()
+        self.pending = {}   # range key -> _Batch yang belum berangkat
+        self.inflight = {}  # range key -> [(frozenset tickers, Future)]
+        self.counters = {"requests": 0, "upstream_calls": 0, "deduplicated": 0, "merged": 0, "tickers_saved": 0}
+
+    @staticmethod
+    def _default_fetch(tickers, start, end, interval, **kwargs):
+        return download_planner.download_chunked(tickers, start=start, end=end, interval=interval, **kwargs)
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counters)
+
+    def fetch(self, tickers, start=None, end=None, interval="1d", **kwargs):
+        """
+        Sama seperti download_planner.download_chunked(...) -> (frames, report),
+        tapi request yang tumpang tindih berbagi satu panggilan upstream.
+        """
+        key = (str(start), str(end), interval, tuple(sorted(kwargs.items())))
+        want = set(tickers)
+        waits = []
+        leader = None
+        with self.lock:
+            self.counters["requests"] += 1
+            remaining = set(want)
+            # 1. Ambil bagian yang sudah sedang di-download oleh sesi lain
+            for tset, fut in self.inflight.get(key, []):
+                shared = remaining & tset
+                if shared:
+                    waits.append((shared, fut))
+                    remaining -= shared
+            if waits:
+                self.counters["tickers_saved"] += len(want) - len(remaining)
+                if not remaining: self.counters["deduplicated"] += 1
+            # 2. Sisanya ikut batch yang belum berangkat, atau jadi pemimpin batch baru
+            if remaining:
+                batch = self.pending.get(key)
+                if batch is None:
+                    batch = _Batch()
+                    self.pending[key] = batch
+                    leader = batch
+                else:
+                    self.counters["merged"] += 1
+                    self.counters["tickers_saved"] += len(remaining & batch.tickers)
+                batch.tickers |= remaining
+                waits.append((remaining, batch.future))
+
+        if leader is not None:
+            self._run(key, leader, start, end, interval, kwargs)
+
+        frames, failed, chunks = {}, [], []
+        for subset, fut in waits:
+            sub_frames, report = fut.result()
+            frames.update({t: sub_frames[t] for t in subset if t in sub_frames})
+            failed.extend(t for t in report.get("failed", []) if t in subset)
+            if fut is getattr(leader, "future", None): chunks = report.get("chunks", [])
+        return frames, {"chunks": chunks, "failed": failed, "retried": []}
+
+    def _run(self, key, batch, start, end, interval, kwargs):
+        time.sleep(self.window)
+        with self.lock:
+            self.pending.pop(key, None)
+            tset = frozenset(batch.tickers)
+            self.inflight.setdefault(key, []).append((tset, batch.future))
+            self.counters["upstream_calls"] += 1
+        try:
+            batch.future.set_result(self.fetch_fn(sorted(tset), start, end, interval, **kwargs))
+        except Exception as e:
+            batch.future.set_exception(e)
+        finally:
+            with self.lock:
+                flights = self.inflight.get(key, [])
+                flights[:] = [(t, f) for t, f in flights if f is not batch.future]
+                if not flights: self.inflight.pop(key, None)
+
+# Satu koordinator untuk seluruh proses (dipakai bersama oleh semua sesi)
+coordinator = FetchCoordinator()
+
+def fetch(tickers, start=None, end=None, interval="1d", **kwargs):
+    return coordinator.fetch(tickers, start=start, end=end, interval=interval, **kwargs)
+
+def stats():
+    return coordinator.stats()
@@ -0,0 +1,200 @@
+"""
+Cache fundamental di disk (SQLite) dengan TTL berbeda per kelompok field.
+
+Kelompok (group):
+- profile    : nama, industri, sektor              -> jarang berubah (TTL mingguan)
+- ratios     : harga, PER, PBV, EPS, market cap... -> harian
+- financials : laporan keuangan kuartalan/tahunan  -> hanya diambil ulang kalau
+               `mostRecentQuarter` di ratios sudah lebih baru dari yang tersimpan
+
+Data seluruh universe (±950 ticker) dibaca dalam satu query lewat `load_many()`.
+"""
+import os
+import json
+import time
+import sqlite3
+from io import StringIO
+
+import pandas as pd
+
+import data_provider
+import fundamentals_harvester
+
+# ==============================
+# 1. KONFIGURASI
+# ==============================
+
+DB_FILE = os.environ.get("FUNDAMENTALS_DB", os.path.join("data", "fundamentals.sqlite"))
+
+FIELD_GROUPS = {
+    "profile": ["longName", "shortName", "industry", "sector"],
+    "ratios": [
+        "currentPrice", "regularMarketPrice", "previousClose", "marketCap",
+        "trailingPE", "priceToBook", "trailingEps", "earningsQuarterlyGrowth",
+        "dividendYield", "fiftyTwoWeekHigh", "fiftyTwoWeekLow", "mostRecentQuarter",
+    ],
+}
+
+TTL = {
+    "profile": 21 * 24 * 3600,
+    "ratios": 24 * 3600,
+}
+
+# ==============================
+# 2. DATABASE
+# ==============================
+
+def _connect():
+    os.makedirs(os.path.dirname(DB_FILE) or ".", exist_ok=True)
+    conn = sqlite3.connect(DB_FILE, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS fundamentals (
+            ticker TEXT NOT NULL,
+            grp TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            quarter TEXT,
+            PRIMARY KEY (ticker, grp)
+        )
+    """)
+    return conn
+
+def _split_groups(info):
+    # Field kosong tidak disimpan supaya info.get(key, default) tetap jalan seperti .info asli
+    return {grp: {k: info[k] for k in fields if info.get(k) is not None} for grp, fields in FIELD_GROUPS.items()}
+
+def _project(info):
+    merged = {}
+    for payload in _split_groups(info).values(): merged.update(payload)
+    return merged
+
+def save_many(infos, now=None):
+    """Simpan {ticker: info} (dict hasil `.info`) ke semua kelompok field dalam satu transaksi."""
+    now = now or time.time()
+    rows = []
+    for ticker, info in infos.items():
+        if not info: continue
+        for grp, payload in _split_groups(info).items():
+            rows.append((ticker, grp, json.dumps(payload, default=str), now, None))
+    if not rows: return
+    conn = _connect()
+    try:
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO fundamentals VALUES (?, ?, ?, ?, ?)", rows)
+    finally:
+        conn.close()
+
+def load_many(tickers, groups=("profile", "ratios"), include_stale=False, now=None, ttl=None):
+    """
+    Baca info banyak ticker sekaligus (satu query).
+    Return {ticker: info} hanya untuk ticker yang semua kelompoknya ada
+    (dan masih segar, kecuali `include_stale=True`).
+    `ttl` : override TTL per kelompok (mis. pemanggil yang menghitung harga sendiri).
+    """
+    ttl = TTL if ttl is None else ttl
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers: return {}
+    now = now or time.time()
+    conn = _connect()
+    try:
+        # Tabel sementara supaya ribuan ticker tetap satu query (tanpa batas parameter SQLite)
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS wanted (ticker TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM wanted")
+        conn.executemany("INSERT OR IGNORE INTO wanted VALUES (?)", [(t,) for t in tickers])
+        placeholders = ",".join("?" for _ in groups)
+        rows = conn.execute(
+            f"SELECT f.ticker, f.grp, f.payload, f.fetched_at FROM fundamentals f "
+            f"JOIN wanted w ON w.ticker = f.ticker WHERE f.grp IN ({placeholders})",
+            list(groups)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    found = {}
+    for ticker, grp, payload, fetched_at in rows:
+        if not include_stale and now - fetched_at > ttl.get(grp, 0): continue
+        found.setdefault(ticker, {})[grp] = json.loads(payload)
+    result = {}
+    for ticker, parts in found.items():
+        if all(g in parts for g in groups):
+            info = {}
+            for g in groups: info.update(parts[g])
+            result[ticker] = info
+    return result
+
+# ==============================
+# 3. API INFO
+# ==============================
+
+def get_info_many(tickers, fetch=None, on_result=None):
+    """
+    Info untuk banyak ticker: yang masih segar dibaca dari SQLite, sisanya
+    diambil paralel lewat fundamentals_harvester lalu disimpan.
+    `on_result(ticker, info, error)` dipanggil untuk setiap ticker yang di-fetch.
+    """
+    infos = load_many(tickers)
+    missing = [t for t in tickers if t not in infos]
+    batch = {}
+    for ticker, info, error in fundamentals_harvester.harvest(missing, fetch=fetch):
+        if info: batch[ticker] = info
+        if on_result: on_result(ticker, info, error)
+        if len(batch) >= 50:
+            save_many(batch); batch = {}
+        if info: infos[ticker] = _project(info)
+    if batch: save_many(batch)
+    # Kalau fetch gagal, pakai data lama daripada kosong
+    still_missing = [t for t in tickers if t not in infos]
+    if still_missing: infos.update(load_many(still_missing, include_stale=True))
+    return infos
+
+def get_info(ticker, fetch=None):
+    return get_info_many([ticker], fetch=fetch).get(ticker)
+
+# ==============================
+# 4. LAPORAN KEUANGAN
+# ==============================
+
+def _quarter_key(info):
+    mrq = (info or {}).get("mostRecentQuarter")
+    return str(mrq) if mrq else None
+
+def _frame_to_json(df):
+    return df.to_json(orient="split", date_format="iso") if df is not None and not df.empty else None
+
+def _frame_from_json(text):
+    if not text: return pd.DataFrame()
+    df = pd.read_json(StringIO(text), orient="split")
+    df.index = pd.to_datetime(df.index)
+    return df
+
+def get_financials(ticker, fetch=None):
+    """
+    (quarterly, annual) laporan keuangan. Diambil ulang hanya kalau kuartal
+    terbaru (mostRecentQuarter) berbeda dari yang tersimpan.
+    """
+    quarter = _quarter_key(get_info(ticker))
+    conn = _connect()
+    try:
+        row = conn.execute(
+            "SELECT payload, quarter FROM fundamentals WHERE ticker = ? AND grp = 'financials'", (ticker,)
+        ).fetchone()
+    finally:
+        conn.close()
+    if row and (quarter is None or row[1] == quarter):
+        payload = json.loads(row[0])
+        return _frame_from_json(payload.get("quarterly")), _frame_from_json(payload.get("annual"))
+
+    fetch = fetch or data_provider.get_provider().financials
+    q_fin, a_fin = fetch(ticker)
+    payload = json.dumps({"quarterly": _frame_to_json(q_fin), "annual": _frame_to_json(a_fin)})
+    conn = _connect()
+    try:
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO fundamentals VALUES (?, 'financials', ?, ?, ?)",
+                (ticker, payload, time.time(), quarter)
+            )
+    finally:
+        conn.close()
+    return q_fin, a_fin
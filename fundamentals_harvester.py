@@ -0,0 +1,113 @@
+"""
+Pengambil data fundamental (`.info`) paralel untuk ratusan ticker sekaligus.
+
+- Thread pool dengan jumlah worker terbatas
+- Token bucket supaya jumlah request per detik tidak melewati batas Yahoo
+- Exponential backoff untuk error 429 / 5xx / timeout jaringan
+- Timeout per ticker
+- Hasil di-yield begitu selesai (tidak menunggu semua ticker)
+"""
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import data_provider
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# ==============================
+# 1. RATE LIMITER
+# ==============================
+
+class TokenBucket:
+    """Token bucket thread-safe: `rate` token per detik, maksimal `capacity` token tersimpan."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_time = (1 - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+# ==============================
+# 2. RETRY & BACKOFF
+# ==============================
+
+def _status_code(exc):
+    for obj in (exc, getattr(exc, "response", None)):
+        code = getattr(obj, "status_code", None) or getattr(obj, "status", None)
+        if isinstance(code, int): return code
+    return None
+
+def is_retryable(exc):
+    """True untuk error sementara: rate limit (429), server error (5xx), timeout, koneksi putus."""
+    if "RateLimit" in type(exc).__name__: return True
+    if isinstance(exc, (TimeoutError, ConnectionError)): return True
+    code = _status_code(exc)
+    if code in RETRYABLE_STATUS: return True
+    text = str(exc)
+    return "Too Many Requests" in text or "429" in text
+
+def fetch_with_retry(fetch, ticker, bucket, retries=4, base_delay=1.0, max_delay=30.0):
+    for attempt in range(retries + 1):
+        bucket.acquire()
+        try:
+            return fetch(ticker)
+        except Exception as e:
+            if attempt == retries or not is_retryable(e): raise
+            # Exponential backoff + jitter supaya worker tidak retry bersamaan
+            delay = min(max_delay, base_delay * (2 ** attempt))
+            time.sleep(delay * random.uniform(0.5, 1.0))
+
+# ==============================
+# 3. HARVESTER
+# ==============================
+
+def harvest(tickers, fetch=None, max_workers=16, rate=20, retries=4, timeout=20):
+    """
+    Ambil `fetch(ticker)` (default: provider.info) untuk semua ticker secara paralel.
+    Yield tuple (ticker, hasil, error) sesuai urutan selesai. Ticker yang melewati
+    `timeout` detik di-yield dengan TimeoutError dan hasilnya diabaikan.
+    """
+    fetch = fetch or data_provider.get_provider().info
+    bucket = TokenBucket(rate)
+    started = {}
+
+    def job(ticker):
+        started[ticker] = time.monotonic()
+        return fetch_with_retry(fetch, ticker, bucket, retries=retries)
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        pending = {pool.submit(job, t): t for t in tickers}
+        while pending:
+            done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+            for fut in done:
+                ticker = pending.pop(fut)
+                try:
+                    yield ticker, fut.result(), None
+                except Exception as e:
+                    yield ticker, None, e
+            # Timeout dihitung sejak worker mulai mengerjakan ticker (bukan sejak antre)
+            now = time.monotonic()
+            for fut in [f for f, t in pending.items() if t in started and not f.done()]:
+                ticker = pending[fut]
+                if now - started[ticker] > timeout:
+                    pending.pop(fut)
+                    fut.cancel()
+                    yield ticker, None, TimeoutError(f"{ticker}: lebih dari {timeout} detik")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,95 @@
+"""
+Mesin return multi-horizon untuk seluruh universe sekaligus.
+
+Harga Close dipivot menjadi matriks tanggal x ticker lalu di-forward-fill.
+Tanggal lookback tiap (horizon, ticker) dicari dengan SATU `searchsorted`
+terhadap index tanggal, jadi 950 ticker x N horizon tetap satu operasi array.
+
+Horizon bisa berupa:
+- int            : jumlah hari kalender ke belakang dari tanggal bar terakhir ticker
+- "ytd"          : penutupan terakhir tahun sebelumnya (31 Des)
+- tanggal/string : tanggal tetap (mis. "2024-01-01")
+"""
+import numpy as np
+import pandas as pd
+
+import weekly_recap
+
+HORIZONS = {
+    "1 Minggu": 7, "1 Bulan": 30, "6 Bulan": 180, "YTD": "ytd",
+    "1 Tahun": 365, "3 Tahun": 365 * 3,
+}
+
+def _target_dates(spec, curr_dates):
+    if isinstance(spec, (int, np.integer)):
+        return curr_dates - np.timedelta64(int(spec), "D")
+    if isinstance(spec, str) and spec.lower() == "ytd":
+        years = curr_dates.astype("datetime64[Y]").astype(int) + 1970
+        return (np.array([f"{y - 1}-12-31" for y in years], dtype="datetime64[ns]"))
+    return np.full(len(curr_dates), pd.Timestamp(spec).to_datetime64(), dtype="datetime64[ns]")
+
+def earliest_start(horizons, now=None):
+    """Tanggal mulai download yang cukup untuk semua horizon (dengan cadangan libur bursa)."""
+    now = pd.Timestamp(now or pd.Timestamp.now()).normalize()
+    starts = []
+    for spec in horizons.values():
+        if isinstance(spec, (int, np.integer)): starts.append(now - pd.Timedelta(days=int(spec)))
+        elif isinstance(spec, str) and spec.lower() == "ytd": starts.append(pd.Timestamp(now.year - 1, 12, 31))
+        else: starts.append(pd.Timestamp(spec))
+    return (min(starts) if starts else now) - pd.Timedelta(days=14)
+
+def compute(panel, tickers, horizons=None):
+    """
+    DataFrame: Ticker, Harga, 1 Hari, lalu satu kolom per horizon (% perubahan,
+    NaN kalau histori tidak cukup). Ticker dengan < 2 bar valid dilewati.
+    """
+    horizons = HORIZONS if horizons is None else horizons
+    tickers = list(tickers)
+    if panel is None or panel.empty or not tickers: return pd.DataFrame()
+    values = panel.to_numpy(dtype="float64")
+    close = weekly_recap.to_matrix(panel, tickers, "Close", values)
+    # Fallback ke Adj Close untuk ticker yang tidak punya kolom Close
+    adj = weekly_recap.to_matrix(panel, tickers, "Adj Close", values)
+    no_close = np.isnan(close).all(axis=0)
+    close[:, no_close] = adj[:, no_close]
+
+    dates = pd.DatetimeIndex(panel.index)
+    if dates.tz is not None: dates = dates.tz_localize(None)
+    order = np.argsort(dates.values, kind="stable")
+    dates, close = dates.values[order].astype("datetime64[ns]"), close[order]
+
+    valid = ~np.isnan(close)
+    n_valid = valid.sum(axis=0)
+    keep = n_valid >= 2
+    ffilled = pd.DataFrame(close).ffill().to_numpy()
+    cols = np.arange(len(tickers))
+
+    # Bar valid terakhir & sebelumnya per ticker
+    last = len(dates) - 1 - np.argmax(valid[::-1], axis=0)
+    curr = close[last, cols]
+    prev = np.where(last > 0, ffilled[np.maximum(last - 1, 0), cols], np.nan)
+
+    out = {"Ticker": tickers, "Harga": curr}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["1 Hari"] = (curr - prev) / prev * 100
+        curr_dates = dates[last]
+        for name, spec in horizons.items():
+            target = _target_dates(spec, curr_dates)
+            row = np.searchsorted(dates, target, side="right") - 1
+            past = np.where(row >= 0, ffilled[np.maximum(row, 0), cols], np.nan)
+            pct = np.where(past == 0, 0.0, (curr - past) / past * 100)
+            out[name] = np.where(np.isnan(past), np.nan, pct)
+    return pd.DataFrame(out)[keep].reset_index(drop=True)
+
+def parse_custom(text):
+    """'90, 730, 2024-01-01' -> {"90 Hari": 90, "730 Hari": 730, "Sejak 2024-01-01": "2024-01-01"}"""
+    custom = {}
+    for part in (text or "").replace(";", ",").split(","):
+        part = part.strip()
+        if not part: continue
+        if part.isdigit(): custom[f"{part} Hari"] = int(part)
+        elif part.lower() == "ytd": custom["YTD"] = "ytd"
+        else:
+            try: custom[f"Sejak {pd.Timestamp(part).date()}"] = str(pd.Timestamp(part).date())
+            except: continue
+    return custom
@@ -0,0 +1,209 @@
+"""
+Indikator streaming (MA / EMA) dengan state inkremental per (ticker, indikator, parameter).
+
+Alih-alih `rolling(n).mean()` atas seluruh histori di setiap render, tiap
+indikator menyimpan state berjalan:
+- SMA : jendela n close terakhir + jumlah berjalan
+- EMA : nilai EMA terakhir (semantik `ewm(span=n, adjust=False)`, NaN sebelum n bar)
+
+Bar baru memperbarui state O(1) per bar. Bar TERAKHIR dianggap sementara
+(candle yang masih berjalan bisa berubah), jadi nilainya dihitung dengan
+`peek()` tanpa mengubah state. State + seri nilai yang sudah final disimpan di
+samping store harga:
+    data/ohlcv/indicators/interval=1d/ticker=BBCA.JK.json     (state)
+    data/ohlcv/indicators/interval=1d/ticker=BBCA.JK.parquet  (seri)
+sehingga restart tidak memicu hitung ulang. Kalau close lama berubah (revisi
+data / penyesuaian dividen) atau histori yang diminta lebih panjang dari yang
+tersimpan, indikator itu dibangun ulang sekali.
+"""
+import os
+import json
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+import ohlcv_store
+
+# ==============================
+# 1. KONFIGURASI
+# ==============================
+
+INDICATOR_DIR = os.path.join(ohlcv_store.STORE_DIR, "indicators")
+DEFAULT_SPECS = (("sma", 20),)
+
+_lock = threading.RLock()
+_memo = {}
+
+def column(kind, n):
+    return f"MA{n}" if kind == "sma" else f"{kind.upper()}{n}"
+
+# ==============================
+# 2. STATE
+# ==============================
+
+class SMA:
+    def __init__(self, n, window=(), total=0.0):
+        self.n = n
+        self.window = deque(window, maxlen=n)
+        self.total = total
+
+    def push(self, x):
+        if len(self.window) == self.n: self.total -= self.window[0]
+        self.window.append(x)
+        self.total += x
+        return self.total / self.n if len(self.window) == self.n else np.nan
+
+    def peek(self, x):
+        k = len(self.window)
+        if k + 1 < self.n: return np.nan
+        drop = self.window[0] if k == self.n else 0.0
+        return (self.total - drop + x) / self.n
+
+    def to_dict(self):
+        return {"window": list(self.window), "total": self.total}
+
+class EMA:
+    def __init__(self, n, value=None, count=0):
+        self.n = n
+        self.alpha = 2.0 / (n + 1)
+        self.value = value
+        self.count = count
+
+    def push(self, x):
+        self.value = x if self.value is None else self.value + self.alpha * (x - self.value)
+        self.count += 1
+        return self.value if self.count >= self.n else np.nan
+
+    def peek(self, x):
+        if self.count + 1 < self.n: return np.nan
+        return x if self.value is None else self.value + self.alpha * (x - self.value)
+
+    def to_dict(self):
+        return {"value": self.value, "count": self.count}
+
+KINDS = {"sma": SMA, "ema": EMA}
+
+def _new(kind, n, saved=None):
+    saved = saved or {}
+    return KINDS[kind](n, **{k: v for k, v in saved.items() if k in ("window", "total", "value", "count")})
+
+# ==============================
+# 3. PENYIMPANAN
+# ==============================
+
+def _paths(ticker, interval):
+    base = os.path.join(INDICATOR_DIR, f"interval={interval}", f"ticker={ticker}")
+    return base + ".json", base + ".parquet"
+
+def _load(ticker, interval):
+    key = (interval, ticker)
+    if key in _memo: return _memo[key]
+    state_path, series_path = _paths(ticker, interval)
+    states, series = {}, pd.DataFrame(index=pd.Index([], dtype="int64", name="ts"))
+    try:
+        if os.path.exists(state_path):
+            with open(state_path, "r") as f: states = json.load(f)
+        if os.path.exists(series_path): series = pd.read_parquet(series_path)
+    except:
+        states, series = {}, pd.DataFrame(index=pd.Index([], dtype="int64", name="ts"))
+    _memo[key] = (states, series)
+    return _memo[key]
+
+def _save(ticker, interval, states, series):
+    _memo[(interval, ticker)] = (states, series)
+    state_path, series_path = _paths(ticker, interval)
+    os.makedirs(os.path.dirname(state_path), exist_ok=True)
+    tmp = f"{series_path}.{threading.get_ident()}.tmp"
+    series.to_parquet(tmp)
+    os.replace(tmp, series_path)
+    tmp = f"{state_path}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f: json.dump(states, f)
+    os.replace(tmp, state_path)
+
+# ==============================
+# 4. UPDATE
+# ==============================
+
+def _timestamps(index):
+    idx = pd.DatetimeIndex(index)
+    # Index naive dianggap UTC (sama seperti chart), supaya semua pemanggil berbagi state yang sama
+    if idx.tz is None: idx = idx.tz_localize("UTC")
+    return idx.as_unit("ns").asi8
+
+def _advance(kind, n, saved, ts, values):
+    """Commit semua bar kecuali yang terakhir; return (state_dict, ts_baru, nilai_baru, nilai_sementara)."""
+    fresh = saved is None
+    state = _new(kind, n, None if fresh else saved)
+    last_ts = None if fresh else saved["last_ts"]
+    start = 0 if fresh else np.searchsorted(ts, last_ts, side="right")
+    committed = [state.push(x) for x in values[start:-1]]
+    new_ts = ts[start:-1]
+    out = dict(state.to_dict(), kind=kind, n=n,
+               first_ts=int(ts[0]) if fresh else saved["first_ts"],
+               last_ts=int(new_ts[-1]) if len(new_ts) else last_ts,
+               last_close=float(values[start:-1][-1]) if len(new_ts) else (None if fresh else saved["last_close"]))
+    return out, new_ts, committed, state.peek(values[-1])
+
+def _valid(saved, ts, values):
+    if not saved or saved.get("last_ts") is None: return False
+    if ts[0] < saved["first_ts"]: return False
+    # Data yang diminta berakhir sebelum state: tidak bisa dicek, pakai seri tersimpan
+    if saved["last_ts"] > ts[-1]: return True
+    pos = np.searchsorted(ts, saved["last_ts"])
+    if ts[pos] != saved["last_ts"]: return False
+    return bool(np.isclose(values[pos], saved["last_close"], rtol=1e-9, atol=0.0))
+
+def _put(series, col, new_ts, values, replace):
+    old = series[col].dropna() if col in series.columns and not replace else pd.Series(dtype="float64")
+    merged = pd.concat([old, pd.Series(values, index=new_ts, dtype="float64")]).rename(col)
+    series = series.drop(columns=col, errors="ignore")
+    series = series.join(merged.to_frame(), how="outer") if len(series.columns) else merged.to_frame()
+    series.index = series.index.astype("int64").rename("ts")
+    return series
+
+def compute(ticker, close, specs=DEFAULT_SPECS, interval="1d"):
+    """
+    DataFrame indikator (kolom MA20 / EMA12 / ...) sejajar dengan index `close`.
+    Bar lama dibaca dari seri tersimpan; bar baru diproses O(1) per bar.
+    """
+    close = pd.Series(close).astype("float64")
+    valid_close = close.dropna()
+    if valid_close.empty:
+        return pd.DataFrame({column(kind, n): np.nan for kind, n in specs}, index=close.index)
+    ts, values = _timestamps(valid_close.index), valid_close.to_numpy()
+
+    with _lock:
+        states, series = _load(ticker, interval)
+        states, changed, cols = dict(states), False, {}
+        for kind, n in specs:
+            col = column(kind, n)
+            saved = states.get(col)
+            # Close lama berubah / histori diminta lebih panjang -> bangun ulang sekali
+            if not _valid(saved, ts, values): saved = None
+            if saved is not None and saved["last_ts"] >= ts[-1]:
+                cols[col] = None
+                continue
+            state, new_ts, committed, provisional = _advance(kind, n, saved, ts, values)
+            if saved is None or len(new_ts):
+                states[col] = state
+                series = _put(series, col, new_ts, committed, replace=saved is None)
+                changed = True
+            cols[col] = provisional
+        if changed: _save(ticker, interval, states, series)
+
+    # Susun keluaran dengan searchsorted (seri tersimpan terurut), satu DataFrame sekaligus
+    mask = close.notna().to_numpy()
+    stored_ts = series.index.to_numpy()
+    pos = np.minimum(np.searchsorted(stored_ts, ts), max(len(stored_ts) - 1, 0))
+    hit = (stored_ts[pos] == ts) if len(stored_ts) else np.zeros(len(ts), dtype=bool)
+    data = {}
+    for col, provisional in cols.items():
+        vals = np.full(len(ts), np.nan)
+        if col in series.columns: vals[hit] = series[col].to_numpy()[pos[hit]]
+        if provisional is not None: vals[-1] = provisional
+        full = np.full(len(close), np.nan)
+        full[mask] = vals
+        data[col] = full
+    return pd.DataFrame(data, index=close.index)
@@ -0,0 +1,172 @@
+"""
+Ring buffer bar 5 menit di memori untuk tampilan intraday (Detail 1D/5D dan Grid 5m).
+
+Setiap ticker punya satu buffer NumPy berukuran tetap (±8 sesi). Pengisian awal
+dibaca dari ohlcv_store (disk), setelah itu hanya candle baru yang diambil
+(delta sejak bar terakhir, lewat fetch_coordinator) lalu di-append ke buffer.
+Selama buffer masih segar — atau pasar sudah tutup dan bar sudah final — tidak
+ada panggilan network sama sekali.
+"""
+import time
+import threading
+
+import numpy as np
+import pandas as pd
+
+import ohlcv_store
+import fetch_coordinator
+import market_clock
+
+INTERVAL = "5m"
+FIELDS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+JKT_TZ = "Asia/Jakarta"
+
+# ±82 bar per sesi IDX; 8 sesi cukup untuk periode "5d" plus libur panjang
+CAPACITY = 8 * 84
+MAX_AGE = ohlcv_store.MAX_AGE.get(INTERVAL, 120)
+JKT_OFFSET_NS = 7 * 3600 * 10**9
+
+# ==============================
+# 1. RING BUFFER
+# ==============================
+
+class RingBuffer:
+    """Bar OHLCV dalam array melingkar: timestamp UTC (int64 ns) + matriks float64."""
+
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.ts = np.zeros(capacity, dtype="int64")
+        self.bars = np.zeros((capacity, len(FIELDS)), dtype="float64")
+        self.start = 0
+        self.size = 0
+        self.synced_at = 0.0
+        self.lock = threading.RLock()
+
+    def _positions(self):
+        return (self.start + np.arange(self.size)) % self.capacity
+
+    def last_ts(self):
+        if not self.size: return None
+        return int(self.ts[(self.start + self.size - 1) % self.capacity])
+
+    def view(self):
+        with self.lock:
+            pos = self._positions()
+            return self.ts[pos], self.bars[pos]
+
+    def append(self, ts, bars):
+        """Tambah bar terurut. Bar yang timestamp-nya sudah ada ditimpa (candle berjalan)."""
+        with self.lock:
+            return self._append(ts, bars)
+
+    def _append(self, ts, bars):
+        if len(ts) == 0: return 0
+        if self.size:
+            cur_ts, _ = self.view()
+            pos = self._positions()
+            loc = np.searchsorted(cur_ts, ts)
+            hit = (loc < self.size) & (cur_ts[np.minimum(loc, self.size - 1)] == ts)
+            self.bars[pos[loc[hit]]] = bars[hit]
+            newer = ~hit & (ts > cur_ts[-1])
+            ts, bars = ts[newer], bars[newer]
+        k = len(ts)
+        if k == 0: return 0
+        if k > self.capacity:
+            ts, bars = ts[-self.capacity:], bars[-self.capacity:]
+            k = self.capacity
+        write = (self.start + self.size + np.arange(k)) % self.capacity
+        self.ts[write] = ts
+        self.bars[write] = bars
+        overflow = max(0, self.size + k - self.capacity)
+        self.start = (self.start + overflow) % self.capacity
+        self.size = min(self.capacity, self.size + k)
+        return k
+
+    def sessions(self, n):
+        """Bar dari n sesi (tanggal WIB) terakhir."""
+        ts, bars = self.view()
+        if not len(ts): return ts, bars
+        days = (ts + JKT_OFFSET_NS) // (24 * 3600 * 10**9)
+        keep = np.unique(days)[-n:]
+        mask = days >= keep[0]
+        return ts[mask], bars[mask]
+
+def _to_arrays(df):
+    idx = pd.DatetimeIndex(df.index)
+    if idx.tz is None: idx = idx.tz_localize(JKT_TZ)
+    ts = idx.tz_convert("UTC").as_unit("ns").asi8
+    bars = df.reindex(columns=FIELDS).to_numpy(dtype="float64")
+    order = np.argsort(ts, kind="stable")
+    return ts[order], bars[order]
+
+def _to_frame(ts, bars):
+    idx = pd.DatetimeIndex(pd.to_datetime(ts, unit="ns", utc=True)).tz_convert(JKT_TZ)
+    idx.name = "Datetime"
+    return pd.DataFrame(bars, index=idx, columns=FIELDS)
+
+# ==============================
+# 2. REGISTRY & REFRESH
+# ==============================
+
+_buffers = {}
+_lock = threading.Lock()
+
+def _is_current(buf, now):
+    if not buf.size: return False
+    return now - buf.synced_at <= MAX_AGE or market_clock.is_settled(buf.synced_at)
+
+def refresh(tickers):
+    """Pastikan buffer semua ticker segar. Return jumlah bar baru per ticker."""
+    now = time.time()
+    with _lock:
+        bufs = {t: _buffers.setdefault(t, RingBuffer()) for t in tickers}
+    cold = [t for t, b in bufs.items() if not b.size]
+    stale = [t for t, b in bufs.items() if b.size and not _is_current(b, now)]
+    added = {}
+
+    if cold:
+        # Isi awal dari store (disk + delta sync) — tetap satu request batch untuk semua ticker
+        ohlcv_store.sync(cold, ohlcv_store.period_to_start("5d"), INTERVAL)
+        start = ohlcv_store.period_to_start("5d")
+        for t, df in ohlcv_store.read(cold, start, None, INTERVAL).items():
+            added[t] = bufs[t].append(*_to_arrays(df))
+        for t in cold: bufs[t].synced_at = now
+
+    if stale:
+        # Delta: mulai dari bar terakhir supaya candle yang masih berjalan ikut diperbarui
+        groups = {}
+        for t in stale: groups.setdefault(bufs[t].last_ts(), []).append(t)
+        for last, group in groups.items():
+            start = pd.Timestamp(last, tz="UTC").tz_convert(JKT_TZ).to_pydatetime()
+            try:
+                frames, _ = fetch_coordinator.fetch(group, start=start, end=None, interval=INTERVAL, retries=0)
+            except:
+                continue
+            for t in group:
+                if t in frames: added[t] = bufs[t].append(*_to_arrays(frames[t]))
+                bufs[t].synced_at = now
+    return added
+
+# ==============================
+# 3. API
+# ==============================
+
+def get(ticker, period="1d"):
+    """DataFrame bar 5 menit (index WIB) untuk periode "1d" / "5d"."""
+    refresh([ticker])
+    n = ohlcv_store.SESSION_PERIODS.get(period, 5)
+    ts, bars = _buffers[ticker].sessions(n)
+    return _to_frame(ts, bars)
+
+def download(tickers, period="1d"):
+    """Bentuk keluaran sama dengan ohlcv_store.download(..., interval="5m")."""
+    if isinstance(tickers, str): tickers = [tickers]
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers: return pd.DataFrame()
+    refresh(tickers)
+    n = ohlcv_store.SESSION_PERIODS.get(period, 5)
+    frames = {}
+    for t in tickers:
+        ts, bars = _buffers[t].sessions(n)
+        if len(ts): frames[t] = _to_frame(ts, bars)
+    return ohlcv_store.to_panel(frames, tickers)
@@ -1,13 +1,34 @@
 import streamlit as st
-import yfinance as yf
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
 import math
 import json
 import os
 import pytz 
+import ohlcv_store
+import intraday_buffer
+import fetch_coordinator
+import market_clock
+import cache_warmer
+import fundamentals_cache
+import horizon_returns
+import seasonality
+import winloss_stats
+import backtest
+import param_sweep
+import indicator_state
+import technicals
+import screener
+import universe
+import correlation
+import ranking
+import sectors
+import portfolio
+import alerts
+import extremes
 
 # --- 1. KONFIGURASI HALAMAN ---
 st.set_page_config(layout="wide", page_title="Super Stock Dashboard")
@@ -28,7 +49,9 @@ def save_data():
     data = {
         "watchlist": st.session_state.get("watchlist", []),
         "vol_watchlist": st.session_state.get("vol_watchlist", []),
-        "vol_saved_tickers": st.session_state.get("vol_saved_tickers", [])
+        "vol_saved_tickers": st.session_state.get("vol_saved_tickers", []),
+        "portfolio": st.session_state.get("portfolio", {"transactions": [], "curve": None}),
+        "alert_rules": st.session_state.get("alert_rules", [])
     }
     with open(DB_FILE, "w") as f:
         json.dump(data, f)
@@ -41,6 +64,10 @@ if 'vol_watchlist' not in st.session_state:
     st.session_state.vol_watchlist = saved_data["vol_watchlist"] if (saved_data and "vol_watchlist" in saved_data) else ["GOTO.JK", "BBRI.JK", "BUMI.JK"]
 if 'vol_saved_tickers' not in st.session_state:
     st.session_state.vol_saved_tickers = saved_data["vol_saved_tickers"] if (saved_data and "vol_saved_tickers" in saved_data) else []
+if 'portfolio' not in st.session_state:
+    st.session_state.portfolio = saved_data["portfolio"] if (saved_data and "portfolio" in saved_data) else {"transactions": [], "curve": None}
+if 'alert_rules' not in st.session_state:
+    st.session_state.alert_rules = saved_data["alert_rules"] if (saved_data and "alert_rules" in saved_data) else []
 if 'picked_stocks' not in st.session_state:
     st.session_state.picked_stocks = []
 if 'grid_page' not in st.session_state:
@@ -60,11 +87,15 @@ DEFAULT_INPUT_TXT = "BBCA.JK, BBRI.JK, GOTO.JK, ADRO.JK"
 
 # --- 5. FUNGSI LOGIKA (BACKEND) ---
 
-@st.cache_data(ttl=600)
-def get_stock_history_bulk(tickers, period="3mo", interval="1d"):
+# Fungsi dengan argumen `version` diputar oleh token jam bursa (market_clock.cache_version),
+# bukan TTL tetap, dan dipanaskan di latar belakang oleh cache_warmer
+@st.cache_data(ttl=cache_warmer.CACHE_TTL, max_entries=256)
+def get_stock_history_bulk(tickers, period="3mo", interval="1d", version=None):
     if not tickers: return pd.DataFrame()
     try:
-        data = yf.download(tickers, period=period, interval=interval, group_by='ticker', progress=False, auto_adjust=False)
+        # Bar 5 menit dilayani ring buffer di memori (hanya candle baru yang diambil)
+        if interval == "5m": return intraday_buffer.download(tickers, period=period)
+        data = ohlcv_store.download(tickers, period=period, interval=interval)
         return data
     except: return pd.DataFrame()
 
@@ -73,7 +104,8 @@ def get_single_stock_detail(ticker, period):
     if not ticker: return None
     interv = "5m" if period in ["1d", "5d"] else "1d"
     try:
-        df = yf.download(ticker, period=period, interval=interv, progress=False, auto_adjust=False)
+        if interv == "5m": df = intraday_buffer.get(ticker, period)
+        else: df = ohlcv_store.download(ticker, period=period, interval=interv)
         if df.empty: return None
         if isinstance(df.columns, pd.MultiIndex): df.columns = df.columns.get_level_values(0)
         df = df.loc[:, ~df.columns.duplicated()] 
@@ -93,7 +125,7 @@ def get_single_stock_detail(ticker, period):
 @st.cache_data(ttl=3600)
 def get_fundamental_info(ticker):
     try:
-        info = yf.Ticker(ticker).info
+        info = fundamentals_cache.get_info(ticker)
         return {
             "pbv": info.get('priceToBook'),
             "per": info.get('trailingPE'),
@@ -106,69 +138,39 @@ def get_fundamental_info(ticker):
 @st.cache_data(ttl=3600)
 def get_financials_history(ticker):
     try:
-        stock = yf.Ticker(ticker)
-        q_fin = stock.quarterly_financials.T
+        q_fin, a_fin = fundamentals_cache.get_financials(ticker)
         if not q_fin.empty:
             q_fin.index = pd.to_datetime(q_fin.index).tz_localize(None)
             q_fin = q_fin.sort_index()
-        a_fin = stock.financials.T
         if not a_fin.empty:
             a_fin.index = pd.to_datetime(a_fin.index).tz_localize(None)
             a_fin = a_fin.sort_index()
         return q_fin, a_fin
     except: return pd.DataFrame(), pd.DataFrame()
 
-@st.cache_data(ttl=600)
-def get_seasonal_details(tickers_str, start_month, end_month, lookback_years=5):
+# Panel harian per universe di-cache terpisah dari jendela bulan,
+# jadi ganti bulan di UI hanya menghitung ulang array musiman (seasonality.py)
+@st.cache_data(ttl=cache_warmer.CACHE_TTL, max_entries=16)
+def get_seasonal_panel(tickers, lookback_years=5, version=None):
+    start_date = datetime.now() - timedelta(days=(lookback_years + 2) * 365)
+    return ohlcv_store.download(list(tickers), start=start_date, adjusted=True)
+
+@st.cache_data(ttl=cache_warmer.CACHE_TTL, max_entries=64)
+def get_seasonal_details(tickers_str, start_month, end_month, lookback_years=5, version=None):
     if not tickers_str: return None
     ticker_list = [t.strip().upper() for t in tickers_str.split(',') if t.strip()]
-    start_date = datetime.now() - timedelta(days=(lookback_years + 2) * 365)
-    data = yf.download(ticker_list, start=start_date, group_by='ticker', progress=False)
-    results = {} 
-    for ticker in ticker_list:
-        try:
-            if len(ticker_list) == 1: df = data; symbol = ticker_list[0]
-            else: 
-                if ticker not in data.columns.levels[0]: continue
-                df = data[ticker]; symbol = ticker
-            
-            if df.empty: continue
-            if isinstance(df.columns, pd.MultiIndex): df.columns = df.columns.get_level_values(0)
-            df = df.reset_index()
-            if 'Date' not in df.columns and 'Datetime' in df.columns: df = df.rename(columns={'Datetime': 'Date'})
-            df['Date'] = pd.to_datetime(df['Date']).dt.tz_localize(None)
-            
-            stock_years_data = {}
-            current_year = datetime.now().year
-            for i in range(0, lookback_years + 1):
-                y_end = current_year - i
-                if int(start_month) > int(end_month): y_start = y_end - 1 
-                else: y_start = y_end
-                try:
-                    d_start = datetime(y_start, int(start_month), 1)
-                    if d_start > datetime.now(): continue
-                    d_end = datetime(y_end, int(end_month), 28) 
-                    label = f"{y_start}/{y_end}" if int(start_month) > int(end_month) else f"{y_end}"
-                except: continue
-                mask = (df['Date'] >= d_start) & (df['Date'] <= d_end)
-                df_period = df.loc[mask].copy()
-                if df_period.empty: continue
-                first_price = df_period['Close'].iloc[0]
-                df_period['Rel_Change'] = ((df_period['Close'] - first_price) / first_price) * 100
-                stock_years_data[label] = df_period['Rel_Change'].reset_index(drop=True)
-            if stock_years_data: results[symbol] = stock_years_data
-        except: continue
-    return results
+    data = get_seasonal_panel(tuple(ticker_list), lookback_years, version)
+    return seasonality.build(data, ticker_list, start_month, end_month, lookback_years)
 
-@st.cache_data(ttl=300)
-def get_stock_volume_stats(tickers_list, period_code="1mo"):
+@st.cache_data(ttl=cache_warmer.CACHE_TTL, max_entries=64)
+def get_stock_volume_stats(tickers_list, period_code="1mo", version=None):
     if not tickers_list: return None
     download_period = "5d" if period_code == "1d" else "1mo"
     if period_code == "ytd": download_period = "ytd"
     elif period_code == "1y": download_period = "1y"
     
     try:
-        data = yf.download(tickers_list, period=download_period, group_by='ticker', progress=False, auto_adjust=False)
+        data = ohlcv_store.download(tickers_list, period=download_period)
     except: return None
 
     stats = []
@@ -203,34 +205,41 @@ def get_stock_volume_stats(tickers_list, period_code="1mo"):
         except: continue
     return pd.DataFrame(stats)
 
-@st.cache_data(ttl=300)
-def get_latest_snapshot(tickers):
-    if not tickers: return {}
+# Tabel fitur seluruh IHSG + indeks kolom terurut (screener.py); query filter < 1 ms
+@st.cache_data(ttl=cache_warmer.CACHE_TTL, max_entries=4)
+def get_screener(version=None):
+    tickers = universe.IHSG_TICKERS
     try:
-        data = yf.download(tickers, period="1d", group_by='ticker', progress=False, auto_adjust=False)
-        snapshot = {}
-        for t in tickers:
+        raw = ohlcv_store.download(tickers, period="5d")
+        adj = ohlcv_store.download(tickers, period="1y", adjusted=True)
+    except: raw, adj = pd.DataFrame(), pd.DataFrame()
+    try: fund = fundamentals_cache.load_many(tickers, include_stale=True)
+    except: fund = {}
+    return screener.Screener(screener.build_table(raw, adj, tickers, fund, labels=sectors.mapping(tickers)))
+
+# Harga terakhir untuk mark-to-market portofolio: snapshot screener yang sudah di-cache,
+# ticker di luar universe dibaca dari store lokal
+@st.cache_data(ttl=cache_warmer.CACHE_TTL, max_entries=32)
+def get_latest_prices(tickers, version=None):
+    prices = get_screener(version=version).table["Harga"].reindex(list(tickers)).dropna().to_dict()
+    missing = [t for t in tickers if t not in prices]
+    if missing:
+        try: data = ohlcv_store.download(missing, period="5d")
+        except: data = pd.DataFrame()
+        for t in missing:
             try:
-                if len(tickers) == 1: df = data
-                else: 
-                    if t in data.columns.levels[0]: df = data[t]
-                    else: continue
-                if not df.empty:
-                    col_close = 'Close' if 'Close' in df.columns else 'Adj Close'
-                    last_price = float(df[col_close].iloc[-1])
-                    last_vol = float(df['Volume'].iloc[-1])
-                    snapshot[t] = {
-                        'price': last_price,
-                        'volume_share': last_vol,
-                        'volume_lot': last_vol / 100,
-                        'value': last_price * last_vol
-                    }
-            except: continue
-        return snapshot
-    except: return {}
+                df = data[t] if isinstance(data.columns, pd.MultiIndex) else data
+                prices[t] = float(df["Close"].dropna().iloc[-1])
+            except: pass
+    return prices
+
+# Agregat per sektor/industri dari tabel screener (sectors.py), reduksi grup dalam milidetik
+@st.cache_data(ttl=cache_warmer.CACHE_TTL, max_entries=8)
+def get_sector_rollup(by="Sektor", version=None):
+    return sectors.rollup(get_screener(version=version).table, by)
 
 @st.cache_data(ttl=600) 
-def get_performance_matrix(raw_input):
+def get_performance_matrix(raw_input, custom_horizons=""):
     if not raw_input: return pd.DataFrame()
     clean_input = raw_input.replace('\n', ',').replace(' ', ',')
     tickers = [t.strip().upper() for t in clean_input.split(',') if t.strip()]
@@ -238,129 +247,100 @@ def get_performance_matrix(raw_input):
     tickers = [t + ".JK" if not t.endswith(".JK") else t for t in tickers]
     tickers = list(set(tickers))
     
+    horizons = dict(horizon_returns.HORIZONS, **horizon_returns.parse_custom(custom_horizons))
     try:
-        data = yf.download(tickers, period="5y", group_by='ticker', progress=False, auto_adjust=False)
+        start = min(ohlcv_store.period_to_start("5y"), horizon_returns.earliest_start(horizons).to_pydatetime())
+        data = ohlcv_store.download(tickers, start=start, adjusted=True)
     except: return pd.DataFrame()
     
-    results = []
-    for t in tickers:
-        try:
-            try: industry = yf.Ticker(t).info.get('industry', '-')
-            except: industry = '-'
+    # Industri dari peta sektor (sectors.py): cache SQLite + memori, tanpa .info per ticker
+    meta = sectors.mapping(tickers)
 
-            if len(tickers) == 1: df = data; symbol = tickers[0]
-            else:
-                if t not in data.columns.levels[0]: continue
-                df = data[t]; symbol = t
-            if df.empty: continue
-            if isinstance(df.columns, pd.MultiIndex): df.columns = df.columns.get_level_values(0)
-            
-            if 'Close' in df.columns: price_col = 'Close'
-            elif 'Adj Close' in df.columns: price_col = 'Adj Close'
-            else: continue
-            
-            df = df[[price_col]].rename(columns={price_col: 'Close'}).dropna().sort_index()
-            if len(df) < 2: continue
-            
-            curr_price = float(df['Close'].iloc[-1])
-            curr_date = df.index[-1]
-
-            def get_pct_change(days_ago):
-                target_date = curr_date - timedelta(days=days_ago)
-                past_data = df.loc[df.index <= target_date]
-                if past_data.empty: return None
-                past_price = float(past_data['Close'].iloc[-1])
-                return 0.0 if past_price == 0 else ((curr_price - past_price) / past_price) * 100
-
-            last_year = curr_date.year - 1
-            last_year_end = datetime(last_year, 12, 31)
-            ytd_data = df.loc[df.index <= last_year_end]
-            ytd_change = None
-            if not ytd_data.empty:
-                last_year_close = float(ytd_data['Close'].iloc[-1])
-                ytd_change = ((curr_price - last_year_close) / last_year_close) * 100
-
-            results.append({
-                "Ticker": symbol, "Industri": industry, "Harga": curr_price,
-                "1 Hari": ((curr_price - df['Close'].iloc[-2])/df['Close'].iloc[-2]) * 100,
-                "1 Minggu": get_pct_change(7), "1 Bulan": get_pct_change(30),
-                "6 Bulan": get_pct_change(180), "YTD": ytd_change,
-                "1 Tahun": get_pct_change(365), "3 Tahun": get_pct_change(365 * 3)
-            })
-        except: continue
-    return pd.DataFrame(results)
+    # Semua horizon untuk semua ticker dihitung sekaligus (searchsorted di horizon_returns.py)
+    df = horizon_returns.compute(data, tickers, horizons)
+    if df.empty: return df
+    df.insert(1, "Industri", meta["Industri"].reindex(df["Ticker"]).fillna("-").to_numpy())
+    return df
 
-@st.cache_data(ttl=600)
-def get_win_loss_details(raw_input):
+def parse_tickers(raw_input):
     clean_input = raw_input.replace('\n', ',').replace(' ', ',')
     tickers = [t.strip().upper() for t in clean_input.split(',') if t.strip()]
     tickers = [t + ".JK" if not t.endswith(".JK") else t for t in tickers]
-    tickers = list(set(tickers))
-    
-    try:
-        data = yf.download(tickers, period="3mo", group_by='ticker', progress=False, auto_adjust=False)
-    except: return pd.DataFrame(), {}
-
-    summary_results = []
-    detail_data = {} 
+    return list(dict.fromkeys(tickers))
 
-    for t in tickers:
-        try:
-            if len(tickers) == 1: df = data; symbol = tickers[0]
-            else:
-                if t not in data.columns.levels[0]: continue
-                df = data[t]; symbol = t
-            
-            if df.empty: continue
-            if isinstance(df.columns, pd.MultiIndex): df.columns = df.columns.get_level_values(0)
-            
-            col = 'Close' if 'Close' in df.columns else 'Adj Close'
-            df['Change'] = df[col].pct_change() * 100
-            df = df.dropna()
-
-            df_30 = df.tail(30)
-            if len(df_30) < 5: continue 
-
-            detail_data[symbol] = df_30
-            green_days = df_30[df_30['Change'] > 0]
-            red_days = df_30[df_30['Change'] < 0]
-
-            win_rate = (len(green_days) / len(df_30)) * 100
-            avg_gain = green_days['Change'].mean() if not green_days.empty else 0
-            avg_loss = red_days['Change'].mean() if not red_days.empty else 0
-            total_return = ((df_30[col].iloc[-1] - df_30[col].iloc[0]) / df_30[col].iloc[0]) * 100
+@st.cache_data(ttl=cache_warmer.CACHE_TTL, max_entries=16)
+def get_win_loss_panel(tickers, version=None):
+    try: return ohlcv_store.download(list(tickers), period="6mo", adjusted=True)
+    except: return pd.DataFrame()
 
-            summary_results.append({
-                "Ticker": symbol, "Total Candle": len(df_30), "Hari Hijau": len(green_days), "Hari Merah": len(red_days),
-                "Win Rate": win_rate, "Rata2 Naik": avg_gain, "Rata2 Turun": avg_loss, "Total Return (30 Candle)": total_return
-            })
-        except: continue
-    return pd.DataFrame(summary_results), detail_data
+@st.cache_data(ttl=cache_warmer.CACHE_TTL, max_entries=64)
+def get_win_loss_details(raw_input, window=30, version=None):
+    # Semua ticker sekaligus di matriks return (winloss_stats.py); detail dibuat saat dibuka saja
+    tickers = parse_tickers(raw_input)
+    if not tickers: return pd.DataFrame()
+    return winloss_stats.compute(get_win_loss_panel(tuple(tickers), version), tickers, window)
 
 @st.cache_data(ttl=3600)
 def get_fundamental_screener(tickers):
     # Dummy implementation for fundamental screener to prevent error
     data = []
+    infos = fundamentals_cache.get_info_many(tickers)
     for t in tickers:
-        info = get_fundamental_info(t)
+        info = infos.get(t)
         if info:
             data.append({
                 "Ticker": t,
-                "Industry": info['sector'],
+                "Industry": info.get('industry', '-'),
                 "Price": 0, "52W High": 0, "52W Low": 0, # Placeholder
-                "PBV": info['pbv'], "PER": info['per'], "EPS": info['eps']
+                "PBV": info.get('priceToBook'), "PER": info.get('trailingPE'), "EPS": info.get('trailingEps')
             })
     return pd.DataFrame(data)
 
+@st.cache_data(ttl=cache_warmer.CACHE_TTL, max_entries=16)
+def get_backtest_panel(tickers, period="1y", version=None):
+    try: return ohlcv_store.download(list(tickers), period=period, adjusted=True)
+    except: return pd.DataFrame()
+
+@st.cache_data(ttl=cache_warmer.CACHE_TTL, max_entries=32)
+def run_backtest(raw_input, period, strategy, lots, fee_buy, fee_sell, stop_loss=None, max_hold=None, params=(), version=None):
+    # Semua ticker disimulasikan bersamaan di backtest.py (loop per hari, bukan per ticker)
+    tickers = parse_tickers(raw_input)
+    panel = get_backtest_panel(tuple(tickers), period, version)
+    if panel.empty: return None
+    return backtest.backtest(panel, tickers, strategy, lots=lots, fee_buy=fee_buy, fee_sell=fee_sell,
+                             stop_loss=stop_loss, max_hold=max_hold, **dict(params))
+
+# Indikator seluruh universe dihitung sekali per panel (technicals.py), chart & filter tinggal baca kolom
+@st.cache_data(ttl=cache_warmer.CACHE_TTL, max_entries=8)
+def get_feature_panel(tickers, period="1y", version=None):
+    try: return technicals.build(ohlcv_store.download(list(tickers), period=period, adjusted=True), list(tickers))
+    except: return pd.DataFrame()
+
+# Korelasi N x N (correlation.py) per daftar & window, sudah diurutkan per cluster
+@st.cache_data(ttl=cache_warmer.CACHE_TTL, max_entries=8)
+def get_correlation(tickers, window=60, version=None):
+    try: panel = ohlcv_store.download(list(tickers), period="1y" if window < 240 else "2y", adjusted=True)
+    except: return pd.DataFrame()
+    corr = correlation.matrix(panel, list(tickers), window)
+    order = correlation.cluster_order(corr)
+    return corr.loc[order, order]
+
+# 52W High/Low dari bar lokal dengan state deque harian (extremes.py), tanpa .info per ticker
+@st.cache_data(ttl=cache_warmer.CACHE_TTL, max_entries=16)
+def get_extremes(tickers, window=extremes.WINDOW, version=None):
+    try: return extremes.update(ohlcv_store.download(list(tickers), period=extremes.PERIOD), list(tickers), window)
+    except: return pd.DataFrame()
+
 # --- 6. VISUALISASI CHART ---
-def create_mini_chart_complex(df, ticker, period_code):
+def create_mini_chart_complex(df, ticker, period_code, interval="1d"):
     jkt_tz = pytz.timezone('Asia/Jakarta')
     if df.index.tz is None:
         df.index = df.index.tz_localize('UTC').tz_convert(jkt_tz)
     else:
         df.index = df.index.tz_convert(jkt_tz)
 
-    df['MA20'] = df['Close'].rolling(window=20).mean()
+    # MA dari state inkremental (indicator_state.py), bukan rolling ulang tiap render
+    df['MA20'] = indicator_state.compute(ticker, df['Close'], interval=interval)['MA20']
     first_price = df['Close'].iloc[0]
     df['Pct'] = ((df['Close'] - first_price) / first_price) * 100
     
@@ -395,13 +375,19 @@ def create_mini_chart_complex(df, ticker, period_code):
     fig.update_xaxes(showticklabels=False)
     return fig
 
-def create_detail_chart(df, ticker, df_fin_filtered):
+def create_detail_chart(df, ticker, df_fin_filtered, interval="1d", features=None):
     fig = make_subplots(
         rows=3, cols=1, shared_xaxes=True, vertical_spacing=0.05, row_heights=[0.5, 0.2, 0.3],
         subplot_titles=(f"Price Action: {ticker}", "Volume", "Revenue & Net Income")
     )
     fig.add_trace(go.Candlestick(x=df['Date'], open=df['Open'], high=df['High'], low=df['Low'], close=df['Close'], name="Price", showlegend=False), row=1, col=1)
-    if len(df) > 20: fig.add_trace(go.Scatter(x=df['Date'], y=df['Close'].rolling(20).mean(), line=dict(color='orange', width=1), name="MA 20"), row=1, col=1)
+    if len(df) > 20: fig.add_trace(go.Scatter(x=df['Date'], y=indicator_state.compute(ticker, df.set_index('Date')['Close'], interval=interval)['MA20'].to_numpy(), line=dict(color='orange', width=1), name="MA 20"), row=1, col=1)
+    if features is not None and not features.empty:
+        # Bollinger dari feature panel; tanggal disejajarkan ke index harian store (naive)
+        dates = df['Date'].dt.tz_convert('UTC').dt.tz_localize(None) if df['Date'].dt.tz is not None else df['Date']
+        feat = features.reindex(pd.DatetimeIndex(dates))
+        fig.add_trace(go.Scatter(x=df['Date'], y=feat['BB_UPPER'].to_numpy(), line=dict(color='gray', width=1, dash='dot'), name="BB Upper"), row=1, col=1)
+        fig.add_trace(go.Scatter(x=df['Date'], y=feat['BB_LOWER'].to_numpy(), line=dict(color='gray', width=1, dash='dot'), name="BB Lower"), row=1, col=1)
     colors = ['#00C805' if c >= o else '#FF333A' for c, o in zip(df['Close'], df['Open'])]
     fig.add_trace(go.Bar(x=df['Date'], y=df['Volume'], marker_color=colors, name="Volume", showlegend=False), row=2, col=1)
     if not df_fin_filtered.empty:
@@ -413,8 +399,34 @@ def create_detail_chart(df, ticker, df_fin_filtered):
     return fig
 
 # --- 7. MAIN UI ---
+# Token cache: berganti tiap WARM_CADENCE detik saat sesi IDX, beku setelah penutupan
+CACHE_VERSION = market_clock.cache_version(cache_warmer.WARM_CADENCE)
+
+def warm_grid(version):
+    for i in range(0, len(GRID_TICKERS), 12):
+        get_stock_history_bulk(GRID_TICKERS[i:i + 12], period="3mo", interval="1d", version=version)
+
+def warm_volume(version):
+    tickers = [t.strip().upper() for t in "BBCA.JK, GOTO.JK".split(',')]
+    get_stock_volume_stats(tickers, version=version)
+    saved = (load_data() or {}).get("vol_saved_tickers", [])
+    if saved: get_stock_volume_stats(saved, version=version)
+
+cache_warmer.register("grid", warm_grid)
+cache_warmer.register("screener", lambda v: get_screener(version=v))
+cache_warmer.register("volume", warm_volume)
+cache_warmer.start()
+
 st.title("📈 Super Stock Dashboard")
 
+# Statistik koordinator fetch (dipakai bersama semua sesi di proses ini)
+with st.sidebar.expander("🛰️ Statistik Fetch"):
+    fs = fetch_coordinator.stats()
+    st.caption(f"Request: {fs['requests']} | Panggilan ke Yahoo: {fs['upstream_calls']}")
+    st.caption(f"Dihemat: {fs['deduplicated']} identik, {fs['merged']} digabung ({fs['tickers_saved']} ticker)")
+    ws = cache_warmer.status()
+    st.caption(f"Bursa {'buka' if market_clock.is_market_open() else 'tutup'} | Cache: {CACHE_VERSION} | Warm terakhir: {ws['seconds']} detik")
+
 # DEFINISI TAB LENGKAP (11 TAB)
 tab_grid, tab_compare, tab_vol, tab_watch, tab_detail, tab_cycle, tab_fund, tab_perf, tab_win, tab_sim, tab_hl = st.tabs([
     "📊 Grid", "⚖️ Bandingkan", "🔊 Volume", "⭐ Watchlist", "🔎 Detail", 
@@ -424,23 +436,28 @@ tab_grid, tab_compare, tab_vol, tab_watch, tab_detail, tab_cycle, tab_fund, tab_
 # === TAB 1: GRID OVERVIEW ===
 with tab_grid:
     st.header("📊 Grid Overview")
-    with st.expander("🔍 Filter Grid"):
+    scr = get_screener(version=CACHE_VERSION)
+    with st.expander("🔍 Filter Grid (seluruh IHSG)"):
         c1, c2, c3, c4 = st.columns(4)
         with c1: min_p = st.number_input("Min Harga (Rp)", value=0, step=50)
         with c2: max_p = st.number_input("Max Harga (Rp)", value=100000, step=50)
         with c3: min_val_m = st.number_input("Min. Transaksi (Miliar Rp)", value=0, step=1)
         with c4: min_vol_l = st.number_input("Min. Volume (Lot)", value=0, step=1000)
+        c5, c6 = st.columns(2)
+        with c5: rsi_rng = st.slider("RSI 14", 0, 100, (0, 100))
+        with c6: ind_sel = st.multiselect("Industri:", scr.options("Industri"))
     
     final_tickers = GRID_TICKERS
-    if (max_p < 100000) or (min_p > 0) or (min_val_m > 0) or (min_vol_l > 0):
-        with st.spinner("Memfilter saham..."):
-            snapshot = get_latest_snapshot(GRID_TICKERS)
-            filtered = []
-            for t, stats in snapshot.items():
-                if (min_p <= stats['price'] <= max_p) and ((stats['value']/1e9) >= min_val_m) and ((stats['volume_lot']) >= min_vol_l):
-                    filtered.append(t)
-            final_tickers = filtered
-            st.success(f"Ditemukan {len(final_tickers)} saham.")
+    ranges = {
+        "Harga": (min_p or None, max_p if max_p < 100000 else None),
+        "Nilai (M)": (min_val_m or None, None),
+        "Volume (Lot)": (min_vol_l or None, None),
+        "RSI14": (rsi_rng[0] or None, rsi_rng[1] if rsi_rng[1] < 100 else None),
+    }
+    if any(r != (None, None) for r in ranges.values()) or ind_sel:
+        # Query langsung ke indeks terurut, jadi filter ikut berubah setiap input digeser
+        final_tickers = scr.query(ranges, equals={"Industri": ind_sel})
+        st.success(f"Ditemukan {len(final_tickers)} saham.")
 
     col_tf, col_nav = st.columns([3, 2])
     with col_tf:
@@ -462,7 +479,7 @@ with tab_grid:
         start = (st.session_state.grid_page - 1) * items_per_page
         batch = final_tickers[start:start + items_per_page]
         with st.spinner(f"Memuat grafik..."):
-            data_grid = get_stock_history_bulk(batch, period=selected_code, interval=selected_interval)
+            data_grid = get_stock_history_bulk(batch, period=selected_code, interval=selected_interval, version=CACHE_VERSION)
             cols = st.columns(4)
             for i, ticker in enumerate(batch):
                 with cols[i % 4]:
@@ -476,7 +493,7 @@ with tab_grid:
                             col = 'Close' if 'Close' in df.columns else 'Adj Close'
                             df = df.dropna(subset=[col]).rename(columns={col: 'Close'})
                             if len(df) >= 2:
-                                st.plotly_chart(create_mini_chart_complex(df, ticker, selected_code), use_container_width=True, config={'displayModeBar': False})
+                                st.plotly_chart(create_mini_chart_complex(df, ticker, selected_code, selected_interval), use_container_width=True, config={'displayModeBar': False})
                                 check = st.checkbox(f"Pilih {ticker}", value=(ticker in st.session_state.picked_stocks), key=f"c_{ticker}_{st.session_state.grid_page}")
                                 if check and ticker not in st.session_state.picked_stocks: st.session_state.picked_stocks.append(ticker)
                                 elif not check and ticker in st.session_state.picked_stocks: st.session_state.picked_stocks.remove(ticker)
@@ -489,7 +506,7 @@ with tab_compare:
     picked = st.session_state.picked_stocks
     if picked:
         if st.button("Hapus Semua Pilihan"): st.session_state.picked_stocks = []; st.rerun()
-        comp_data = get_stock_history_bulk(picked, period="6mo", interval="1d")
+        comp_data = get_stock_history_bulk(picked, period="6mo", interval="1d", version=CACHE_VERSION)
         cols = st.columns(3)
         for i, ticker in enumerate(picked):
             with cols[i % 3]:
@@ -501,15 +518,48 @@ with tab_compare:
                     if st.button(f"Hapus {ticker}", key=f"del_{ticker}"): 
                         st.session_state.picked_stocks.remove(ticker); st.rerun()
                 except: pass
+
+        st.divider()
+        st.subheader("🔗 Korelasi Pergerakan")
+        c1, c2 = st.columns(2)
+        with c1: corr_win = st.selectbox("Window (hari bursa):", [20, 60, 120, 250], index=1)
+        with c2: corr_scope = st.radio("Cakupan:", ["Pilihan", "Seluruh IHSG"], horizontal=True)
+        # Matriks universe hanya dihitung kalau cakupannya memang seluruh IHSG
+        if corr_scope == "Seluruh IHSG": corr_mat = get_correlation(tuple(universe.IHSG_TICKERS), corr_win, version=CACHE_VERSION)
+        else: corr_mat = get_correlation(tuple(dict.fromkeys(picked)), corr_win, version=CACHE_VERSION)
+        if len(corr_mat) >= 2:
+            fig_corr = go.Figure(go.Heatmap(z=corr_mat.values, x=corr_mat.columns, y=corr_mat.index,
+                                            colorscale="RdBu", zmid=0, zmin=-1, zmax=1))
+            fig_corr.update_layout(height=500 if len(corr_mat) <= 30 else 800, margin=dict(l=10, r=10, t=30, b=10),
+                                   yaxis=dict(autorange="reversed"))
+            st.plotly_chart(fig_corr, use_container_width=True)
+        else: st.info("Pilih minimal 2 saham dengan data cukup.")
+        pairs = [{"Ticker": t, "Paling Searah": p, "Korelasi": v}
+                 for t in picked for p, v in correlation.top_pairs(corr_mat, t).items()]
+        if pairs:
+            st.caption("Saham paling searah di " + ("seluruh IHSG" if corr_scope == "Seluruh IHSG" else "pilihan"))
+            st.dataframe(pd.DataFrame(pairs).style.format({"Korelasi": "{:.2f}"}), use_container_width=True, hide_index=True)
     else: st.warning("Pilih saham dari Tab Grid.")
 
 # === TAB 3: VOLUME ===
 with tab_vol:
     st.header("Analisis Volume")
+    # Leaderboard seluruh IHSG dari snapshot screener; ranking.py hanya memproses ticker yang berubah
+    lb = ranking.board("ihsg")
+    lb.update(get_screener(version=CACHE_VERSION).table)
+    lb_metric = st.selectbox("Leaderboard IHSG:", ranking.METRICS)
+    c1, c2 = st.columns(2)
+    with c1:
+        st.caption("Teratas")
+        st.dataframe(lb.top(lb_metric).style.format("{:,.2f}", subset=ranking.METRICS, na_rep="-"), use_container_width=True, hide_index=True)
+    with c2:
+        st.caption("Terbawah")
+        st.dataframe(lb.bottom(lb_metric).style.format("{:,.2f}", subset=ranking.METRICS, na_rep="-"), use_container_width=True, hide_index=True)
+    st.divider()
     v_in = st.text_area("Input Saham:", value="BBCA.JK, GOTO.JK")
     if st.button("Analisa Volume"):
         tickers = [t.strip().upper() for t in v_in.split(',')]
-        res = get_stock_volume_stats(tickers)
+        res = get_stock_volume_stats(tickers, version=CACHE_VERSION)
         if res is not None:
             st.dataframe(res.style.format({"Price": "{:,.0f}", "Volume": "{:,.0f}"}), use_container_width=True)
 
@@ -522,6 +572,87 @@ with tab_watch:
             st.session_state.watchlist.append(new_w); save_data(); st.rerun()
     st.write(st.session_state.watchlist)
 
+    st.divider()
+    st.subheader("💼 Portofolio")
+    pf_state = st.session_state.portfolio
+    with st.expander("➕ Catat Transaksi"):
+        c1, c2, c3, c4, c5 = st.columns(5)
+        with c1: tx_kode = st.text_input("Kode:", key="tx_kode").strip().upper()
+        with c2: tx_aksi = st.selectbox("Aksi:", portfolio.ACTIONS)
+        with c3: tx_lot = st.number_input("Lot:", value=1, min_value=1, step=1)
+        with c4: tx_harga = st.number_input("Harga (Rp):", value=0, min_value=0, step=5)
+        with c5: tx_tgl = st.date_input("Tanggal:", value=datetime.now().date())
+        if st.button("Simpan Transaksi") and tx_kode and tx_harga > 0:
+            kode = tx_kode if tx_kode.endswith(".JK") else tx_kode + ".JK"
+            pf_state["transactions"].append(portfolio.transaction(kode, tx_aksi, tx_lot, tx_harga, tx_tgl))
+            save_data(); st.rerun()
+    txns = pf_state["transactions"]
+    if txns:
+        # Posisi di-memo per ledger; revaluasi cukup dari harga snapshot terakhir (tanpa download histori)
+        marked = portfolio.mark(portfolio.positions(txns), get_latest_prices(tuple(sorted({tx["ticker"] for tx in txns})), version=CACHE_VERSION))
+        pf_state["curve"], berubah = portfolio.refresh_curve(pf_state.get("curve"), txns, marked,
+                                                             lambda tks, start: ohlcv_store.download(tks, start=start))
+        if berubah: save_data()
+        tot = portfolio.totals(marked)
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Nilai Pasar", f"Rp {tot['Nilai (Rp)']:,.0f}")
+        m2.metric("Modal", f"Rp {tot['Modal (Rp)']:,.0f}")
+        m3.metric("Unrealized", f"Rp {tot['Unrealized (Rp)']:,.0f}")
+        m4.metric("Realized", f"Rp {tot['Realized (Rp)']:,.0f}")
+        st.dataframe(marked.style.format({"Harga Rata2": "{:,.2f}", "Modal (Rp)": "{:,.0f}", "Realized (Rp)": "{:,.0f}", "Harga": "{:,.0f}",
+                                          "Nilai (Rp)": "{:,.0f}", "Unrealized (Rp)": "{:,.0f}", "Unrealized (%)": "{:.2f}%", "Bobot (%)": "{:.1f}%"}, na_rep="-"),
+                     use_container_width=True)
+        c1, c2 = st.columns([1, 2])
+        open_pos = marked[marked["Lot"] > 0]
+        with c1:
+            if not open_pos.empty:
+                fig_alloc = go.Figure(go.Pie(labels=open_pos.index, values=open_pos["Nilai (Rp)"], hole=0.4))
+                fig_alloc.update_layout(title="Alokasi", height=350, margin=dict(l=10, r=10, t=40, b=10))
+                st.plotly_chart(fig_alloc, use_container_width=True)
+        with c2:
+            eq = portfolio.curve_frame(pf_state["curve"])
+            if not eq.empty:
+                fig_eq = go.Figure()
+                for col, color in [("Nilai Pasar", "#2962ff"), ("Modal", "gray"), ("P&L", "#00c853")]:
+                    fig_eq.add_trace(go.Scatter(x=eq.index, y=eq[col], name=col, line=dict(color=color)))
+                fig_eq.update_layout(title="Kurva Ekuitas", height=350, template="plotly_white", margin=dict(l=10, r=10, t=40, b=10))
+                st.plotly_chart(fig_eq, use_container_width=True)
+        with st.expander(f"📜 Riwayat Transaksi ({len(txns)})"):
+            st.dataframe(pd.DataFrame(txns), use_container_width=True, hide_index=True)
+            if st.button("Hapus Transaksi Terakhir"):
+                txns.pop(); save_data(); st.rerun()
+
+    st.divider()
+    st.subheader("🔔 Alert")
+    rules = st.session_state.alert_rules
+    targets = {"Watchlist": "@watchlist", "Vol Watchlist": "@vol_watchlist", "Seluruh IHSG": "@ihsg"}
+    with st.expander("➕ Tambah Aturan"):
+        c1, c2, c3 = st.columns(3)
+        with c1:
+            al_target = st.selectbox("Target:", list(targets) + ["Satu Saham"])
+            al_kode = st.text_input("Kode:", key="al_kode").strip().upper() if al_target == "Satu Saham" else ""
+        with c2: al_kind = st.selectbox("Kondisi:", list(alerts.KINDS), format_func=alerts.label)
+        with c3: al_value = st.number_input("Nilai (N):", value=float(alerts.KINDS[al_kind][3]), step=0.5)
+        if st.button("Simpan Aturan"):
+            target = targets.get(al_target) or (al_kode if al_kode.endswith(".JK") else al_kode + ".JK")
+            if target != ".JK":
+                rules.append(alerts.rule(al_kind, target, al_value)); save_data(); st.rerun()
+    if rules:
+        # Dievaluasi terhadap snapshot screener yang sudah di-cache; hanya ticker yang berubah yang dihitung ulang
+        fired = alerts.engine().evaluate(get_screener(version=CACHE_VERSION).table, rules,
+                                         {"watchlist": st.session_state.watchlist, "vol_watchlist": st.session_state.vol_watchlist,
+                                          "ihsg": universe.IHSG_TICKERS})
+        for a in fired[:10]: st.toast(f"🔔 {a['Ticker']}: {a['Alert']} ({a['Nilai']})")
+        for r in list(rules):
+            c1, c2 = st.columns([5, 1])
+            c1.write(f"**{r['target']}** — {alerts.describe(r)}")
+            if c2.button("Hapus", key=f"al_del_{r['id']}"):
+                rules.remove(r); alerts.engine().forget(r["id"]); save_data(); st.rerun()
+    hist = alerts.history()
+    if not hist.empty:
+        with st.expander(f"📜 Riwayat Alert ({len(hist)})"):
+            st.dataframe(hist.drop(columns="rule"), use_container_width=True, hide_index=True)
+
 # === TAB 5: DETAIL ===
 with tab_detail:
     st.header("Detail Saham")
@@ -529,19 +660,39 @@ with tab_detail:
     if st.button("Cek Detail"):
         df = get_single_stock_detail(d_tick, "1y")
         if df is not None:
-            st.plotly_chart(create_detail_chart(df, d_tick, pd.DataFrame()), use_container_width=True)
+            feats = get_feature_panel((d_tick,), "1y", CACHE_VERSION)
+            feats = feats[d_tick] if not feats.empty else None
+            st.plotly_chart(create_detail_chart(df, d_tick, pd.DataFrame(), features=feats), use_container_width=True)
+            if feats is not None:
+                last = feats.ffill().iloc[-1]
+                m1, m2, m3, m4 = st.columns(4)
+                m1.metric("RSI 14", f"{last['RSI14']:.1f}")
+                m2.metric("MACD Hist", f"{last['MACD_HIST']:,.2f}")
+                m3.metric("ATR 14", f"{last['ATR14']:,.0f}")
+                m4.metric("Volatilitas 20H", f"{last['VOL20']:.1f}%")
 
 # === TAB 6: CYCLE ===
 with tab_cycle:
     st.header("Cycle Analysis")
     cy_tick = st.text_input("Saham Cycle:", value="GOTO.JK, BBCA.JK").upper()
-    if st.button("Analisa Cycle"):
-        res = get_seasonal_details(cy_tick, 1, 12)
-        if res:
-            for t, data in res.items():
+    bulan = ["Jan", "Feb", "Mar", "Apr", "Mei", "Jun", "Jul", "Agu", "Sep", "Okt", "Nov", "Des"]
+    cm1, cm2 = st.columns(2)
+    with cm1: cy_start = st.selectbox("Bulan Mulai:", range(1, 13), index=0, format_func=lambda m: bulan[m - 1])
+    with cm2: cy_end = st.selectbox("Bulan Akhir:", range(1, 13), index=11, format_func=lambda m: bulan[m - 1])
+    # Setelah tombol ditekan sekali, ganti bulan langsung dihitung ulang dari cache
+    if st.button("Analisa Cycle"): st.session_state.cy_active = True
+    if cy_tick and st.session_state.get("cy_active"):
+        res = get_seasonal_details(cy_tick, cy_start, cy_end, version=CACHE_VERSION)
+        if res and res["cube"].shape[2]:
+            st.dataframe(seasonality.summary(res).style.format({"Hit Rate (%)": "{:.0f}", "Rata-rata (%)": "{:.2f}", "Median (%)": "{:.2f}"}), use_container_width=True, hide_index=True)
+            for i, t in enumerate(res["tickers"]):
+                if np.isnan(res["final"][i]).all(): continue
                 st.subheader(t)
                 fig = go.Figure()
-                for y, s in data.items(): fig.add_trace(go.Scatter(y=s, name=y))
+                for y, label in enumerate(res["labels"]):
+                    fig.add_trace(go.Scatter(y=res["cube"][i, y], name=label, opacity=0.5))
+                fig.add_trace(go.Scatter(y=res["mean"][i], name="Rata-rata", line=dict(color="white", width=3)))
+                fig.add_trace(go.Scatter(y=res["median"][i], name="Median", line=dict(color="orange", width=2, dash="dash")))
                 st.plotly_chart(fig)
 
 # === TAB 7: FUNDAMENTAL ===
@@ -554,44 +705,115 @@ with tab_fund:
 # === TAB 8: PERFORMA ===
 with tab_perf:
     st.header("Performa")
+    with st.expander("🏭 Rotasi Sektor (seluruh IHSG)"):
+        grp_by = st.radio("Kelompok:", ["Sektor", "Industri"], horizontal=True)
+        rot = get_sector_rollup(grp_by, version=CACHE_VERSION)
+        if not rot.empty:
+            rot = rot.sort_values("1 Bulan (%)", ascending=False)
+            fig_rot = go.Figure([go.Bar(x=rot[grp_by], y=rot[c], name=c) for c in sectors.RETURNS])
+            fig_rot.update_layout(barmode="group", height=400, template="plotly_white", margin=dict(l=10, r=10, t=30, b=10))
+            st.plotly_chart(fig_rot, use_container_width=True)
+            st.dataframe(rot.style.format("{:,.2f}", subset=[c for c in rot.columns if c not in [grp_by, "Saham", "Naik", "Turun"]], na_rep="-"),
+                         use_container_width=True, hide_index=True)
     p_in = st.text_area("Saham:", value=DEFAULT_INPUT_TXT)
+    p_custom = st.text_input("Horizon tambahan (hari / tanggal, pisah koma):", value="", placeholder="90, 730, 2024-01-01")
     if st.button("Cek Performa"):
-        df = get_performance_matrix(p_in)
+        df = get_performance_matrix(p_in, p_custom)
         st.dataframe(df)
 
 # === TAB 9: WIN/LOSS ===
 with tab_win:
-    st.header("Win/Loss Stats (30 Hari)")
+    st.header("Win/Loss & Streak Stats")
     w_in = st.text_area("Saham:", value=DEFAULT_INPUT_TXT, key="wl_in")
-    if st.button("Hitung Stat"):
-        summ, det = get_win_loss_details(w_in)
+    w_len = st.number_input("Jumlah Candle:", value=30, min_value=5, max_value=120, step=5)
+    if st.button("Hitung Stat"): st.session_state.wl_active = True
+    if st.session_state.get("wl_active"):
+        summ = get_win_loss_details(w_in, int(w_len), version=CACHE_VERSION)
         st.dataframe(summ)
+        if not summ.empty:
+            det_ticks = st.multiselect("Lihat detail:", summ["Ticker"].tolist())
+            for t in det_ticks:
+                with st.expander(f"Detail {t}", expanded=True):
+                    panel = get_win_loss_panel(tuple(parse_tickers(w_in)), CACHE_VERSION)
+                    st.dataframe(winloss_stats.detail(panel, t, int(w_len)), use_container_width=True)
 
 # === TAB 10: SIMULATOR ===
 with tab_sim:
     st.header("🎯 Simulator & Backtest")
-    c1, c2 = st.columns([3, 1])
+    c1, c2, c3 = st.columns([3, 1, 1])
     with c1: sim_in = st.text_area("Saham:", value="BBCA.JK, GOTO.JK, ANTM.JK")
     with c2: 
-        sim_per = st.selectbox("Periode:", ["1mo", "3mo", "6mo"], index=1)
-        sim_lot = st.number_input("Lot:", value=100)
-    
-    if st.button("Jalankan Simulasi"):
-        tickers = [t.strip().upper() for t in sim_in.split(',')]
-        data = get_stock_history_bulk(tickers, period=sim_per)
-        res = []
-        for t in tickers:
-            try:
-                if isinstance(data.columns, pd.MultiIndex): df = data[t].dropna()
-                else: df = data.dropna()
-                if not df.empty:
-                    start = df['Open'].iloc[0]
-                    end = df['Close'].iloc[-1]
-                    profit = (end - start) * sim_lot * 100
-                    res.append({"Ticker": t, "Start": start, "End": end, "Profit": profit, "Return": ((end-start)/start)*100})
-            except: pass
-        if res:
-            st.dataframe(pd.DataFrame(res).style.format({"Start":"{:,.0f}", "End":"{:,.0f}", "Profit":"{:,.0f}", "Return":"{:.2f}%"}))
+        sim_per = st.selectbox("Periode:", ["3mo", "6mo", "1y", "2y", "5y"], index=2)
+        sim_lot = st.number_input("Lot:", value=100, min_value=1)
+        sim_strat = st.selectbox("Strategi:", list(backtest.STRATEGIES), format_func=backtest.STRATEGIES.get)
+    with c3:
+        sim_buy = st.number_input("Fee Beli (%):", value=backtest.FEE_BUY * 100, step=0.01, format="%.2f")
+        sim_sell = st.number_input("Fee Jual (%):", value=backtest.FEE_SELL * 100, step=0.01, format="%.2f")
+        sim_sl = st.number_input("Stop Loss (%, 0 = off):", value=0.0, min_value=0.0, max_value=50.0, step=1.0)
+        sim_hold = st.number_input("Maks Hold (hari, 0 = off):", value=0, min_value=0, step=5)
+
+    params = ()
+    if sim_strat == "ma_cross":
+        p1, p2 = st.columns(2)
+        params = (("fast", int(p1.number_input("MA Cepat:", value=20, min_value=2))), ("slow", int(p2.number_input("MA Lambat:", value=50, min_value=3))))
+    elif sim_strat == "breakout":
+        p1, p2 = st.columns(2)
+        params = (("breakout", int(p1.number_input("Breakout High (hari):", value=20, min_value=2))), ("exit_window", int(p2.number_input("Exit Low (hari):", value=10, min_value=2))))
+
+    if st.button("Jalankan Simulasi"): st.session_state.sim_active = True
+    if st.session_state.get("sim_active"):
+        res = run_backtest(sim_in, sim_per, sim_strat, int(sim_lot), sim_buy / 100, sim_sell / 100,
+                           sim_sl / 100 or None, int(sim_hold) or None, params, version=CACHE_VERSION)
+        if res and not res["summary"].empty:
+            summ = res["summary"]
+            st.dataframe(summ.style.format({"Modal Awal (Rp)": "{:,.0f}", "Win Rate (%)": "{:.0f}", "Net P&L (Rp)": "{:,.0f}", "Return (%)": "{:.2f}%", "Max Drawdown (%)": "{:.2f}%", "Exposure (%)": "{:.0f}"}), use_container_width=True, hide_index=True)
+            st.metric("Total P&L", f"Rp {summ['Net P&L (Rp)'].sum():,.0f}")
+            sel = st.selectbox("Equity curve:", summ["Ticker"].tolist())
+            eq = res["equity"][sel].ffill().fillna(0.0)
+            capital = eq + summ.set_index("Ticker").loc[sel, "Modal Awal (Rp)"]
+            fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.7, 0.3], vertical_spacing=0.03)
+            fig.add_trace(go.Scatter(x=eq.index, y=eq, name="P&L (Rp)", line=dict(color="#00E676")), row=1, col=1)
+            fig.add_trace(go.Scatter(x=eq.index, y=(capital / capital.cummax() - 1) * 100, name="Drawdown (%)", fill="tozeroy", line=dict(color="#FF1744")), row=2, col=1)
+            fig.update_layout(height=450, margin=dict(l=10, r=10, t=30, b=10), showlegend=False)
+            st.plotly_chart(fig, use_container_width=True)
+            with st.expander(f"Log Transaksi {sel}"):
+                st.dataframe(res["trades"][res["trades"]["Ticker"] == sel], use_container_width=True, hide_index=True)
+        else:
+            st.warning("Data tidak tersedia.")
+
+    # Optimasi parameter: grid dijalankan paralel (param_sweep.py), leaderboard tampil bertahap
+    with st.expander("🧪 Optimasi Parameter (Sweep)"):
+        if sim_strat == "ma_cross":
+            o1, o2 = st.columns(2)
+            f_rng = o1.slider("Rentang MA Cepat:", 5, 200, (5, 50), step=5)
+            s_rng = o2.slider("Rentang MA Lambat:", 5, 200, (20, 200), step=10)
+            ranges = {"fast": range(f_rng[0], f_rng[1] + 1, 5), "slow": range(s_rng[0], s_rng[1] + 1, 10)}
+        elif sim_strat == "breakout":
+            o1, o2 = st.columns(2)
+            b_rng = o1.slider("Rentang Breakout High:", 5, 120, (10, 60), step=5)
+            e_rng = o2.slider("Rentang Exit Low:", 5, 60, (5, 30), step=5)
+            ranges = {"breakout": range(b_rng[0], b_rng[1] + 1, 5), "exit_window": range(e_rng[0], e_rng[1] + 1, 5)}
+        else:
+            ranges = {}
+        o3, o4 = st.columns(2)
+        sl_list = o3.text_input("Stop Loss (%) dicoba:", value="0, 5, 10")
+        hold_list = o4.text_input("Maks Hold (hari) dicoba:", value="0, 20, 60")
+        try:
+            stops = [float(x) / 100 for x in sl_list.split(",") if x.strip()] or [0]
+            holds = [int(x) for x in hold_list.split(",") if x.strip()] or [0]
+        except:
+            stops, holds = [0], [0]
+        cells = param_sweep.grid(sim_strat, stop_loss=stops, max_hold=holds, **ranges)
+        st.caption(f"{len(cells)} kombinasi")
+        if st.button("Jalankan Sweep"):
+            panel = get_backtest_panel(tuple(parse_tickers(sim_in)), sim_per, CACHE_VERSION)
+            if panel.empty:
+                st.warning("Data tidak tersedia.")
+            else:
+                bar, board = st.progress(0.0), st.empty()
+                for done, total, lb in param_sweep.sweep(panel, parse_tickers(sim_in), cells, int(sim_lot), sim_buy / 100, sim_sell / 100):
+                    bar.progress(done / max(total, 1), text=f"{done}/{total} kombinasi")
+                    if not lb.empty: board.dataframe(lb, use_container_width=True, hide_index=True)
 
 # === TAB 11: HIGH/LOW ===
 with tab_hl:
@@ -599,19 +821,28 @@ with tab_hl:
     hl_in = st.text_input("Saham:", value="BBCA, GOTO")
     if st.button("Analisa HL"):
         ticks = [t.strip().upper() + ".JK" if not t.strip().upper().endswith(".JK") else t.strip().upper() for t in hl_in.split(',')]
-        data = get_stock_history_bulk(ticks, period="6mo")
+        hl = get_extremes(tuple(ticks), version=CACHE_VERSION)
+        if not hl.empty:
+            hl = extremes.distances(hl).rename(columns={"Close": "Harga", "High": "52W High", "Low": "52W Low"})
+            st.dataframe(hl.drop(columns="Bars").style.format("{:,.2f}", na_rep="-"), use_container_width=True)
+        data = get_stock_history_bulk(ticks, period=extremes.PERIOD, version=CACHE_VERSION)
         for t in ticks:
             try:
                 if isinstance(data.columns, pd.MultiIndex): df = data[t].dropna()
                 else: df = data.dropna()
                 if not df.empty:
-                    df['MA20'] = df['Close'].rolling(20).mean()
+                    df['MA20'] = indicator_state.compute(t, df['Close'])['MA20']
+                    # Garis 52W dihitung dari histori penuh, yang ditampilkan tetap 6 bulan terakhir
+                    df['52W High'] = extremes.rolling_max(df[['High']].to_numpy())[:, 0]
+                    df['52W Low'] = extremes.rolling_min(df[['Low']].to_numpy())[:, 0]
+                    df = df[df.index >= df.index[-1] - pd.DateOffset(months=6)]
                     fig = go.Figure()
                     fig.add_trace(go.Scatter(x=df.index, y=df['High'], name='High', line=dict(color='green', dash='dot')))
                     fig.add_trace(go.Scatter(x=df.index, y=df['Low'], name='Low', line=dict(color='red', dash='dot')))
+                    fig.add_trace(go.Scatter(x=df.index, y=df['52W High'], name='52W High', line=dict(color='green')))
+                    fig.add_trace(go.Scatter(x=df.index, y=df['52W Low'], name='52W Low', line=dict(color='red')))
                     fig.add_trace(go.Scatter(x=df.index, y=df['Close'], name='Close', line=dict(color='black')))
                     fig.add_trace(go.Scatter(x=df.index, y=df['MA20'], name='MA20', line=dict(color='blue')))
                     fig.update_layout(title=t, height=400, template="plotly_white")
                     st.plotly_chart(fig, use_container_width=True)
             except: pass
-
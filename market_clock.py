@@ -0,0 +1,85 @@
+"""
+Jam bursa IDX (Asia/Jakarta) untuk menentukan kapan data bisa berubah.
+
+- Senin-Kamis : sesi 1 09:00-12:00, sesi 2 13:30-16:00
+- Jumat       : sesi 1 09:00-11:30, sesi 2 14:00-16:00
+- Sabtu/Minggu dan tanggal di env `IDX_HOLIDAYS` (YYYY-MM-DD, pisah koma) libur
+
+`cache_version()` menghasilkan token yang berganti tiap `cadence` detik saat sesi
+berjalan, dan membeku di luar sesi (istirahat siang, malam, libur) sampai sesi
+berikutnya dibuka. Token ini dipakai sebagai argumen fungsi @st.cache_data.
+"""
+import os
+from datetime import datetime, time as dtime, timedelta
+
+import pytz
+
+JKT_TZ = pytz.timezone("Asia/Jakarta")
+
+SESSIONS = {
+    "regular": [(dtime(9, 0), dtime(12, 0)), (dtime(13, 30), dtime(16, 0))],
+    "friday": [(dtime(9, 0), dtime(11, 30)), (dtime(14, 0), dtime(16, 0))],
+}
+
+# Yahoo kadang masih merevisi bar terakhir beberapa menit setelah penutupan
+SETTLE_MINUTES = 30
+
+HOLIDAYS = {d.strip() for d in os.environ.get("IDX_HOLIDAYS", "").split(",") if d.strip()}
+
+def now_jkt():
+    return datetime.now(JKT_TZ)
+
+def _to_jkt(now):
+    if now is None: return now_jkt()
+    if now.tzinfo is None: return JKT_TZ.localize(now)
+    return now.astimezone(JKT_TZ)
+
+def is_trading_day(day):
+    return day.weekday() < 5 and day.strftime("%Y-%m-%d") not in HOLIDAYS
+
+def sessions_on(day):
+    """Daftar (buka, tutup) datetime WIB untuk tanggal `day` (kosong kalau libur)."""
+    if not is_trading_day(day): return []
+    table = SESSIONS["friday"] if day.weekday() == 4 else SESSIONS["regular"]
+    return [(JKT_TZ.localize(datetime.combine(day, o)), JKT_TZ.localize(datetime.combine(day, c))) for o, c in table]
+
+def is_market_open(now=None):
+    now = _to_jkt(now)
+    return any(o <= now < c for o, c in sessions_on(now.date()))
+
+def last_session_end(now=None):
+    """Akhir sesi terakhir yang sudah selesai sebelum `now`."""
+    now = _to_jkt(now)
+    day = now.date()
+    for _ in range(15):
+        ends = [c for _, c in sessions_on(day) if c <= now]
+        if ends: return max(ends)
+        day -= timedelta(days=1)
+    return now
+
+def next_session_start(now=None):
+    now = _to_jkt(now)
+    day = now.date()
+    for _ in range(15):
+        starts = [o for o, _ in sessions_on(day) if o > now]
+        if starts: return min(starts)
+        day += timedelta(days=1)
+    return now + timedelta(days=1)
+
+def cache_version(cadence=300, now=None):
+    """Token cache: berganti tiap `cadence` detik saat sesi, beku di luar sesi."""
+    now = _to_jkt(now)
+    if is_market_open(now):
+        return f"live-{int(now.timestamp()) // cadence}"
+    # Setelah tutup, tunggu bar final dulu baru dibekukan
+    end = last_session_end(now)
+    if now < end + timedelta(minutes=SETTLE_MINUTES):
+        return f"settle-{int(now.timestamp()) // cadence}"
+    return f"closed-{end.strftime('%Y%m%d%H%M')}"
+
+def is_settled(synced_at, now=None):
+    """True kalau data yang di-sync pada epoch `synced_at` sudah final (pasar tutup sejak itu)."""
+    now = _to_jkt(now)
+    if is_market_open(now): return False
+    settled_at = last_session_end(now) + timedelta(minutes=SETTLE_MINUTES)
+    return now >= settled_at and synced_at >= settled_at.timestamp()
@@ -0,0 +1,350 @@
+"""
+Penyimpanan OHLCV lokal (Parquet) yang dipakai bersama oleh semua dashboard.
+
+Setiap ticker disimpan sebagai satu file per interval:
+    data/ohlcv/interval=1d/ticker=BBCA.JK.parquet
+
+`download()` punya bentuk keluaran yang sama dengan
+`yf.download(..., group_by='ticker', auto_adjust=False)`, tapi membaca dari disk
+dulu dan hanya memanggil provider data (default Yahoo, lihat data_provider.py)
+untuk bagian data yang belum ada (gap). Download dipecah per chunk oleh
+download_planner.py; request yang sama/tumpang tindih dari beberapa sesi
+sekaligus digabung oleh fetch_coordinator.py.
+
+Dividen & split disimpan terpisah sebagai tabel aksi per ticker:
+    data/ohlcv/actions/ticker=BBCA.JK.parquet
+dan baru diterapkan saat baca kalau diminta `adjusted=True` (lihat corporate_actions.py).
+"""
+import os
+import json
+import time
+import threading
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+import corporate_actions
+import data_provider
+import download_planner
+import fetch_coordinator
+import market_clock
+
+# ==============================
+# 1. KONFIGURASI
+# ==============================
+
+STORE_DIR = os.environ.get("OHLCV_STORE_DIR", os.path.join("data", "ohlcv"))
+MANIFEST_FILE = os.path.join(STORE_DIR, "manifest.json")
+FIELDS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+# Data dianggap masih segar kalau terakhir di-sync kurang dari MAX_AGE detik lalu
+MAX_AGE = {"1d": 300, "5m": 120}
+DEFAULT_MAX_AGE = 300
+
+# Periode berbasis sesi bursa: "1d" = sesi terakhir, "5d" = 5 sesi terakhir (bukan hari kalender)
+SESSION_PERIODS = {"1d": 1, "5d": 5}
+
+PERIOD_DAYS = {
+    "1d": 8, "5d": 14, "1mo": 31, "3mo": 92, "6mo": 183,
+    "1y": 366, "2y": 731, "3y": 1096, "5y": 1827, "7y": 2557, "10y": 3653,
+}
+
+_lock = threading.RLock()
+
+# ==============================
+# 2. FILE & MANIFEST
+# ==============================
+
+def _ticker_path(ticker, interval):
+    return os.path.join(STORE_DIR, f"interval={interval}", f"ticker={ticker}.parquet")
+
+def load_manifest():
+    if os.path.exists(MANIFEST_FILE):
+        try:
+            with open(MANIFEST_FILE, "r") as f:
+                return json.load(f)
+        except:
+            return {}
+    return {}
+
+def save_manifest(manifest):
+    os.makedirs(STORE_DIR, exist_ok=True)
+    tmp = MANIFEST_FILE + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, MANIFEST_FILE)
+
+def load_ticker(ticker, interval="1d"):
+    path = _ticker_path(ticker, interval)
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=FIELDS)
+    try:
+        return pd.read_parquet(path)
+    except:
+        return pd.DataFrame(columns=FIELDS)
+
+def save_ticker(ticker, df, interval="1d"):
+    path = _ticker_path(ticker, interval)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Nama tmp unik per thread: beberapa sesi bisa menulis ticker yang sama bersamaan
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    df.to_parquet(tmp)
+    os.replace(tmp, path)
+
+def _actions_path(ticker):
+    return os.path.join(STORE_DIR, "actions", f"ticker={ticker}.parquet")
+
+def load_actions(ticker):
+    path = _actions_path(ticker)
+    if not os.path.exists(path): return corporate_actions.empty_table()
+    try:
+        return pd.read_parquet(path)
+    except:
+        return corporate_actions.empty_table()
+
+def save_actions(ticker, table):
+    path = _actions_path(ticker)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    table.to_parquet(tmp)
+    os.replace(tmp, path)
+
+def _ingest_actions(ticker, bars, interval):
+    """Pindahkan kolom Dividends/Stock Splits ke tabel aksi (hanya 1d); return bar harga saja."""
+    bars, acts = corporate_actions.split_bars(bars)
+    if interval != "1d" or acts.empty: return bars
+    split_adjusted = getattr(data_provider.get_provider(), "split_adjusted", True)
+    table = corporate_actions.compute_factors(acts, bars, split_adjusted)
+    save_actions(ticker, corporate_actions.merge_tables(load_actions(ticker), table))
+    return bars
+
+def merge_bars(old, new):
+    """Gabungkan bar lama & baru, bar baru menang kalau tanggalnya sama."""
+    if old is None or old.empty: return new.sort_index()
+    if new is None or new.empty: return old.sort_index()
+    merged = pd.concat([old, new])
+    merged = merged[~merged.index.duplicated(keep="last")]
+    return merged.sort_index()
+
+# ==============================
+# 3. HELPER PERIODE & FORMAT
+# ==============================
+
+def period_to_start(period, now=None):
+    """Ubah kode periode Yahoo ('3mo', '5y', 'ytd', ...) menjadi tanggal mulai."""
+    now = now or datetime.now()
+    if period == "ytd": return datetime(now.year, 1, 1)
+    if period == "max": return datetime(1990, 1, 1)
+    days = PERIOD_DAYS.get(period)
+    if days is None: raise ValueError(f"Periode tidak dikenal: {period}")
+    # Sedikit dilebihkan supaya libur bursa tidak memotong data di awal periode
+    return (now - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+def last_sessions(df, n):
+    """Ambil n sesi (tanggal) terakhir dari sebuah DataFrame bar."""
+    if df.empty: return df
+    days = pd.DatetimeIndex(df.index).normalize()
+    keep = days.unique()[-n:]
+    return df[days.isin(keep)]
+
+def to_panel(frames, tickers):
+    """
+    Susun dict {ticker: DataFrame} ke bentuk yang sama dengan yf.download(group_by='ticker'):
+    bentuk kolom ditentukan dari jumlah ticker yang DIMINTA (satu ticker = kolom
+    datar, lebih = MultiIndex), walaupun hanya satu yang punya data.
+    """
+    requested = list(dict.fromkeys(tickers))
+    tickers = [t for t in requested if t in frames and not frames[t].empty]
+    if not tickers: return pd.DataFrame()
+    if len(requested) == 1: return frames[tickers[0]]
+    return pd.concat({t: frames[t] for t in tickers}, axis=1)
+
+# ==============================
+# 4. SYNC ENGINE (DELTA FETCH)
+# ==============================
+# Manifest menyimpan high-water mark (HWM) per ticker & interval:
+#   start     : awal rentang yang sudah pernah di-sync
+#   hwm       : timestamp bar terakhir yang tersimpan
+#   check     : bar selesai sebelum HWM, dipakai untuk deteksi revisi / split
+#   synced_at : epoch terakhir kali ticker ini di-sync
+
+# Selisih relatif di bar `check` yang dianggap revisi (split, koreksi data, dsb).
+# Hanya Close (sudah split-adjusted) & Volume yang dibandingkan: dividen mengubah
+# Adj Close seluruh histori, tapi itu sudah ditangani tabel corporate_actions.
+REVISION_TOLERANCE = 0.005
+REVISION_FIELDS = ["Close", "Volume"]
+
+def _fetch(tickers, start, end, interval, stats):
+    # Gap di depan boleh kosong (ticker belum IPO), jadi tidak di-retry di sini;
+    # ticker yang tidak kembali dicoba lagi di sync berikutnya (manifest tidak diubah)
+    retries = 0 if end is not None else download_planner.RETRIES
+    frames, report = fetch_coordinator.fetch(tickers, start=start, end=end, interval=interval, retries=retries)
+    download_planner.merge_reports(stats, report)
+    stats["requests"] += len(report["chunks"])
+    return frames
+
+def _is_stale(entry, interval, now):
+    # Di-sync setelah bursa tutup (dan bar sudah final): tidak ada bar baru sampai sesi berikutnya
+    if market_clock.is_settled(entry.get("synced_at", 0)): return False
+    max_age = MAX_AGE.get(interval, DEFAULT_MAX_AGE)
+    return now - entry.get("synced_at", 0) > max_age
+
+def plan_sync(tickers, start, interval, per_interval, now=None):
+    """
+    Kelompokkan ticker berdasarkan rentang yang kurang: {(start, end): [tickers]}.
+    Ticker dengan rentang yang sama diambil dalam satu panggilan yf.download.
+    """
+    now = now or time.time()
+    start = pd.Timestamp(start)
+    groups = {}
+    for t in tickers:
+        entry = per_interval.get(t)
+        if not entry:
+            groups.setdefault((start, None), []).append(t)
+            continue
+        covered = pd.Timestamp(entry["start"])
+        if start < covered:
+            # Gap di depan: hanya ambil bagian yang belum pernah diambil
+            groups.setdefault((start, covered), []).append(t)
+        if _is_stale(entry, interval, now):
+            hwm = entry.get("hwm") or entry.get("end")
+            if hwm is None:
+                groups.setdefault((covered, None), []).append(t)
+            else:
+                # Delta: mulai dari bar `check` supaya ada satu bar overlap untuk verifikasi
+                delta_start = pd.Timestamp(entry.get("check") or hwm)
+                groups.setdefault((delta_start, None), []).append(t)
+    return groups
+
+def _is_revised(stored, fresh, check):
+    """Bandingkan bar `check` lama vs baru; beda besar berarti histori perlu diambil ulang."""
+    if check is None or stored.empty or fresh is None or fresh.empty: return False
+    check = _align(check, stored.index)
+    if check not in stored.index or check not in fresh.index: return False
+    for col in REVISION_FIELDS:
+        if col not in stored.columns or col not in fresh.columns: continue
+        old, new = stored.at[check, col], fresh.at[check, col]
+        if pd.isna(old) or pd.isna(new) or old == 0: continue
+        if abs(new - old) / abs(old) > REVISION_TOLERANCE: return True
+    return False
+
+def _sort_key(ts):
+    # Bar intraday punya timezone, bar harian tidak; samakan dulu supaya bisa diurutkan
+    return ts.tz_convert(None) if ts.tz is not None else ts
+
+def _update_entry(entry, df, start, now):
+    if not df.empty:
+        entry["hwm"] = str(df.index[-1])
+        entry["check"] = str(df.index[-2]) if len(df) > 1 else str(df.index[-1])
+    entry.pop("end", None)
+    old_start = pd.Timestamp(entry.get("start", start))
+    entry["start"] = str(min(pd.Timestamp(start), old_start))
+    entry["synced_at"] = now
+    return entry
+
+def sync(tickers, start, interval="1d"):
+    """
+    Pastikan store berisi data `tickers` mulai `start`.
+    Hanya bar yang lebih baru dari HWM yang diambil; histori lama diambil ulang
+    kalau terdeteksi revisi (mis. split) di bar overlap.
+    Return statistik: jumlah request, baris baru, ticker yang direvisi,
+    waktu per chunk, dan ticker yang tetap gagal setelah retry.
+    """
+    stats = {"requests": 0, "rows": 0, "revised": [], "chunks": [], "failed": []}
+    # Lock hanya untuk manifest; fetch berjalan di luar lock supaya sesi lain tidak
+    # menunggu, dan request yang tumpang tindih digabung oleh fetch_coordinator
+    with _lock:
+        per_interval = load_manifest().get(interval, {})
+        now = time.time()
+        groups = plan_sync(tickers, start, interval, per_interval, now)
+    updates, revised = {}, {}
+
+    for (g_start, g_end), group in sorted(groups.items(), key=lambda kv: _sort_key(kv[0][0])):
+        try:
+            fetched = _fetch(group, g_start.to_pydatetime(), g_end.to_pydatetime() if g_end is not None else None, interval, stats)
+        except:
+            continue
+        for t in group:
+            entry = updates.get(t, dict(per_interval.get(t, {})))
+            stored = load_ticker(t, interval)
+            fresh = fetched.get(t)
+            if g_end is None and _is_revised(stored, fresh, entry.get("check")):
+                revised.setdefault(pd.Timestamp(entry["start"]), []).append(t)
+                continue
+            # Tidak ada frame (gagal / kosong): manifest tidak disentuh supaya sync berikutnya mencoba lagi
+            if fresh is None or fresh.empty: continue
+            new_rows = fresh.index.difference(stored.index) if not stored.empty else fresh.index
+            stats["rows"] += len(new_rows)
+            stored = _ingest_actions(t, merge_bars(stored, fresh), interval)
+            save_ticker(t, stored, interval)
+            updates[t] = _update_entry(entry, stored, g_start, now)
+
+    # Revisi: ambil ulang seluruh rentang yang dicakup, ganti file lama
+    for r_start, group in revised.items():
+        try:
+            fetched = _fetch(group, r_start.to_pydatetime(), None, interval, stats)
+        except:
+            continue
+        for t in group:
+            fresh = fetched.get(t)
+            if fresh is None or fresh.empty: continue
+            fresh = _ingest_actions(t, fresh.sort_index(), interval)
+            save_ticker(t, fresh, interval)
+            stats["rows"] += len(fresh)
+            stats["revised"].append(t)
+            updates[t] = _update_entry(updates.get(t, dict(per_interval.get(t, {}))), fresh, r_start, now)
+
+    if updates:
+        # Baca ulang manifest: sesi lain mungkin sudah menulis ticker lain sementara kita fetch
+        with _lock:
+            manifest = load_manifest()
+            manifest.setdefault(interval, {}).update(updates)
+            save_manifest(manifest)
+    return stats
+
+# ==============================
+# 5. API UTAMA
+# ==============================
+
+def read(tickers, start=None, end=None, interval="1d", adjusted=False):
+    """
+    Baca data dari store saja (tanpa network).
+    `adjusted=True` menerapkan faktor dividen/split (hanya interval 1d).
+    """
+    frames = {}
+    for t in tickers:
+        df = load_ticker(t, interval)
+        if df.empty: continue
+        if adjusted and interval == "1d":
+            df = corporate_actions.apply(df, load_actions(t))
+        if start is not None:
+            df = df[df.index >= _align(start, df.index)]
+        if end is not None:
+            df = df[df.index < _align(end, df.index)]
+        if not df.empty: frames[t] = df
+    return frames
+
+def _align(ts, index):
+    ts = pd.Timestamp(ts)
+    tz = getattr(index, "tz", None)
+    if tz is not None and ts.tz is None: return ts.tz_localize(tz)
+    if tz is None and ts.tz is not None: return ts.tz_convert(None)
+    return ts
+
+def download(tickers, period=None, start=None, end=None, interval="1d", with_report=False, adjusted=False):
+    """
+    Pengganti yf.download(..., group_by='ticker', auto_adjust=False) yang membaca dari store lokal.
+    Dengan `with_report=True` return (panel, statistik sync).
+    `adjusted=True` -> harga disesuaikan dividen/split (untuk perhitungan return).
+    """
+    if isinstance(tickers, str): tickers = [tickers]
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers: return pd.DataFrame()
+    if start is None: start = period_to_start(period or "1mo")
+    start = pd.Timestamp(start).to_pydatetime()
+    stats = sync(tickers, start, interval)
+    frames = read(tickers, start, end, interval, adjusted)
+    if period in SESSION_PERIODS:
+        frames = {t: last_sessions(df, SESSION_PERIODS[period]) for t, df in frames.items()}
+    panel = to_panel(frames, tickers)
+    return (panel, stats) if with_report else panel
@@ -0,0 +1,208 @@
+"""
+Optimasi parameter strategi Simulator (sweep grid) di process pool.
+
+- Matriks harga Open/High/Low/Close (4 x tanggal x ticker) ditaruh SEKALI di
+  shared memory; worker hanya menempel (attach) lewat initializer, jadi panel
+  tidak di-pickle per tugas. Satu tugas = satu sel grid (kombinasi parameter).
+- `sweep()` adalah generator: setiap sel selesai langsung di-yield bersama
+  leaderboard sementara, supaya UI bisa menampilkan hasil bertahap.
+- Sel yang sudah selesai disimpan per sidik jari data di
+      data/ohlcv/sweeps/<fingerprint>.json
+  sehingga sweep ulang (grid diperlebar, data sama) hanya menghitung sel baru.
+
+Jumlah worker: env SWEEP_WORKERS (default jumlah CPU, maks 8). Kalau cuma 1
+worker atau sel sedikit, sweep dijalankan di proses yang sama.
+"""
+import os
+import json
+import hashlib
+import itertools
+import threading
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+import backtest
+import ohlcv_store
+
+# ==============================
+# 1. KONFIGURASI
+# ==============================
+
+SWEEP_DIR = os.path.join(ohlcv_store.STORE_DIR, "sweeps")
+WORKERS = int(os.environ.get("SWEEP_WORKERS", min(os.cpu_count() or 1, 8)))
+# Metode start process pool (None = default OS; "spawn"/"forkserver" kalau fork bermasalah)
+START_METHOD = os.environ.get("SWEEP_START_METHOD") or None
+MIN_PARALLEL_CELLS = 4
+FIELDS = ["Open", "High", "Low", "Close"]
+
+_lock = threading.Lock()
+
+# State worker: view ke shared memory (diisi initializer)
+_PX = None
+_SHM = None
+
+# ==============================
+# 2. GRID
+# ==============================
+
+def grid(strategy, stop_loss=(None,), max_hold=(None,), **ranges):
+    """
+    Semua kombinasi parameter, mis.
+        grid("ma_cross", fast=range(5, 55, 5), slow=range(20, 210, 10), stop_loss=[None, 0.05])
+    Kombinasi MA cepat >= MA lambat dibuang.
+    """
+    names = list(ranges)
+    cells = []
+    for combo in itertools.product(*[list(ranges[n]) for n in names], list(stop_loss), list(max_hold)):
+        params = {n: int(v) for n, v in zip(names, combo[:len(names)])}
+        if "fast" in params and "slow" in params and params["fast"] >= params["slow"]: continue
+        cells.append({"strategy": strategy, "params": params,
+                      "stop_loss": combo[-2] or None, "max_hold": combo[-1] or None})
+    return cells
+
+def cell_key(cell, settings):
+    return json.dumps([cell["strategy"], sorted(cell["params"].items()), cell["stop_loss"], cell["max_hold"],
+                       sorted(settings.items())], default=str)
+
+def label(cell):
+    parts = [f"{k}={v}" for k, v in cell["params"].items()]
+    if cell["stop_loss"]: parts.append(f"SL={cell['stop_loss'] * 100:g}%")
+    if cell["max_hold"]: parts.append(f"hold={cell['max_hold']}")
+    return f"{backtest.STRATEGIES.get(cell['strategy'], cell['strategy'])} " + ", ".join(parts)
+
+# ==============================
+# 3. CACHE SEL
+# ==============================
+
+def fingerprint(px):
+    """Sidik jari data: ticker, tanggal & isi harga. Data berubah -> cache sel baru."""
+    h = hashlib.sha1()
+    h.update("|".join(px["tickers"]).encode())
+    h.update(np.asarray(px["dates"].asi8).tobytes())
+    for f in FIELDS: h.update(np.ascontiguousarray(px[f]).tobytes())
+    return h.hexdigest()[:16]
+
+def _cache_path(fp):
+    return os.path.join(SWEEP_DIR, f"{fp}.json")
+
+def load_cells(fp):
+    path = _cache_path(fp)
+    if not os.path.exists(path): return {}
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except:
+        return {}
+
+def save_cells(fp, rows):
+    with _lock:
+        os.makedirs(SWEEP_DIR, exist_ok=True)
+        merged = load_cells(fp)
+        merged.update(rows)
+        tmp = f"{_cache_path(fp)}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(merged, f)
+        os.replace(tmp, _cache_path(fp))
+
+# ==============================
+# 4. WORKER
+# ==============================
+
+def _attach(name, shape, dates, tickers):
+    """Initializer worker: tempel ke shared memory, bangun dict px tanpa menyalin data."""
+    global _PX, _SHM
+    _SHM = shared_memory.SharedMemory(name=name)
+    cube = np.ndarray(shape, dtype="float64", buffer=_SHM.buf)
+    _PX = {f: cube[i] for i, f in enumerate(FIELDS)}
+    _PX["dates"], _PX["tickers"] = pd.DatetimeIndex(dates), list(tickers)
+
+def _score(summary):
+    """Ringkasan satu sel lintas universe."""
+    if summary.empty:
+        return {"Ticker": 0, "Rata2 Return (%)": None, "Median Return (%)": None, "Total P&L (Rp)": 0.0,
+                "Win Rate (%)": None, "Rata2 Max DD (%)": None, "Trades": 0, "Ticker Profit (%)": None}
+    trades = summary["Trades"].sum()
+    wins = (summary["Win Rate (%)"].fillna(0) * summary["Trades"]).sum() / 100
+    return {
+        "Ticker": int(len(summary)),
+        "Rata2 Return (%)": float(summary["Return (%)"].mean()),
+        "Median Return (%)": float(summary["Return (%)"].median()),
+        "Total P&L (Rp)": float(summary["Net P&L (Rp)"].sum()),
+        "Win Rate (%)": float(wins / trades * 100) if trades else None,
+        "Rata2 Max DD (%)": float(summary["Max Drawdown (%)"].mean()),
+        "Trades": int(trades),
+        "Ticker Profit (%)": float((summary["Net P&L (Rp)"] > 0).mean() * 100),
+    }
+
+def _run_cell(cell, settings, px=None):
+    px = _PX if px is None else px
+    want = backtest.signals(px, cell["strategy"], **cell["params"])
+    res = backtest.run(px, want, stop_loss=cell["stop_loss"], max_hold=cell["max_hold"],
+                       enter_first=(cell["strategy"] == "buy_hold"), **settings)
+    return _score(res["summary"])
+
+# ==============================
+# 5. SWEEP
+# ==============================
+
+def leaderboard(rows, sort_by="Rata2 Return (%)", top=20):
+    """rows: {key: row} -> DataFrame terurut, `top` teratas."""
+    if not rows: return pd.DataFrame()
+    df = pd.DataFrame(list(rows.values()))
+    return df.sort_values(sort_by, ascending=False, na_position="last").head(top).reset_index(drop=True)
+
+def sweep(panel, tickers, cells, lots=1, fee_buy=backtest.FEE_BUY, fee_sell=backtest.FEE_SELL,
+          workers=None, sort_by="Rata2 Return (%)", top=20):
+    """
+    Generator: yield (selesai, total, leaderboard) setiap kali satu sel selesai
+    (sel dari cache di-yield sekali di awal).
+    """
+    tickers = list(tickers)
+    px = backtest.prices(panel, tickers)
+    fp = fingerprint(px)
+    settings = {"lots": int(lots), "fee_buy": float(fee_buy), "fee_sell": float(fee_sell)}
+    cached = load_cells(fp)
+
+    rows, todo = {}, []
+    for cell in cells:
+        key = cell_key(cell, settings)
+        if key in cached: rows[key] = cached[key]
+        else: todo.append((key, cell))
+    total = len(cells)
+    yield len(rows), total, leaderboard(rows, sort_by, top)
+    if not todo: return
+
+    def finish(key, cell, score):
+        rows[key] = dict({"Strategi": label(cell)}, **score)
+        save_cells(fp, {key: rows[key]})
+        return len(rows), total, leaderboard(rows, sort_by, top)
+
+    workers = WORKERS if workers is None else workers
+    if workers <= 1 or len(todo) < MIN_PARALLEL_CELLS:
+        for key, cell in todo:
+            yield finish(key, cell, _run_cell(cell, settings, px))
+        return
+
+    cube = np.stack([px[f] for f in FIELDS])
+    shm = shared_memory.SharedMemory(create=True, size=cube.nbytes)
+    try:
+        np.ndarray(cube.shape, dtype="float64", buffer=shm.buf)[:] = cube
+        pool = ProcessPoolExecutor(max_workers=min(workers, len(todo)), mp_context=mp.get_context(START_METHOD),
+                                   initializer=_attach, initargs=(shm.name, cube.shape, px["dates"].asi8, tickers))
+        try:
+            futures = {pool.submit(_run_cell, cell, settings): (key, cell) for key, cell in todo}
+            for fut in as_completed(futures):
+                key, cell = futures[fut]
+                try: score = fut.result()
+                except: continue
+                yield finish(key, cell, score)
+        finally:
+            # Generator bisa ditinggal di tengah jalan (rerun UI): batalkan sel yang belum jalan
+            pool.shutdown(wait=True, cancel_futures=True)
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,191 @@
+"""
+Portofolio watchlist: posisi (lot & harga rata-rata), P&L realized/unrealized,
+bobot alokasi dan kurva ekuitas harian.
+
+- Ledger transaksi (beli/jual) disimpan di stock_database.json. Posisi
+  diturunkan dengan metode harga rata-rata (fee beli masuk ke modal, fee jual
+  mengurangi hasil jual); hasil replay di-memo per sidik jari ledger.
+- `mark()` menilai semua posisi sekaligus dari harga snapshot terbaru
+  (operasi array, tanpa download histori).
+- Kurva ekuitas disimpan bersama ledger. Histori hanya dibangun ulang dari
+  store lokal kalau ledger berubah; setelah itu setiap rerun cukup menimpa
+  titik hari ini. Di hari bursa baru, sesi yang terlewat sejak titik terakhir
+  diisi dulu dari close harian store, baru titik hari ini ditambahkan.
+"""
+import json
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+
+import backtest
+import market_clock
+import weekly_recap
+
+LOT_SIZE = backtest.LOT_SIZE
+FEE_BUY = backtest.FEE_BUY
+FEE_SELL = backtest.FEE_SELL
+ACTIONS = ["Beli", "Jual"]
+
+_lock = threading.Lock()
+_memo = {}
+
+# ==============================
+# 1. LEDGER & POSISI
+# ==============================
+
+def transaction(ticker, action, lots, price, date, fee=None):
+    """Satu baris ledger (dict biasa supaya bisa langsung di-json)."""
+    if fee is None: fee = FEE_BUY if action == "Beli" else FEE_SELL
+    return {"ticker": ticker, "action": action, "lots": int(lots), "price": float(price),
+            "date": pd.Timestamp(date).strftime("%Y-%m-%d"), "fee": float(fee)}
+
+def fingerprint(txns):
+    return hashlib.sha1(json.dumps(txns, sort_keys=True).encode()).hexdigest()[:16]
+
+def _replay(txns):
+    """Jalankan ledger urut tanggal; return (posisi akhir, jejak per transaksi)."""
+    book, trail = {}, []
+    for tx in sorted(txns, key=lambda x: x["date"]):
+        p = book.setdefault(tx["ticker"], {"shares": 0, "cost": 0.0, "realized": 0.0})
+        shares = tx["lots"] * LOT_SIZE
+        if tx["action"] == "Beli":
+            p["shares"] += shares
+            p["cost"] += shares * tx["price"] * (1 + tx["fee"])
+        else:
+            # Jual melebihi kepemilikan dipotong ke jumlah yang ada
+            shares = min(shares, p["shares"])
+            if not shares: continue
+            avg = p["cost"] / p["shares"]
+            p["realized"] += shares * (tx["price"] * (1 - tx["fee"]) - avg)
+            p["cost"] -= shares * avg
+            p["shares"] -= shares
+        trail.append((tx["date"], tx["ticker"], p["shares"], p["cost"], p["realized"]))
+    return book, trail
+
+def positions(txns):
+    """DataFrame index Ticker: Lot, Harga Rata2, Modal (Rp), Realized (Rp) (termasuk posisi yang sudah ditutup)."""
+    fp = fingerprint(txns)
+    with _lock:
+        if fp not in _memo:
+            book, _ = _replay(txns)
+            df = pd.DataFrame.from_dict(book, orient="index", columns=["shares", "cost", "realized"])
+            df.index.name = "Ticker"
+            out = pd.DataFrame({"Lot": df["shares"] // LOT_SIZE, "Modal (Rp)": df["cost"], "Realized (Rp)": df["realized"]})
+            with np.errstate(invalid="ignore", divide="ignore"):
+                out.insert(1, "Harga Rata2", np.where(df["shares"] > 0, df["cost"] / df["shares"], np.nan))
+            _memo.clear()
+            _memo[fp] = out
+        return _memo[fp].copy()
+
+# ==============================
+# 2. MARK-TO-MARKET
+# ==============================
+
+def mark(pos, prices):
+    """
+    pos    : hasil positions()
+    prices : {ticker: harga terakhir} / Series
+    Tambah kolom Harga, Nilai (Rp), Unrealized (Rp), Unrealized (%), Bobot (%).
+    """
+    out = pos.copy()
+    px = pd.Series(prices, dtype="float64").reindex(out.index).to_numpy()
+    shares = out["Lot"].to_numpy(dtype="float64") * LOT_SIZE
+    cost = out["Modal (Rp)"].to_numpy(dtype="float64")
+    value = np.where(shares > 0, shares * px, 0.0)
+    total = np.nansum(value)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out["Harga"] = px
+        out["Nilai (Rp)"] = value
+        out["Unrealized (Rp)"] = np.where(shares > 0, value - cost, 0.0)
+        out["Unrealized (%)"] = np.where(cost > 0, (value - cost) / cost * 100, np.nan)
+        out["Bobot (%)"] = value / total * 100 if total > 0 else np.nan
+    return out
+
+def totals(marked):
+    return {
+        "Nilai (Rp)": float(np.nansum(marked["Nilai (Rp)"])),
+        "Modal (Rp)": float(marked["Modal (Rp)"].sum()),
+        "Unrealized (Rp)": float(np.nansum(marked["Unrealized (Rp)"])),
+        "Realized (Rp)": float(marked["Realized (Rp)"].sum()),
+    }
+
+# ==============================
+# 3. KURVA EKUITAS
+# ==============================
+
+def curve(txns, panel):
+    """
+    Kurva ekuitas harian dari panel harga (store lokal), dibangun dalam satu pass:
+    DataFrame index tanggal dengan kolom Nilai Pasar, Modal, P&L.
+    """
+    _, trail = _replay(txns)
+    if not trail or panel is None or panel.empty: return pd.DataFrame(columns=["Nilai Pasar", "Modal", "P&L"])
+    tickers = list(dict.fromkeys(t for _, t, *_ in trail))
+    col = {t: i for i, t in enumerate(tickers)}
+    dates = pd.DatetimeIndex(panel.index)
+    if dates.tz is not None: dates = dates.tz_localize(None)
+    dates = dates.normalize()
+    close = pd.DataFrame(weekly_recap.to_matrix(panel, tickers, "Close")).ffill().to_numpy()
+    # Posisi setelah transaksi terakhir di setiap hari, lalu diteruskan (ffill) ke hari berikutnya
+    shares, cost, realized = (np.full(close.shape, np.nan) for _ in range(3))
+    rows = dates.searchsorted(pd.DatetimeIndex([d for d, *_ in trail]))
+    for r, (_, t, s, c, rl) in zip(rows, trail):
+        if r >= len(dates): continue
+        shares[r, col[t]], cost[r, col[t]], realized[r, col[t]] = s, c, rl
+    shares, cost, realized = (np.nan_to_num(pd.DataFrame(m).ffill().to_numpy()) for m in (shares, cost, realized))
+    value = np.nansum(shares * close, axis=1)
+    out = pd.DataFrame({"Nilai Pasar": value, "Modal": cost.sum(axis=1)}, index=dates)
+    out["P&L"] = out["Nilai Pasar"] - out["Modal"] + realized.sum(axis=1)
+    return out[out.index >= pd.Timestamp(min(d for d, *_ in trail))]
+
+def session_date(now=None):
+    """Tanggal bursa snapshot: hari ini saat sesi, selain itu sesi terakhir yang selesai."""
+    now = now or market_clock.now_jkt()
+    day = now.date() if market_clock.is_market_open(now) else market_clock.last_session_end(now).date()
+    return day.strftime("%Y-%m-%d")
+
+def refresh_curve(saved, txns, marked, load_panel, now=None):
+    """
+    saved      : {"fp": ..., "points": [[tanggal, nilai, modal, pnl], ...]} dari stock_database.json (boleh None)
+    marked     : hasil mark() dengan harga snapshot terbaru
+    load_panel : fungsi(tickers, start) -> panel; dipanggil kalau ledger berubah atau ada sesi baru
+    Return (saved_baru, berubah).
+    """
+    fp = fingerprint(txns)
+    changed = False
+    if not saved or saved.get("fp") != fp:
+        points = []
+        if txns:
+            tickers = list(dict.fromkeys(tx["ticker"] for tx in txns))
+            hist = curve(txns, load_panel(tickers, min(tx["date"] for tx in txns)))
+            points = [[d.strftime("%Y-%m-%d"), *map(float, row)] for d, row in zip(hist.index, hist.to_numpy())]
+        saved, changed = {"fp": fp, "points": points}, True
+    if not txns: return saved, changed
+    tot = totals(marked)
+    point = [session_date(now), tot["Nilai (Rp)"], tot["Modal (Rp)"], tot["Unrealized (Rp)"] + tot["Realized (Rp)"]]
+    points = saved["points"]
+    if points and points[-1][0] == point[0]:
+        if points[-1] != point: points[-1], changed = point, True
+    elif not points or points[-1][0] < point[0]:
+        if points: _backfill(points, txns, load_panel, point[0])
+        points.append(point)
+        changed = True
+    return saved, changed
+
+def _backfill(points, txns, load_panel, until):
+    """Isi sesi yang terlewat (app tidak dibuka) dari close harian store, sekali per sesi baru."""
+    last = points[-1][0]
+    tickers = list(dict.fromkeys(tx["ticker"] for tx in txns))
+    # Mulai dari tanggal titik terakhir supaya close hari pertama ada untuk ffill
+    try: hist = curve(txns, load_panel(tickers, last))
+    except: return
+    for d, row in zip(hist.index, hist.to_numpy()):
+        day = d.strftime("%Y-%m-%d")
+        if last < day < until: points.append([day, *map(float, row)])
+
+def curve_frame(saved):
+    if not saved or not saved.get("points"): return pd.DataFrame(columns=["Nilai Pasar", "Modal", "P&L"])
+    df = pd.DataFrame(saved["points"], columns=["Tanggal", "Nilai Pasar", "Modal", "P&L"])
+    return df.set_index(pd.to_datetime(df.pop("Tanggal")))
@@ -0,0 +1,134 @@
+"""
+Leaderboard top-N / bottom-N (gainer, loser, paling aktif, dst.) tanpa
+mengurutkan seluruh universe.
+
+- `select()` memilih n teratas lewat `np.argpartition` (O(N)), lalu hanya n
+  nilai itu yang diurutkan.
+- `Ranker` menyimpan nilai semua metrik per ticker plus BUFFER kandidat
+  (n x SLACK teratas) untuk setiap (metrik, arah). Snapshot baru (boleh
+  sebagian, cukup ticker yang berubah) hanya menggabungkan ticker yang
+  berubah dengan buffer. Ticker di luar buffer yang nilainya tidak berubah
+  dijamin tidak lebih baik dari ambang buffer, jadi hasilnya tetap tepat;
+  scan penuh (argpartition) baru terjadi kalau buffer kehabisan kandidat.
+
+Contoh:
+    rk = board("ihsg")
+    rk.update(snapshot)              # DataFrame index Ticker, kolom metrik
+    rk.top("Chg (%)", 5)             # gainer
+    rk.bottom("Chg (%)", 5)          # loser
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_N = 10
+SLACK = 3  # ukuran buffer = n x SLACK; makin besar makin jarang scan penuh
+METRICS = ["Chg (%)", "Nilai (M)", "Vol Ratio", "Dari High 52W (%)"]
+
+_lock = threading.Lock()
+_boards = {}
+
+# ==============================
+# 1. SELEKSI PARSIAL
+# ==============================
+
+def _keys(values, largest):
+    return -values if largest else values
+
+def select(values, n, largest=True):
+    """Posisi n nilai terbesar (atau terkecil) secara terurut; NaN diabaikan."""
+    values = np.asarray(values, dtype="float64")
+    idx = np.nonzero(~np.isnan(values))[0]
+    key = _keys(values[idx], largest)
+    if len(idx) > n:
+        part = np.argpartition(key, n - 1)[:n]
+        idx, key = idx[part], key[part]
+    return idx[np.argsort(key, kind="stable")]
+
+# ==============================
+# 2. RANKER INKREMENTAL
+# ==============================
+
+class Ranker:
+    def __init__(self, metrics=METRICS, n=DEFAULT_N, slack=SLACK):
+        self.metrics = list(metrics)
+        self.n = n
+        self.size = n * slack
+        self.tickers, self.pos = [], {}
+        self.values = np.empty((0, len(self.metrics)))
+        self.buffers, self.cutoffs = {}, {}
+        self.rebuilds = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def _rebuild(self, j, largest):
+        col = self.values[:, j]
+        buf = select(col, self.size, largest)
+        self.buffers[(j, largest)] = buf
+        # Buffer belum penuh = semua ticker valid sudah masuk, ambang tak terbatas
+        self.cutoffs[(j, largest)] = _keys(col[buf[-1]], largest) if len(buf) == self.size else np.inf
+        self.rebuilds += 1
+
+    def _merge(self, j, largest, moved):
+        if (j, largest) not in self.buffers: return self._rebuild(j, largest)
+        col = self.values[:, j]
+        cutoff = self.cutoffs[(j, largest)]
+        cand = np.union1d(self.buffers[(j, largest)], moved)
+        key = _keys(col[cand], largest)
+        # Hanya kandidat di dalam ambang yang pasti mengalahkan ticker di luar buffer
+        cand = cand[key <= cutoff]
+        if len(cand) < self.n: return self._rebuild(j, largest)
+        buf = cand[select(col[cand], self.size, largest)]
+        self.buffers[(j, largest)] = buf
+        if len(cand) > len(buf): self.cutoffs[(j, largest)] = _keys(col[buf[-1]], largest)
+
+    def update(self, snapshot):
+        """
+        snapshot: DataFrame index Ticker dengan kolom metrik (boleh hanya ticker yang berubah).
+        Return jumlah ticker yang nilainya berubah.
+        """
+        tickers = list(snapshot.index)
+        new = snapshot.reindex(columns=self.metrics).to_numpy(dtype="float64")
+        with self._lock:
+            fresh = [t for t in dict.fromkeys(tickers) if t not in self.pos]
+            if fresh:
+                self.pos.update({t: len(self.tickers) + i for i, t in enumerate(fresh)})
+                self.tickers += fresh
+                self.values = np.vstack([self.values, np.full((len(fresh), len(self.metrics)), np.nan)])
+            rows = np.fromiter((self.pos[t] for t in tickers), dtype=int, count=len(tickers))
+            old = self.values[rows]
+            diff = ~((old == new) | (np.isnan(old) & np.isnan(new)))
+            hit = diff.any(axis=1)
+            rows, new, diff = rows[hit], new[hit], diff[hit]
+            if not len(rows): return 0
+            self.values[rows] = new
+            for j in range(len(self.metrics)):
+                moved = rows[diff[:, j]]
+                if not len(moved): continue
+                for largest in (True, False): self._merge(j, largest, moved)
+            return len(rows)
+
+    def _frame(self, metric, largest, n):
+        n = n or self.n
+        j = self.metrics.index(metric)
+        with self._lock:
+            if n > self.size: idx = select(self.values[:, j], n, largest)
+            else: idx = self.buffers.get((j, largest), np.array([], dtype=int))[:n]
+            out = pd.DataFrame(self.values[idx], columns=self.metrics,
+                               index=pd.Index([self.tickers[i] for i in idx], name="Ticker"))
+        return out.reset_index()
+
+    def top(self, metric, n=None):
+        return self._frame(metric, True, n)
+
+    def bottom(self, metric, n=None):
+        return self._frame(metric, False, n)
+
+def board(name, metrics=METRICS, n=DEFAULT_N):
+    """Ranker bersama per nama (bertahan antar rerun Streamlit dalam satu proses)."""
+    with _lock:
+        if name not in _boards: _boards[name] = Ranker(metrics, n)
+        return _boards[name]
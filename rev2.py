@@ -1,5 +1,4 @@
 import streamlit as st
-import yfinance as yf
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
@@ -8,22 +7,25 @@ import math
 import json
 import os
 import pytz 
+import ohlcv_store
+import weekly_recap
+import winloss_stats
+import market_clock
+import cache_warmer
+from universe import IHSG_TICKERS
 
 # --- 1. KONFIGURASI HALAMAN & WAKTU ---
 st.set_page_config(layout="wide", page_title="Super Stock Dashboard Pro")
 
 # Definisi Waktu Global (Mencegah NameError)
 today = datetime.now()
-end_date_str = (today + timedelta(days=1)).strftime("%Y-%m-%d")
 start_of_week = today - timedelta(days=today.weekday())
 days_names = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
 
 DB_FILE = "stock_database.json"
 
 # --- 2. DATA STATIC (LIST SAHAM IHSG) ---
-LIST_SAHAM_IHSG = [
-    "AALI.JK","ABBA.JK","ABDA.JK","ABMM.JK","ACES.JK","ACST.JK","ADES.JK","ADHI.JK","ADMF.JK","ADMG.JK","ADRO.JK","AGII.JK","AGRO.JK","AGRS.JK","AHAP.JK","AIMS.JK","AISA.JK","AKKU.JK","AKPI.JK","AKRA.JK","AKSI.JK","ALDO.JK","ALKA.JK","ALMI.JK","ALTO.JK","AMAG.JK","AMFG.JK","AMIN.JK","AMRT.JK","ANJT.JK","ANTM.JK","APEX.JK","APIC.JK","APII.JK","APLI.JK","APLN.JK","ARGO.JK","ARII.JK","ARNA.JK","ARTA.JK","ARTI.JK","ARTO.JK","ASBI.JK","ASDM.JK","ASGR.JK","ASII.JK","ASJT.JK","ASMI.JK","ASRI.JK","ASRM.JK","ASSA.JK","ATIC.JK","AUTO.JK","BABP.JK","BACA.JK","BAJA.JK","BALI.JK","BAPA.JK","BATA.JK","BAYU.JK","BBCA.JK","BBHI.JK","BBKP.JK","BBLD.JK","BBMD.JK","BBNI.JK","BBRI.JK","BBRM.JK","BBTN.JK","BBYB.JK","BCAP.JK","BCIC.JK","BCIP.JK","BDMN.JK","BEKS.JK","BEST.JK","BFIN.JK","BGTG.JK","BHIT.JK","BIKA.JK","BIMA.JK","BINA.JK","BIPI.JK","BIPP.JK","BIRD.JK","BISI.JK","BJBR.JK","BJTM.JK","BKDP.JK","BKSL.JK","BKSW.JK","BLTA.JK","BLTZ.JK","BMAS.JK","BMRI.JK","BMSR.JK","BMTR.JK","BNBA.JK","BNBR.JK","BNGA.JK","BNII.JK","BNLI.JK","BOLT.JK","BPFI.JK","BPII.JK","BRAM.JK","BRMS.JK","BRNA.JK","BRPT.JK","BSDE.JK","BSIM.JK","BSSR.JK","BSWD.JK","BTEK.JK","BTEL.JK","BTON.JK","BTPN.JK","BUDI.JK","BUKK.JK","BULL.JK","BUMI.JK","BUVA.JK","BVIC.JK","BWPT.JK","BYAN.JK","CANI.JK","CASS.JK","CEKA.JK","CENT.JK","CFIN.JK","CINT.JK","CITA.JK","CLPI.JK","CMNP.JK","CMPP.JK","CNKO.JK","CNTX.JK","COWL.JK","CPIN.JK","CPRO.JK","CSAP.JK","CTBN.JK","CTRA.JK","CTTH.JK","DART.JK","DEFI.JK","DEWA.JK","DGIK.JK","DILD.JK","DKFT.JK","DLTA.JK","DMAS.JK","DNAR.JK","DNET.JK","DOID.JK","DPNS.JK","DSFI.JK","DSNG.JK","DSSA.JK","DUTI.JK","DVLA.JK","DYAN.JK","ECII.JK","EKAD.JK","ELSA.JK","ELTY.JK","EMDE.JK","EMTK.JK","ENRG.JK","EPMT.JK","ERAA.JK","ERTX.JK","ESSA.JK","ESTI.JK","ETWA.JK","EXCL.JK","FAST.JK","FASW.JK","FISH.JK","FMII.JK","FORU.JK","FPNI.JK","GAMA.JK","GDST.JK","GDYR.JK","GEMA.JK","GEMS.JK","GGRM.JK","GIAA.JK","GJTL.JK","GLOB.JK","GMTD.JK","GOLD.JK","GOLL.JK","GPRA.JK","GSMF.JK","GTBO.JK","GWSA.JK","GZCO.JK","HADE.JK","HDFA.JK","HERO.JK","HEXA.JK","HITS.JK","HMSP.JK","HOME.JK","HOTL.JK","HRUM.JK","IATA.JK","IBFN.JK","IBST.JK","ICBP.JK","ICON.JK","IGAR.JK","IIKP.JK","IKAI.JK","IKBI.JK","IMAS.JK","IMJS.JK","IMPC.JK","INAF.JK","INAI.JK","INCI.JK","INCO.JK","INDF.JK","INDR.JK","INDS.JK","INDX.JK","INDY.JK","INKP.JK","INPC.JK","INPP.JK","INRU.JK","INTA.JK","INTD.JK","INTP.JK","IPOL.JK","ISAT.JK","ISSP.JK","ITMA.JK","ITMG.JK","JAWA.JK","JECC.JK","JIHD.JK","JKON.JK","JPFA.JK","JRPT.JK","JSMR.JK","JSPT.JK","JTPE.JK","KAEF.JK","KARW.JK","KBLI.JK","KBLM.JK","KBLV.JK","KBRI.JK","KDSI.JK","KIAS.JK","KICI.JK","KIJA.JK","KKGI.JK","KLBF.JK","KOBX.JK","KOIN.JK","KONI.JK","KOPI.JK","KPIG.JK","KRAS.JK","KREN.JK","LAPD.JK","LCGP.JK","LEAD.JK","LINK.JK","LION.JK","LMAS.JK","LMPI.JK","LMSH.JK","LPCK.JK","LPGI.JK","LPIN.JK","LPKR.JK","LPLI.JK","LPPF.JK","LPPS.JK","LRNA.JK","LSIP.JK","LTLS.JK","MAGP.JK","MAIN.JK","MAPI.JK","MAYA.JK","MBAP.JK","MBSS.JK","MBTO.JK","MCOR.JK","MDIA.JK","MDKA.JK","MDLN.JK","MDRN.JK","MEDC.JK","MEGA.JK","MERK.JK","META.JK","MFMI.JK","MGNA.JK","MICE.JK","MIDI.JK","MIKA.JK","MIRA.JK","MITI.JK","MKPI.JK","MLBI.JK","MLIA.JK","MLPL.JK","MLPT.JK","MMLP.JK","MNCN.JK","MPMX.JK","MPPA.JK","MRAT.JK","MREI.JK","MSKY.JK","MTDL.JK","MTFN.JK","MTLA.JK","MTSM.JK","MYOH.JK","MYOR.JK","MYTX.JK","NELY.JK","NIKL.JK","NIRO.JK","NISP.JK","NOBU.JK","NRCA.JK","OCAP.JK","OKAS.JK","OMRE.JK","PADI.JK","PALM.JK","PANR.JK","PANS.JK","PBRX.JK","PDES.JK","PEGE.JK","PGAS.JK","PGLI.JK","PICO.JK","PJAA.JK","PKPK.JK","PLAS.JK","PLIN.JK","PNBN.JK","PNBS.JK","PNIN.JK","PNLF.JK","PNSE.JK","POLY.JK","POOL.JK","PPRO.JK","PSAB.JK","PSDN.JK","PSKT.JK","PTBA.JK","PTIS.JK","PTPP.JK","PTRO.JK","PTSN.JK","PTSP.JK","PUDP.JK","PWON.JK","PYFA.JK","RAJA.JK","RALS.JK","RANC.JK","RBMS.JK","RDTX.JK","RELI.JK","RICY.JK","RIGS.JK","RIMO.JK","RODA.JK","ROTI.JK","RUIS.JK","SAFE.JK","SAME.JK","SCCO.JK","SCMA.JK","SCPI.JK","SDMU.JK","SDPC.JK","SDRA.JK","SGRO.JK","SHID.JK","SIDO.JK","SILO.JK","SIMA.JK","SIMP.JK","SIPD.JK","SKBM.JK","SKLT.JK","SKYB.JK","SMAR.JK","SMBR.JK","SMCB.JK","SMDM.JK","SMDR.JK","SMGR.JK","SMMA.JK","SMMT.JK","SMRA.JK","SMRU.JK","SMSM.JK","SOCI.JK","SONA.JK","SPMA.JK","SQMI.JK","SRAJ.JK","SRIL.JK","SRSN.JK","SRTG.JK","SSIA.JK","SSMS.JK","SSTM.JK","STAR.JK","STTP.JK","SUGI.JK","SULI.JK","SUPR.JK","TALF.JK","TARA.JK","TAXI.JK","TBIG.JK","TBLA.JK","TBMS.JK","TCID.JK","TELE.JK","TFCO.JK","TGKA.JK","TIFA.JK","TINS.JK","TIRA.JK","TIRT.JK","TKIM.JK","TLKM.JK","TMAS.JK","TMPO.JK","TOBA.JK","TOTL.JK","TOTO.JK","TOWR.JK","TPIA.JK","TPMA.JK","TRAM.JK","TRIL.JK","TRIM.JK","TRIO.JK","TRIS.JK","TRST.JK","TRUS.JK","TSPC.JK","ULTJ.JK","UNIC.JK","UNIT.JK","UNSP.JK","UNTR.JK","UNVR.JK","VICO.JK","VINS.JK","VIVA.JK","VOKS.JK","VRNA.JK","WAPO.JK","WEHA.JK","WICO.JK","WIIM.JK","WIKA.JK","WINS.JK","WOMF.JK","WSKT.JK","WTON.JK","YPAS.JK","YULE.JK","ZBRA.JK","SHIP.JK","CASA.JK","DAYA.JK","DPUM.JK","IDPR.JK","JGLE.JK","KINO.JK","MARI.JK","MKNT.JK","MTRA.JK","OASA.JK","POWR.JK","INCF.JK","WSBP.JK","PBSA.JK","PRDA.JK","BOGA.JK","BRIS.JK","PORT.JK","CARS.JK","MINA.JK","CLEO.JK","TAMU.JK","CSIS.JK","TGRA.JK","FIRE.JK","TOPS.JK","KMTR.JK","ARMY.JK","MAPB.JK","WOOD.JK","HRTA.JK","MABA.JK","HOKI.JK","MPOW.JK","MARK.JK","NASA.JK","MDKI.JK","BELL.JK","KIOS.JK","GMFI.JK","MTWI.JK","ZINC.JK","MCAS.JK","PPRE.JK","WEGE.JK","PSSI.JK","MORA.JK","DWGL.JK","PBID.JK","JMAS.JK","CAMP.JK","IPCM.JK","PCAR.JK","LCKM.JK","BOSS.JK","HELI.JK","JSKY.JK","INPS.JK","GHON.JK","TDPM.JK","DFAM.JK","NICK.JK","BTPS.JK","SPTO.JK","PRIM.JK","HEAL.JK","TRUK.JK","PZZA.JK","TUGU.JK","MSIN.JK","SWAT.JK","TNCA.JK","MAPA.JK","TCPI.JK","IPCC.JK","RISE.JK","BPTR.JK","POLL.JK","NFCX.JK","MGRO.JK","NUSA.JK","FILM.JK","ANDI.JK","LAND.JK","MOLI.JK","PANI.JK","DIGI.JK","CITY.JK","SAPX.JK","SURE.JK","HKMU.JK","MPRO.JK","DUCK.JK","GOOD.JK","SKRN.JK","YELO.JK","CAKK.JK","SATU.JK","SOSS.JK","DEAL.JK","POLA.JK","DIVA.JK","LUCK.JK","URBN.JK","SOTS.JK","ZONE.JK","PEHA.JK","FOOD.JK","BEEF.JK","POLI.JK","CLAY.JK","NATO.JK","JAYA.JK","COCO.JK","MTPS.JK","CPRI.JK","HRME.JK","POSA.JK","JAST.JK","FITT.JK","BOLA.JK","CCSI.JK","SFAN.JK","POLU.JK","KJEN.JK","KAYU.JK","ITIC.JK","PAMG.JK","IPTV.JK","BLUE.JK","ENVY.JK","EAST.JK","LIFE.JK","FUJI.JK","KOTA.JK","INOV.JK","ARKA.JK","SMKL.JK","HDIT.JK","KEEN.JK","BAPI.JK","TFAS.JK","GGRP.JK","OPMS.JK","NZIA.JK","SLIS.JK","PURE.JK","IRRA.JK","DMMX.JK","SINI.JK","WOWS.JK","ESIP.JK","TEBE.JK","KEJU.JK","PSGO.JK","AGAR.JK","IFSH.JK","REAL.JK","IFII.JK","PMJS.JK","UCID.JK","GLVA.JK","PGJO.JK","AMAR.JK","CSRA.JK","INDO.JK","AMOR.JK","TRIN.JK","DMND.JK","PURA.JK","PTPW.JK","TAMA.JK","IKAN.JK","SAMF.JK","SBAT.JK","KBAG.JK","CBMF.JK","RONY.JK","CSMI.JK","BBSS.JK","BHAT.JK","CASH.JK","TECH.JK","EPAC.JK","UANG.JK","PGUN.JK","SOFA.JK","PPGL.JK","TOYS.JK","SGER.JK","TRJA.JK","PNGO.JK","SCNP.JK","BBSI.JK","KMDS.JK","PURI.JK","SOHO.JK","HOMI.JK","ROCK.JK","ENZO.JK","PLAN.JK","PTDU.JK","ATAP.JK","VICI.JK","PMMP.JK","BANK.JK","WMUU.JK","EDGE.JK","UNIQ.JK","BEBS.JK","SNLK.JK","ZYRX.JK","LFLO.JK","FIMP.JK","TAPG.JK","NPGF.JK","LUCY.JK","ADCP.JK","HOPE.JK","MGLV.JK","TRUE.JK","LABA.JK","ARCI.JK","IPAC.JK","MASB.JK","BMHS.JK","FLMC.JK","NICL.JK","UVCR.JK","BUKA.JK","HAIS.JK","OILS.JK","GPSO.JK","MCOL.JK","RSGK.JK","RUNS.JK","SBMA.JK","CMNT.JK","GTSI.JK","IDEA.JK","KUAS.JK","BOBA.JK","MTEL.JK","DEPO.JK","BINO.JK","CMRY.JK","WGSH.JK","TAYS.JK","WMPP.JK","RMKE.JK","OBMD.JK","AVIA.JK","IPPE.JK","NASI.JK","BSML.JK","DRMA.JK","ADMR.JK","SEMA.JK","ASLC.JK","NETV.JK","BAUT.JK","ENAK.JK","NTBK.JK","SMKM.JK","STAA.JK","NANO.JK","BIKE.JK","WIRG.JK","SICO.JK","GOTO.JK","TLDN.JK","MTMH.JK","WINR.JK","IBOS.JK","OLIV.JK","ASHA.JK","SWID.JK","TRGU.JK","ARKO.JK","CHEM.JK","DEWI.JK","AXIO.JK","KRYA.JK","HATM.JK","RCCC.JK","GULA.JK","JARR.JK","AMMS.JK","RAFI.JK","KKES.JK","ELPI.JK","EURO.JK","KLIN.JK","TOOL.JK","BUAH.JK","CRAB.JK","MEDS.JK","COAL.JK","PRAY.JK","CBUT.JK","BELI.JK","MKTR.JK","OMED.JK","BSBK.JK","PDPP.JK","KDTN.JK","ZATA.JK","NINE.JK","MMIX.JK","PADA.JK","ISAP.JK","VTNY.JK","SOUL.JK","ELIT.JK","BEER.JK","CBPE.JK","SUNI.JK","CBRE.JK","WINE.JK","BMBL.JK","PEVE.JK","LAJU.JK","FWCT.JK","NAYZ.JK","IRSX.JK","PACK.JK","VAST.JK","CHIP.JK","HALO.JK","KING.JK","PGEO.JK","FUTR.JK","HILL.JK","BDKR.JK","PTMP.JK","SAGE.JK","TRON.JK","CUAN.JK","NSSS.JK","GTRA.JK","HAJJ.JK","JATI.JK","TYRE.JK","MPXL.JK","SMIL.JK","KLAS.JK","MAXI.JK","VKTR.JK","RELF.JK","AMMN.JK","CRSN.JK","GRPM.JK","WIDI.JK","TGUK.JK","INET.JK","MAHA.JK","RMKO.JK","CNMA.JK","FOLK.JK","HBAT.JK","GRIA.JK","PPRI.JK","ERAL.JK","CYBR.JK","MUTU.JK","LMAX.JK","HUMI.JK","MSIE.JK","RSCH.JK","BABY.JK","AEGS.JK","IOTF.JK","KOCI.JK","PTPS.JK","BREN.JK","STRK.JK","KOKA.JK","LOPI.JK","UDNG.JK","RGAS.JK","MSTI.JK","IKPM.JK","AYAM.JK","SURI.JK","ASLI.JK","GRPH.JK","SMGA.JK","UNTD.JK","TOSK.JK","MPIX.JK","ALII.JK","MKAP.JK","MEJA.JK","LIVE.JK","HYGN.JK","BAIK.JK","VISI.JK","AREA.JK","MHKI.JK","ATLA.JK","DATA.JK","SOLA.JK","BATR.JK","SPRE.JK","PART.JK","GOLF.JK","ISEA.JK","BLES.JK","GUNA.JK","LABS.JK","DOSS.JK","NEST.JK","PTMR.JK","VERN.JK","DAAZ.JK","BOAT.JK","NAIK.JK","AADI.JK","MDIY.JK","KSIX.JK","RATU.JK","YOII.JK","HGII.JK","BRRC.JK","DGWG.JK","CBDK.JK","OBAT.JK","MINE.JK","ASPR.JK","PSAT.JK","COIN.JK","CDIA.JK","BLOG.JK","MERI.JK","CHEK.JK","PMUI.JK","EMAS.JK","PJHB.JK","KAQI.JK","YUPI.JK","FORE.JK","MDLA.JK","DKHH.JK","AYLS.JK","DADA.JK","ASPI.JK","ESTA.JK","BESS.JK","AMAN.JK","CARE.JK","PIPA.JK","NCKL.JK","MENN.JK","AWAN.JK","MBMA.JK","RAAM.JK","DOOH.JK","CGAS.JK","NICE.JK","MSJA.JK","SMLE.JK","ACRO.JK","MANG.JK","WIFI.JK","FAPA.JK","DCII.JK","KETR.JK","DGNS.JK","UFOE.JK",
-] # Daftar ini bisa kamu teruskan sesuai kebutuhan
+LIST_SAHAM_IHSG = IHSG_TICKERS
 
 # --- 3. FUNGSI DATABASE (JSON) ---
 def load_data():
@@ -53,42 +55,28 @@ if 'grid_page' not in st.session_state:
 
 # --- 5. FUNGSI BACKEND (CACHING) ---
 
-@st.cache_data(ttl=600)
-def get_stock_history_bulk(tickers, period="3mo", interval="1d"):
+# Cache diputar oleh token jam bursa IDX (market_clock) dan dipanaskan oleh cache_warmer
+@st.cache_data(ttl=cache_warmer.CACHE_TTL, max_entries=256)
+def get_stock_history_bulk(tickers, period="3mo", interval="1d", version=None):
     if not tickers: return pd.DataFrame()
     try:
-        data = yf.download(tickers, period=period, interval=interval, group_by='ticker', progress=False)
+        data = ohlcv_store.download(tickers, period=period, interval=interval)
         return data
     except: return pd.DataFrame()
 
-@st.cache_data(ttl=600)
-def get_weekly_recap_data(tickers):
+@st.cache_data(ttl=cache_warmer.CACHE_TTL, max_entries=16)
+def get_weekly_recap_data(tickers, version=None):
     start_date = (start_of_week - timedelta(days=7)).strftime("%Y-%m-%d")
-    data = yf.download(tickers, start=start_date, group_by="ticker", progress=False)
-    all_rows = []
-    for t in tickers:
-        try:
-            df = data[t].dropna().copy() if len(tickers) > 1 else data.dropna().copy()
-            if df.empty: continue
-            df["Return"] = df["Close"].pct_change() * 100
-            df.index = df.index.date
-            row = {"Ticker": t, "Price": round(df["Close"].iloc[-1], 2), "Today (%)": round(df["Return"].iloc[-1], 2)}
-            weekly_vals = []
-            gain_count = 0
-            for i in range(5):
-                target = (start_of_week + timedelta(days=i)).date()
-                if target in df.index:
-                    val = df.loc[target, "Return"]
-                    if isinstance(val, pd.Series): val = val.iloc[0]
-                    row[days_names[i]] = round(val, 2)
-                    weekly_vals.append(val)
-                    if val > 0: gain_count += 1
-                else: row[days_names[i]] = 0.0
-            row["Weekly Acc (%)"] = round(sum(weekly_vals), 2)
-            row["Win Rate"] = f"{gain_count}/5"
-            all_rows.append(row)
-        except: continue
-    return pd.DataFrame(all_rows)
+    data = ohlcv_store.download(tickers, start=start_date, adjusted=True)
+    # Semua ticker dihitung sekaligus di matriks tanggal x ticker (weekly_recap.py)
+    recap, _ = weekly_recap.compute(data, tickers, start_of_week)
+    out = recap[["Ticker"]].copy()
+    out["Price"] = recap["Price"].round(2)
+    out["Today (%)"] = recap["Today (%)"].round(2)
+    for day in days_names: out[day] = recap[day].round(2).fillna(0.0)
+    out["Weekly Acc (%)"] = recap["Weekly Acc (%)"].round(2)
+    out["Win Rate"] = recap["Wins"].astype(str) + "/5"
+    return out
 
 # --- 6. FUNGSI VISUALISASI ---
 def create_mini_chart_complex(df, ticker, period_code):
@@ -108,6 +96,11 @@ def create_detail_chart(df, ticker):
     return fig
 
 # --- 7. MAIN UI DASHBOARD ---
+CACHE_VERSION = market_clock.cache_version(cache_warmer.WARM_CADENCE)
+cache_warmer.register("grid", lambda v: get_stock_history_bulk(LIST_SAHAM_IHSG[:16], period="3mo", version=v))
+cache_warmer.register("weekly", lambda v: get_weekly_recap_data(LIST_SAHAM_IHSG[:500], version=v))
+cache_warmer.start()
+
 st.title("📈 Super Stock Dashboard")
 
 # DEFINISI 10 TAB (GABUNGAN SEMUA FITUR)
@@ -121,7 +114,7 @@ with tabs[0]:
     st.header("📊 Market Grid")
     period_grid = st.selectbox("Timeframe:", ["1mo", "3mo", "6mo", "1y"], index=1, key="grid_tf")
     batch_tickers = LIST_SAHAM_IHSG[:16] # Tampilkan 16 pertama
-    data_grid = get_stock_history_bulk(batch_tickers, period=period_grid)
+    data_grid = get_stock_history_bulk(batch_tickers, period=period_grid, version=CACHE_VERSION)
     grid_cols = st.columns(4)
     for i, t in enumerate(batch_tickers):
         with grid_cols[i % 4]:
@@ -140,7 +133,7 @@ with tabs[1]:
         if st.button("Reset Pilihan"): 
             st.session_state.picked_stocks = []
             st.rerun()
-        sel_data = get_stock_history_bulk(st.session_state.picked_stocks, period="6mo")
+        sel_data = get_stock_history_bulk(st.session_state.picked_stocks, period="6mo", version=CACHE_VERSION)
         for t in st.session_state.picked_stocks:
             df_c = sel_data[t].dropna() if len(st.session_state.picked_stocks) > 1 else sel_data.dropna()
             st.line_chart(df_c['Close'])
@@ -152,7 +145,7 @@ with tabs[2]:
     v_in = st.text_area("Input Saham (koma):", value="BBCA.JK, GOTO.JK", key="vol_in")
     if st.button("Cek Volume"):
         v_list = [x.strip().upper() for x in v_in.split(",")]
-        v_data = get_stock_history_bulk(v_list, period="1mo")
+        v_data = get_stock_history_bulk(v_list, period="1mo", version=CACHE_VERSION)
         # Logika ringkasan volume sederhana
         st.write("Menampilkan data volume 1 bulan terakhir...")
         st.dataframe(v_data.tail(5))
@@ -162,7 +155,7 @@ with tabs[4]:
     st.header("🔎 Detail Candlestick")
     d_input = st.text_input("Kode Saham:", value="BBCA.JK").upper()
     if st.button("Render Chart"):
-        df_d = yf.download(d_input, period="1y", progress=False)
+        df_d = ohlcv_store.download(d_input, period="1y")
         if not df_d.empty:
             st.plotly_chart(create_detail_chart(df_d, d_input), use_container_width=True)
 
@@ -170,7 +163,7 @@ with tabs[4]:
 with tabs[6]:
     st.header("📅 Weekly Performance")
     with st.spinner("Calculating weekly returns..."):
-        df_weekly = get_weekly_recap_data(LIST_SAHAM_IHSG[:500]) # Ambil 20 besar
+        df_weekly = get_weekly_recap_data(LIST_SAHAM_IHSG[:500], version=CACHE_VERSION) # Ambil 20 besar
         if not df_weekly.empty:
             def style_returns(val):
                 if isinstance(val, (int, float)):
@@ -183,33 +176,31 @@ with tabs[6]:
     sel_explorer = st.multiselect("Bandingkan Grafik:", options=LIST_SAHAM_IHSG, key="explorer")
     if sel_explorer:
         chart_start = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
-        c_data = yf.download(sel_explorer, start=chart_start, end=end_date_str, progress=False)
+        # Dibaca dari store lokal (sync delta), bukan request langsung ke Yahoo
+        c_data = ohlcv_store.download(sel_explorer, start=chart_start)
         if not c_data.empty:
-            st.line_chart(c_data['Close'])
+            st.line_chart(pd.DataFrame(weekly_recap.to_matrix(c_data, sel_explorer, "Close"), index=c_data.index, columns=sel_explorer))
 
 # === TAB 9: WIN/LOSS (UPDATE HARIAN) ===
 with tabs[8]:
     st.header("🎲 Win/Loss Stats (30 Hari)")
     wl_in = st.text_area("Saham:", value="BBCA.JK, GOTO.JK, BBRI.JK", key="wl_input")
-    if st.button("Hitung Statistik"):
-        wl_list = [x.strip().upper() for x in wl_in.split(",")]
-        data_wl = yf.download(wl_list, period="3mo", group_by='ticker', progress=False)
-        
-        for t in wl_list:
-            try:
-                df_wl = data_wl[t].dropna() if len(wl_list) > 1 else data_wl.dropna()
-                df_wl['Change'] = df_wl['Close'].pct_change() * 100
-                df_30 = df_wl.tail(30).sort_index(ascending=False)
-                
-                # Summary
-                win_rate = (len(df_30[df_30['Change'] > 0]) / len(df_30)) * 100
-                st.write(f"**{t}** | Win Rate: {win_rate:.1f}%")
-                
-                with st.expander(f"Tabel 30 Hari Terakhir {t}"):
-                    def bg_color(val):
-                        return 'background-color: #90ee90' if val > 0 else 'background-color: #ffcccb' if val < 0 else ''
-                    st.dataframe(df_30[['Close', 'Change']].style.applymap(bg_color, subset=['Change']).format("{:.2f}%", subset=['Change']), use_container_width=True)
-            except: pass
+    if st.button("Hitung Statistik"): st.session_state.wl_active = True
+    if st.session_state.get("wl_active"):
+        wl_list = [x.strip().upper() for x in wl_in.split(",") if x.strip()]
+        data_wl = ohlcv_store.download(wl_list, period="3mo", adjusted=True)
+        # Ringkasan semua ticker dalam satu pass (winloss_stats.py)
+        summ = winloss_stats.compute(data_wl, wl_list, 30)
+        for _, r in summ.iterrows():
+            st.write(f"**{r['Ticker']}** | Win Rate: {r['Win Rate']:.1f}% | Streak Naik: {r['Streak Naik']} | Streak Turun: {r['Streak Turun']}")
+
+        # Tabel detail hanya dibuat untuk ticker yang dipilih user
+        for t in st.multiselect("Tabel 30 Hari Terakhir:", summ["Ticker"].tolist() if not summ.empty else []):
+            with st.expander(f"Tabel 30 Hari Terakhir {t}", expanded=True):
+                def bg_color(val):
+                    return 'background-color: #90ee90' if val > 0 else 'background-color: #ffcccb' if val < 0 else ''
+                df_30 = winloss_stats.detail(data_wl, t, 30).sort_index(ascending=False)
+                st.dataframe(df_30[['Close', 'Change']].style.applymap(bg_color, subset=['Change']).format("{:.2f}%", subset=['Change']), use_container_width=True)
 
 # (Tab Cycle, Performa, Watchlist, Simulator bisa diisi dengan logika serupa tanpa merubah struktur ini)
 st.caption(f"Last Update: {today.strftime('%Y-%m-%d %H:%M:%S')} | Data by Yahoo Finance")
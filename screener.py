@@ -0,0 +1,172 @@
+"""
+Screener berindeks untuk seluruh universe IHSG.
+
+1. `build_table()` menyusun tabel fitur per ticker sekali per versi data:
+   harga, nilai transaksi, lot, return, indikator (technicals.py) dan
+   fundamental dari cache SQLite (tanpa request jaringan).
+2. `Screener` menyimpan setiap kolom numerik sebagai array TERURUT + id baris.
+   Query rentang = dua `searchsorted`; query gabungan mulai dari rentang paling
+   selektif lalu menyaring kandidat lewat lookup array. 866 ticker x beberapa
+   syarat tetap di bawah satu milidetik, jadi filter bisa dihitung ulang
+   setiap kali input UI bergeser.
+
+Contoh:
+    idx = Screener(table)
+    idx.query({"Harga": (100, 5000), "RSI14": (None, 30)}, equals={"Sektor": ["Energy"]})
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+import horizon_returns
+import technicals
+import weekly_recap
+
+RETURNS = {"1 Minggu (%)": 7, "1 Bulan (%)": 30}
+TECH = ["RSI14", "MACD_HIST", "BB_PCTB", "VOL20"]
+HIGH_WINDOW = 252
+FUNDAMENTALS = {"PER": "trailingPE", "PBV": "priceToBook", "Market Cap (T)": "marketCap"}
+CATEGORIES = {"Industri": "industry", "Sektor": "sector"}
+
+# ==============================
+# 1. TABEL FITUR
+# ==============================
+
+def _last_valid(mat):
+    return pd.DataFrame(mat).ffill().to_numpy()[-1] if len(mat) else np.full(mat.shape[1], np.nan)
+
+def build_table(raw, adjusted, tickers, fundamentals=None, labels=None):
+    """
+    raw      : panel harga mentah (harga, volume & nilai transaksi terakhir)
+    adjusted : panel harga ter-adjust (return & indikator)
+    fundamentals : {ticker: info} dari fundamentals_cache.load_many (opsional)
+    labels   : DataFrame Sektor/Industri dari sectors.mapping (opsional, menggantikan kategori dari fundamentals)
+    Return DataFrame index Ticker.
+    """
+    tickers = list(tickers)
+    table = pd.DataFrame(index=pd.Index(tickers, name="Ticker"))
+    if raw is not None and not raw.empty:
+        values = raw.to_numpy(dtype="float64")
+        close = weekly_recap.to_matrix(raw, tickers, "Close", values)
+        vol = weekly_recap.to_matrix(raw, tickers, "Volume", values)
+        # Volume diambil dari bar yang sama dengan close terakhir
+        last = len(close) - 1 - np.argmax(~np.isnan(close[::-1]), axis=0)
+        cols = np.arange(len(tickers))
+        has = ~np.isnan(close).all(axis=0)
+        price = np.where(has, close[last, cols], np.nan)
+        volume = np.where(has, vol[last, cols], np.nan)
+        table["Harga"] = price
+        table["Volume (Lot)"] = volume / 100
+        table["Nilai (M)"] = price * volume / 1e9
+        # Sama dengan "Vol vs Avg": volume terakhir dibanding rata-rata volume di panel (5 hari)
+        with np.errstate(divide="ignore", invalid="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            avg = np.nanmean(vol, axis=0)
+            table["Vol Ratio"] = np.where(avg > 0, volume / avg, np.nan)
+    if adjusted is not None and not adjusted.empty:
+        ret = horizon_returns.compute(adjusted, tickers, RETURNS).set_index("Ticker")
+        table["Chg (%)"] = ret["1 Hari"].reindex(tickers).to_numpy()
+        for name in RETURNS: table[name] = ret[name].reindex(tickers).to_numpy()
+        feats = technicals.matrices(adjusted, tickers)
+        for f in TECH: table[f] = _last_valid(feats[f])
+        last_close = _last_valid(weekly_recap.to_matrix(adjusted, tickers, "Close"))
+        high = weekly_recap.to_matrix(adjusted, tickers, "High")
+        # High bar terakhir vs max HIGH_WINDOW - 1 bar sebelumnya (hari ini tidak ikut): > 0 = high 52 minggu baru
+        last = len(high) - 1 - np.argmax(~np.isnan(high[::-1]), axis=0)
+        rows = np.arange(len(high))[:, None]
+        prior = np.where((rows < last) & (rows >= last - (HIGH_WINDOW - 1)), high, np.nan)
+        today_high = np.where(~np.isnan(high).all(axis=0), high[last, np.arange(len(tickers))], np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            table["Dari MA20 (%)"] = (last_close / _last_valid(feats["BB_MID"]) - 1) * 100
+            table["Dari High 52W (%)"] = (last_close / np.nanmax(high[-HIGH_WINDOW:], axis=0) - 1) * 100
+            table["Tembus High 52W (%)"] = (today_high / np.nanmax(prior, axis=0) - 1) * 100
+    fundamentals = fundamentals or {}
+    for col, key in FUNDAMENTALS.items():
+        table[col] = pd.to_numeric(pd.Series([fundamentals.get(t, {}).get(key) for t in tickers], index=tickers), errors="coerce")
+    if "Market Cap (T)" in table: table["Market Cap (T)"] = table["Market Cap (T)"] / 1e12
+    for col, key in CATEGORIES.items():
+        if labels is not None and col in labels: table[col] = labels[col].reindex(tickers).fillna("-").to_numpy()
+        else: table[col] = [fundamentals.get(t, {}).get(key) or "-" for t in tickers]
+    return table
+
+# ==============================
+# 2. INDEKS & QUERY
+# ==============================
+
+class Screener:
+    def __init__(self, table):
+        self.table = table
+        self.tickers = np.asarray(table.index)
+        self.values, self.sorted = {}, {}
+        self.categories = {}
+        for col in table.columns:
+            if pd.api.types.is_numeric_dtype(table[col]):
+                v = table[col].to_numpy(dtype="float64")
+                rows = np.nonzero(~np.isnan(v))[0]
+                rows = rows[np.argsort(v[rows], kind="stable")]
+                self.values[col] = v
+                self.sorted[col] = (v[rows], rows)
+            else:
+                codes, uniques = pd.factorize(table[col])
+                self.categories[col] = (codes, {u: i for i, u in enumerate(uniques)})
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def _bounds(self, col, lo, hi):
+        keys, _ = self.sorted[col]
+        i = 0 if lo is None else np.searchsorted(keys, lo, side="left")
+        j = len(keys) if hi is None else np.searchsorted(keys, hi, side="right")
+        return i, max(i, j)
+
+    def rows(self, ranges=None, equals=None):
+        """Id baris yang memenuhi SEMUA syarat (rentang inklusif, None = tanpa batas)."""
+        ranges = {c: r for c, r in (ranges or {}).items() if c in self.sorted and r != (None, None)}
+        bounds = {c: self._bounds(c, *r) for c, r in ranges.items()}
+        if bounds:
+            # Mulai dari rentang paling selektif, sisanya dicek langsung ke array nilai
+            first = min(bounds, key=lambda c: bounds[c][1] - bounds[c][0])
+            i, j = bounds[first]
+            cand = self.sorted[first][1][i:j]
+            for col, (lo, hi) in ranges.items():
+                if col == first or not len(cand): continue
+                v = self.values[col][cand]
+                keep = ~np.isnan(v)
+                if lo is not None: keep &= v >= lo
+                if hi is not None: keep &= v <= hi
+                cand = cand[keep]
+        else:
+            cand = np.arange(len(self.tickers))
+        for col, allowed in (equals or {}).items():
+            if col not in self.categories or not allowed: continue
+            codes, lookup = self.categories[col]
+            wanted = [lookup[a] for a in allowed if a in lookup]
+            cand = cand[np.isin(codes[cand], wanted)]
+        return np.sort(cand)
+
+    def query(self, ranges=None, equals=None, sort_by=None, ascending=False, limit=None):
+        """Daftar ticker (urutan universe, atau diurutkan `sort_by`)."""
+        cand = self.rows(ranges, equals)
+        if sort_by in self.values and len(cand):
+            v = self.values[sort_by][cand]
+            order = np.argsort(v if ascending else -v, kind="stable")
+            cand = cand[order[~np.isnan(v[order])]]
+        if limit: cand = cand[:limit]
+        return self.tickers[cand].tolist()
+
+    def query_any(self, queries):
+        """Gabungan (OR) beberapa query AND: [{"ranges": ..., "equals": ...}, ...]."""
+        cand = np.unique(np.concatenate([self.rows(q.get("ranges"), q.get("equals")) for q in queries])) if queries else np.array([], dtype=int)
+        return self.tickers[cand].tolist()
+
+    def options(self, col):
+        """Nilai kategori yang tersedia (untuk multiselect)."""
+        if col not in self.categories: return []
+        return sorted(k for k in self.categories[col][1] if k != "-")
+
+    def span(self, col):
+        """(min, max) kolom numerik, untuk batas slider."""
+        keys, _ = self.sorted.get(col, (np.array([]), None))
+        return (float(keys[0]), float(keys[-1])) if len(keys) else (0.0, 0.0)
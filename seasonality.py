@@ -0,0 +1,97 @@
+"""
+Mesin siklus musiman (Cycle) berbasis array 3D: ticker x tahun x hari-bursa-ke-N.
+
+Untuk jendela bulan mulai..akhir (boleh melewati akhir tahun, mis. Nov -> Feb)
+setiap tahun lookback menjadi satu lapisan. Isi array = perubahan relatif (%)
+terhadap harga pertama jendela, disejajarkan per hari bursa ke-N. Dari array
+ini dihitung kurva rata-rata & median musiman serta hit rate (berapa persen
+tahun yang berakhir positif).
+"""
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import weekly_recap
+
+def windows(start_month, end_month, lookback_years=5, now=None):
+    """Daftar (label, mulai, akhir_eksklusif) mulai tahun berjalan ke belakang."""
+    now = now or datetime.now()
+    start_month, end_month = int(start_month), int(end_month)
+    cross = start_month > end_month
+    out = []
+    for i in range(lookback_years + 1):
+        y_end = now.year - i
+        y_start = y_end - 1 if cross else y_end
+        d_start = datetime(y_start, start_month, 1)
+        if d_start > now: continue
+        # Akhir jendela = hari terakhir bulan akhir (bukan tanggal 28)
+        d_end = datetime(y_end + (end_month == 12), end_month % 12 + 1, 1)
+        label = f"{y_start}/{y_end}" if cross else f"{y_end}"
+        out.append((label, d_start, d_end))
+    return out
+
+def _nan_stat(fn, arr, axis):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        return fn(arr, axis=axis)
+
+def build(panel, tickers, start_month, end_month, lookback_years=5, now=None):
+    """
+    Return dict:
+      tickers, labels         : sumbu ticker & tahun
+      cube   (T, Y, D)        : jalur relatif (%) per hari bursa ke-N, NaN = tidak ada
+      mean, median (T, D)     : kurva musiman lintas tahun
+      final  (T, Y)           : perubahan di akhir jendela per tahun
+      hit_rate (T,)           : porsi tahun dengan `final` > 0
+    """
+    tickers = list(tickers)
+    wins = windows(start_month, end_month, lookback_years, now)
+    labels = [w[0] for w in wins]
+    empty = {"tickers": tickers, "labels": labels, "cube": np.full((len(tickers), len(labels), 0), np.nan)}
+    if panel is None or panel.empty or not wins:
+        return dict(empty, mean=np.empty((len(tickers), 0)), median=np.empty((len(tickers), 0)),
+                    final=np.full((len(tickers), len(labels)), np.nan), hit_rate=np.full(len(tickers), np.nan))
+
+    close = weekly_recap.to_matrix(panel, tickers, "Close")
+    dates = pd.DatetimeIndex(panel.index)
+    if dates.tz is not None: dates = dates.tz_localize(None)
+    order = np.argsort(dates.values, kind="stable")
+    dates, close = dates.values[order], close[order]
+
+    bounds = [(np.searchsorted(dates, np.datetime64(s), "left"), np.searchsorted(dates, np.datetime64(e), "left")) for _, s, e in wins]
+    depth = max([b - a for a, b in bounds] + [0])
+    cube = np.full((len(tickers), len(wins), depth), np.nan)
+    cols = np.arange(len(tickers))
+    for y, (a, b) in enumerate(bounds):
+        if b <= a: continue
+        block = close[a:b]
+        has = ~np.isnan(block)
+        # Harga dasar = harga valid pertama tiap ticker di jendela ini
+        base = block[np.argmax(has, axis=0), cols]
+        base = np.where(has.any(axis=0) & (base != 0), base, np.nan)
+        cube[:, y, :b - a] = ((block / base - 1) * 100).T
+
+    valid = ~np.isnan(cube)
+    last = depth - 1 - np.argmax(valid[:, :, ::-1], axis=2) if depth else np.zeros(cube.shape[:2], dtype=int)
+    final = np.take_along_axis(cube, last[:, :, None], axis=2)[:, :, 0] if depth else np.full(cube.shape[:2], np.nan)
+    final = np.where(valid.any(axis=2), final, np.nan)
+    years_with_data = (~np.isnan(final)).sum(axis=1)
+    hit_rate = np.where(years_with_data > 0, (final > 0).sum(axis=1) / np.maximum(years_with_data, 1), np.nan)
+    return {
+        "tickers": tickers, "labels": labels, "cube": cube,
+        "mean": _nan_stat(np.nanmean, cube, 1), "median": _nan_stat(np.nanmedian, cube, 1),
+        "final": final, "hit_rate": hit_rate,
+    }
+
+def summary(result):
+    """Tabel ringkas per ticker: hit rate, rata-rata & median hasil akhir jendela."""
+    final = result["final"]
+    return pd.DataFrame({
+        "Ticker": result["tickers"],
+        "Hit Rate (%)": result["hit_rate"] * 100,
+        "Rata-rata (%)": _nan_stat(np.nanmean, final, 1),
+        "Median (%)": _nan_stat(np.nanmedian, final, 1),
+        "Tahun": (~np.isnan(final)).sum(axis=1),
+    })
@@ -0,0 +1,129 @@
+"""
+Peta ticker -> sektor/industri dan agregasi per kelompok (rotasi sektor).
+
+- `mapping()` membaca kelompok "profile" dari cache fundamental SQLite (data
+  lama tetap dipakai) dan menyimpannya di memori proses; tidak ada request
+  jaringan di jalur render. Ticker yang belum punya profil tampil "-" dan
+  diantrekan ke thread latar yang mengambilnya lewat
+  `fundamentals_cache.get_info_many` (harvester paralel); hasilnya langsung
+  masuk peta. Ticker lain tidak di-query ulang sampai REFRESH detik.
+- `rollup()` mereduksi tabel screener per kelompok dengan `np.bincount`
+  (jumlah, rata-rata, breadth) dan satu `lexsort` untuk median; seluruh IHSG
+  selesai dalam hitungan milidetik.
+"""
+import time
+import threading
+
+import numpy as np
+import pandas as pd
+
+import fundamentals_cache
+
+REFRESH = 3600
+LABELS = {"Sektor": "sector", "Industri": "industry"}
+RETURNS = ["Chg (%)", "1 Minggu (%)", "1 Bulan (%)"]
+
+_lock = threading.Lock()
+_map = {}  # ticker -> (dibaca_pada, {"Sektor": ..., "Industri": ...})
+_pending = set()  # ticker tanpa profil, menunggu diambil thread latar
+_thread = None
+
+# ==============================
+# 1. PETA TICKER
+# ==============================
+
+def _labels(info):
+    return {col: info.get(key) or "-" for col, key in LABELS.items()}
+
+def mapping(tickers, now=None):
+    """DataFrame index Ticker dengan kolom Sektor & Industri ("-" kalau belum diketahui)."""
+    tickers = list(dict.fromkeys(tickers))
+    now = now or time.time()
+    with _lock:
+        stale = [t for t in tickers if t not in _map or now - _map[t][0] > REFRESH]
+        if stale:
+            try: found = fundamentals_cache.load_many(stale, groups=("profile",), include_stale=True)
+            except: found = {}
+            for t in stale: _map[t] = (now, _labels(found.get(t, {})))
+            missing = [t for t in stale if t not in found]
+            if missing: _queue(missing)
+        rows = [_map[t][1] for t in tickers]
+    return pd.DataFrame(rows, index=pd.Index(tickers, name="Ticker"), columns=list(LABELS))
+
+def _queue(tickers):
+    # Dipanggil dengan _lock terpegang
+    global _thread
+    _pending.update(tickers)
+    if _thread is None:
+        _thread = threading.Thread(target=_fill, name="sector-fill", daemon=True)
+        _thread.start()
+
+def _fill():
+    """Ambil profil yang belum ada di cache di latar belakang; gagal = tetap "-" sampai REFRESH berikutnya."""
+    global _thread
+    while True:
+        with _lock:
+            batch = sorted(_pending)
+            _pending.clear()
+            if not batch:
+                _thread = None
+                return
+        try: found = fundamentals_cache.get_info_many(batch)
+        except: found = {}
+        now = time.time()
+        with _lock:
+            for t in batch:
+                if t in found: _map[t] = (now, _labels(found[t]))
+
+# ==============================
+# 2. AGREGASI PER KELOMPOK
+# ==============================
+
+def _mean(codes, v, k):
+    ok = ~np.isnan(v)
+    n = np.bincount(codes[ok], minlength=k)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(n > 0, np.bincount(codes[ok], weights=v[ok], minlength=k) / n, np.nan)
+
+def _median(codes, v, k):
+    ok = ~np.isnan(v)
+    c, x = codes[ok], v[ok]
+    order = np.lexsort((x, c))
+    c, x = c[order], x[order]
+    n = np.bincount(c, minlength=k)
+    start = np.cumsum(n) - n
+    out = np.full(k, np.nan)
+    has = n > 0
+    out[has] = (x[start[has] + (n[has] - 1) // 2] + x[start[has] + n[has] // 2]) / 2
+    return out
+
+def _col(table, col):
+    return table[col].to_numpy(dtype="float64") if col in table else np.full(len(table), np.nan)
+
+def rollup(table, by="Sektor"):
+    """
+    table : tabel screener (index Ticker) dengan kolom kelompok `by`.
+    Return satu baris per kelompok: jumlah saham, naik/turun, breadth, return
+    rata-rata & tertimbang market cap, nilai transaksi, median PER/PBV.
+    """
+    if table is None or table.empty or by not in table: return pd.DataFrame()
+    codes, groups = pd.factorize(table[by].fillna("-"))
+    k = len(groups)
+    chg, cap = _col(table, "Chg (%)"), _col(table, "Market Cap (T)")
+    naik = np.bincount(codes, weights=chg > 0, minlength=k)
+    turun = np.bincount(codes, weights=chg < 0, minlength=k)
+    out = pd.DataFrame({by: groups, "Saham": np.bincount(codes, minlength=k), "Naik": naik, "Turun": turun})
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out["Breadth (%)"] = np.where(naik + turun > 0, naik / (naik + turun) * 100, np.nan)
+        for col in RETURNS: out[col] = _mean(codes, _col(table, col), k)
+        w = ~(np.isnan(chg) | np.isnan(cap))
+        wsum = np.bincount(codes[w], weights=cap[w], minlength=k)
+        out["Chg Tertimbang (%)"] = np.where(wsum > 0, np.bincount(codes[w], weights=chg[w] * cap[w], minlength=k) / wsum, np.nan)
+    out["Nilai (M)"] = np.bincount(codes, weights=np.nan_to_num(_col(table, "Nilai (M)")), minlength=k)
+    out["Market Cap (T)"] = np.bincount(codes, weights=np.nan_to_num(cap), minlength=k)
+    # Valuasi negatif (rugi) tidak bermakna untuk median
+    for col in ["PER", "PBV"]:
+        v = _col(table, col)
+        out[f"Median {col}"] = _median(codes, np.where(v > 0, v, np.nan), k)
+    out[["Naik", "Turun"]] = out[["Naik", "Turun"]].astype(int)
+    return out
@@ -0,0 +1,159 @@
+"""
+Pustaka indikator teknikal untuk seluruh universe sekaligus.
+
+Input = panel harga (tanggal x (ticker, field)) hasil ohlcv_store.download().
+Setiap indikator dihitung untuk SEMUA ticker dengan operasi array NumPy
+(rolling lewat cumsum, EMA lewat satu loop per baris tanggal yang memproses
+semua ticker bersamaan), lalu digabung menjadi "feature panel" dengan layout
+yang sama seperti panel harga: kolom MultiIndex (ticker, fitur).
+
+Fitur:
+  RSI14, MACD, MACD_SIGNAL, MACD_HIST, BB_UPPER, BB_MID, BB_LOWER, BB_PCTB,
+  ATR14, OBV, VOL20 (volatilitas tahunan %, dari log return 20 hari)
+
+Bar kosong (suspend / belum listing) tetap NaN; perhitungan memakai bar valid
+sebelumnya sehingga jeda tidak merusak indikator.
+"""
+import numpy as np
+import pandas as pd
+
+import weekly_recap
+
+FEATURES = ["RSI14", "MACD", "MACD_SIGNAL", "MACD_HIST", "BB_UPPER", "BB_MID", "BB_LOWER", "BB_PCTB", "ATR14", "OBV", "VOL20"]
+TRADING_DAYS = 252
+
+# ==============================
+# 1. PRIMITIF ARRAY
+# ==============================
+
+def _prev_valid(mat):
+    """Nilai valid sebelumnya per kolom (ffill lalu geser satu baris)."""
+    return pd.DataFrame(mat).ffill().shift(1).to_numpy()
+
+def _ema(mat, alpha, min_periods=1):
+    """EMA (adjust=False, ignore_na=True) untuk semua kolom; NaN tidak memutus state."""
+    out = np.full(mat.shape, np.nan)
+    state = np.full(mat.shape[1], np.nan)
+    count = np.zeros(mat.shape[1], dtype=int)
+    for i, x in enumerate(mat):
+        ok = ~np.isnan(x)
+        first = ok & np.isnan(state)
+        state[first] = x[first]
+        upd = ok & ~first
+        state[upd] += alpha * (x[upd] - state[upd])
+        count += ok
+        out[i] = np.where(ok & (count >= min_periods), state, np.nan)
+    return out
+
+def _window_sums(mat, n, power=1):
+    """
+    Jumlah dalam jendela n bar VALID terakhir per kolom (cumsum, tanpa rolling per kolom).
+    Bar valid dipadatkan ke bawah dulu supaya jeda suspend tidak ikut dihitung sebagai bar.
+    """
+    valid = ~np.isnan(mat)
+    order = np.argsort(valid, axis=0, kind="stable")
+    vals = np.take_along_axis(np.where(valid, mat, 0.0) ** power, order, axis=0)
+    cs = np.vstack([np.zeros((1, mat.shape[1])), np.cumsum(vals, axis=0)])
+    sums = cs[n:] - cs[:-n] if len(mat) >= n else np.empty((0, mat.shape[1]))
+    packed = np.full(mat.shape, np.nan)
+    packed[n - 1:] = sums
+    # Jendela yang menyentuh baris kosong (di atas data valid) belum lengkap
+    first = len(mat) - valid.sum(axis=0)
+    packed[np.arange(len(mat))[:, None] < first + n - 1] = np.nan
+    out = np.empty(mat.shape)
+    np.put_along_axis(out, order, packed, axis=0)
+    return np.where(valid, out, np.nan)
+
+def _sma(mat, n):
+    return _window_sums(mat, n) / n
+
+def _std(mat, n, ddof=0):
+    # Geser per kolom dengan nilai valid pertama supaya jumlah kuadrat tidak kehilangan presisi
+    base = pd.DataFrame(mat).bfill().to_numpy()[0]
+    x = mat - np.nan_to_num(base)
+    s, s2 = _window_sums(x, n), _window_sums(x, n, power=2)
+    with np.errstate(invalid="ignore"):
+        var = (s2 - s * s / n) / (n - ddof)
+    return np.sqrt(np.maximum(var, 0.0))
+
+# ==============================
+# 2. INDIKATOR
+# ==============================
+
+def rsi(close, n=14):
+    """RSI Wilder (rata-rata gain/loss dengan alpha = 1/n)."""
+    delta = close - _prev_valid(close)
+    gain = _ema(np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0)), 1.0 / n, n)
+    loss = _ema(np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0.0)), 1.0 / n, n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100 - 100 / (1 + gain / loss)
+    return np.where((loss == 0) & (gain > 0), 100.0, np.where((loss == 0) & (gain == 0), 50.0, out))
+
+def macd(close, fast=12, slow=26, signal=9):
+    line = _ema(close, 2.0 / (fast + 1), fast) - _ema(close, 2.0 / (slow + 1), slow)
+    sig = _ema(line, 2.0 / (signal + 1), signal)
+    return line, sig, line - sig
+
+def bollinger(close, n=20, k=2.0):
+    mid = _sma(close, n)
+    sd = _std(close, n)
+    upper, lower = mid + k * sd, mid - k * sd
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pctb = np.where(upper > lower, (close - lower) / (upper - lower), np.nan)
+    return upper, mid, lower, pctb
+
+def atr(high, low, close, n=14):
+    prev = _prev_valid(close)
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev), np.abs(low - prev)))
+    tr = np.where(np.isnan(close), np.nan, tr)
+    return _ema(tr, 1.0 / n, n)
+
+def obv(close, volume):
+    step = np.sign(close - _prev_valid(close)) * volume
+    out = np.cumsum(np.nan_to_num(step), axis=0)
+    return np.where(np.isnan(close), np.nan, out)
+
+def volatility(close, n=20):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ret = np.log(close / _prev_valid(close))
+    return _std(ret, n, ddof=1) * np.sqrt(TRADING_DAYS) * 100
+
+# ==============================
+# 3. FEATURE PANEL
+# ==============================
+
+def matrices(panel, tickers):
+    """Semua fitur sebagai dict {nama: matriks tanggal x ticker}."""
+    values = panel.to_numpy(dtype="float64")
+    m = {f: weekly_recap.to_matrix(panel, tickers, f, values) for f in ["High", "Low", "Close", "Adj Close", "Volume"]}
+    close = m["Close"]
+    no_close = np.isnan(close).all(axis=0)
+    close[:, no_close] = m["Adj Close"][:, no_close]
+    out = {"RSI14": rsi(close)}
+    out["MACD"], out["MACD_SIGNAL"], out["MACD_HIST"] = macd(close)
+    out["BB_UPPER"], out["BB_MID"], out["BB_LOWER"], out["BB_PCTB"] = bollinger(close)
+    out["ATR14"] = atr(m["High"], m["Low"], close)
+    out["OBV"] = obv(close, m["Volume"])
+    out["VOL20"] = volatility(close)
+    return out
+
+def build(panel, tickers):
+    """Feature panel: index tanggal panel, kolom MultiIndex (ticker, fitur)."""
+    tickers = list(tickers)
+    if panel is None or panel.empty or not tickers: return pd.DataFrame()
+    mats = matrices(panel, tickers)
+    cube = np.stack([mats[f] for f in FEATURES], axis=2)
+    cols = pd.MultiIndex.from_product([tickers, FEATURES])
+    return pd.DataFrame(cube.reshape(len(panel.index), -1), index=panel.index, columns=cols)
+
+def latest(features, tickers=None):
+    """Nilai valid terakhir tiap fitur per ticker (untuk screener): DataFrame index ticker."""
+    if features is None or features.empty: return pd.DataFrame(columns=FEATURES)
+    tickers = list(features.columns.get_level_values(0).unique()) if tickers is None else list(tickers)
+    values = features.to_numpy(dtype="float64")
+    last = pd.DataFrame(values).ffill().to_numpy()[-1]
+    out = pd.DataFrame(index=pd.Index(tickers, name="Ticker"))
+    for f in FEATURES:
+        pos = weekly_recap._columns(features, tickers, f)
+        out[f] = np.where(pos >= 0, last[np.maximum(pos, 0)], np.nan)
+    return out
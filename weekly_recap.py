@@ -0,0 +1,81 @@
+"""
+Mesin rekap mingguan berbasis matriks (tanggal x ticker).
+
+Panel hasil ohlcv_store.download() dipivot sekali menjadi matriks Close & Volume,
+lalu return harian, kolom Senin-Jumat, akumulasi mingguan dan jumlah hari naik
+dihitung untuk seluruh universe dengan operasi array — tanpa loop per ticker.
+
+Semantik sama dengan loop lama: baris yang punya NaN di field mana pun dibuang
+per ticker (`dropna()`), dan return dihitung terhadap bar valid sebelumnya.
+"""
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+
+def _columns(panel, tickers, field):
+    """Posisi kolom `field` untuk tiap ticker di panel (-1 kalau tidak ada)."""
+    if isinstance(panel.columns, pd.MultiIndex):
+        wanted = pd.MultiIndex.from_arrays([tickers, [field] * len(tickers)])
+        return panel.columns.get_indexer(wanted)
+    if len(tickers) == 1 and field in panel.columns: return np.array([panel.columns.get_loc(field)])
+    return np.full(len(tickers), -1)
+
+def to_matrix(panel, tickers, field, values=None):
+    """Satu field dari panel sebagai array tanggal x ticker (NaN untuk ticker yang tidak ada)."""
+    values = panel.to_numpy(dtype="float64") if values is None else values
+    pos = _columns(panel, tickers, field)
+    out = np.full((len(panel.index), len(tickers)), np.nan)
+    ok = pos >= 0
+    out[:, ok] = values[:, pos[ok]]
+    return out
+
+def _fields(panel):
+    if isinstance(panel.columns, pd.MultiIndex): return list(panel.columns.get_level_values(1).unique())
+    return list(panel.columns)
+
+def compute(panel, tickers, week_start):
+    """
+    Return (recap, gagal). `recap` berisi kolom numerik:
+    Ticker, Price, Today (%), Volume, Monday..Friday (NaN = tidak ada data),
+    Weekly Acc (%), Wins. `gagal` = ticker tanpa data sama sekali.
+    """
+    tickers = list(tickers)
+    if panel is None or panel.empty:
+        return pd.DataFrame(columns=["Ticker", "Price", "Today (%)", "Volume"] + DAYS + ["Weekly Acc (%)", "Wins"]), tickers
+    values = panel.to_numpy(dtype="float64")
+    # Setara dengan df.dropna() per ticker: semua field yang ada harus terisi
+    valid = np.ones((len(panel.index), len(tickers)), dtype=bool)
+    for f in _fields(panel):
+        pos = _columns(panel, tickers, f)
+        present = pos >= 0
+        valid[:, present] &= ~np.isnan(values[:, pos[present]])
+    c = np.where(valid, to_matrix(panel, tickers, "Close", values), np.nan)
+    v = np.where(valid, to_matrix(panel, tickers, "Volume", values), np.nan)
+
+    # Return terhadap bar valid sebelumnya (ffill lalu geser satu baris)
+    prev = pd.DataFrame(c).ffill().shift(1).to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ret = (c / prev - 1) * 100
+
+    has_data = ~np.isnan(c).all(axis=0)
+    last_close = pd.DataFrame(c).ffill().to_numpy()[-1]
+    last_vol = pd.DataFrame(v).ffill().to_numpy()[-1]
+    today_ret = pd.DataFrame(ret).ffill().to_numpy()[-1]
+
+    days = pd.DatetimeIndex(panel.index)
+    if days.tz is not None: days = days.tz_localize(None)
+    targets = pd.DatetimeIndex([(week_start + timedelta(days=i)).date() for i in range(5)])
+    pos = days.normalize().get_indexer(targets)
+    week = np.full((5, len(tickers)), np.nan)
+    found = pos >= 0
+    week[found] = ret[pos[found]]
+
+    recap = pd.DataFrame({"Ticker": tickers, "Price": last_close, "Today (%)": today_ret, "Volume": last_vol})
+    for i, name in enumerate(DAYS): recap[name] = week[i]
+    recap["Weekly Acc (%)"] = np.nansum(week, axis=0)
+    recap["Wins"] = (week > 0).sum(axis=0)
+    gagal = [t for t, ok in zip(tickers, has_data) if not ok]
+    return recap[has_data].reset_index(drop=True), gagal
@@ -0,0 +1,80 @@
+"""
+Statistik win/loss & streak untuk seluruh universe dalam satu pass array.
+
+Matriks Close (tanggal x ticker) dipadatkan per ticker: bar valid digeser ke
+bawah supaya N baris terakhir = N candle terakhir tiap ticker, walaupun tanggal
+bursa/suspend tiap ticker berbeda. Dari jendela itu dihitung win rate, rata-rata
+naik/turun, profit factor, streak naik/turun terpanjang dan total return.
+
+Tabel detail per ticker tidak dibuat di muka; panggil `detail()` hanya untuk
+ticker yang dibuka user.
+"""
+import numpy as np
+import pandas as pd
+
+import weekly_recap
+
+MIN_CANDLES = 5
+
+def _compact(values, valid):
+    # Urutkan False dulu lalu True (stabil): bar valid terkumpul di bawah, urutan tanggal tetap
+    order = np.argsort(valid, axis=0, kind="stable")
+    out = np.take_along_axis(np.where(valid, values, np.nan), order, axis=0)
+    return out, order
+
+def _longest_run(mask):
+    """Panjang run True terpanjang per kolom."""
+    if not len(mask): return np.zeros(mask.shape[1], dtype=int)
+    counts = np.cumsum(mask, axis=0)
+    reset = np.maximum.accumulate(np.where(~mask, counts, 0), axis=0)
+    return (counts - reset).max(axis=0)
+
+def _close_matrix(panel, tickers):
+    close = weekly_recap.to_matrix(panel, tickers, "Close")
+    adj = weekly_recap.to_matrix(panel, tickers, "Adj Close")
+    no_close = np.isnan(close).all(axis=0)
+    close[:, no_close] = adj[:, no_close]
+    return close
+
+def compute(panel, tickers, window=30):
+    """Ringkasan per ticker untuk `window` candle terakhir (ticker < MIN_CANDLES dilewati)."""
+    tickers = list(tickers)
+    if panel is None or panel.empty or not tickers: return pd.DataFrame()
+    close = _close_matrix(panel, tickers)
+    c, _ = _compact(close, ~np.isnan(close))
+    prev = np.vstack([np.full((1, c.shape[1]), np.nan), c[:-1]])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = (c / prev - 1) * 100
+    win_change, win_close = change[-window:], c[-window:]
+    has = ~np.isnan(win_change)
+    # Close pertama jendela = close pada candle pertama yang punya perubahan
+    first_close = np.where(has, win_close, np.nan)
+    first_close = first_close[np.argmax(has, axis=0), np.arange(len(tickers))]
+
+    up, down = win_change > 0, win_change < 0
+    n = has.sum(axis=0)
+    gains = np.where(up, win_change, 0.0).sum(axis=0)
+    losses = np.where(down, win_change, 0.0).sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = pd.DataFrame({
+            "Ticker": tickers,
+            "Total Candle": n,
+            "Hari Hijau": up.sum(axis=0),
+            "Hari Merah": down.sum(axis=0),
+            "Win Rate": up.sum(axis=0) / n * 100,
+            "Rata2 Naik": np.where(up.any(axis=0), gains / up.sum(axis=0), 0.0),
+            "Rata2 Turun": np.where(down.any(axis=0), losses / down.sum(axis=0), 0.0),
+            "Profit Factor": np.where(losses < 0, gains / -losses, np.inf),
+            "Streak Naik": _longest_run(up),
+            "Streak Turun": _longest_run(down),
+            f"Total Return ({window} Candle)": (c[-1] - first_close) / first_close * 100,
+        })
+    return out[n >= MIN_CANDLES].reset_index(drop=True)
+
+def detail(panel, ticker, window=30):
+    """Tabel Close & Change (%) `window` candle terakhir untuk satu ticker (dibuat saat dibutuhkan)."""
+    close = _close_matrix(panel, [ticker])[:, 0]
+    idx = pd.DatetimeIndex(panel.index)
+    s = pd.Series(close, index=idx).dropna()
+    df = pd.DataFrame({"Close": s, "Change": s.pct_change() * 100}).dropna()
+    return df.tail(window)